@@ -0,0 +1,116 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from my_types import BallotFilter, Ballots
+
+
+@dataclass(frozen=True)
+class Decision:
+    # Whether the votes for an appID are kept, and why, for the audit log.
+    # Notable decisions (removals, exceptions to the rule) are the ones worth printing.
+
+    keep: bool
+    reason: str
+    is_notable: bool = False
+
+
+def get_distinct_app_ids(standardized_ballots: Ballots) -> list[str]:
+    # Distinct appIDs, in order of first appearance on the ballots.
+
+    distinct_app_ids = {}
+
+    for voter in standardized_ballots:
+        current_ballots = standardized_ballots[voter]["ballots"]
+        for position in sorted(current_ballots.keys()):
+            app_id = current_ballots[position]
+            if app_id is not None:
+                distinct_app_ids[app_id] = None
+
+    return list(distinct_app_ids)
+
+
+def compute_keep_decisions(
+    app_ids: list[str],
+    ballot_filters: list[BallotFilter],
+) -> dict[str, bool]:
+    # Each filter is evaluated at most once per distinct appID. Filters are chained: once an appID is dropped by a
+    # filter, the next filters are not evaluated for this appID.
+
+    return {
+        app_id: all(ballot_filter(app_id) for ballot_filter in ballot_filters)
+        for app_id in app_ids
+    }
+
+
+def apply_keep_decisions(
+    standardized_ballots: Ballots,
+    keep_decisions: dict[str, bool],
+) -> Ballots:
+    # Single compaction pass: the kept appIDs are moved to the first positions, and the other positions are set to None.
+
+    for voter in standardized_ballots:
+        current_ballots = standardized_ballots[voter]["ballots"]
+
+        current_ballots_list = [
+            current_ballots[position]
+            for position in sorted(current_ballots.keys())
+            if current_ballots[position] is not None
+            and keep_decisions[current_ballots[position]]
+        ]
+
+        num_positions = len(current_ballots.keys())
+        for i in range(num_positions):
+            position = i + 1
+            standardized_ballots[voter]["ballots"][position] = (
+                current_ballots_list[i] if i < len(current_ballots_list) else None
+            )
+
+    return standardized_ballots
+
+
+def filter_ballots(
+    standardized_ballots: Ballots,
+    ballot_filters: list[BallotFilter],
+) -> Ballots:
+    # Objective: apply several filters to the ballots, with work which scales with the number of distinct appIDs.
+
+    keep_decisions = compute_keep_decisions(
+        get_distinct_app_ids(standardized_ballots),
+        ballot_filters,
+    )
+
+    return apply_keep_decisions(standardized_ballots, keep_decisions)
+
+
+def compute_decisions(
+    app_ids: list[str],
+    decide: Callable[[str], Decision],
+) -> dict[str, Decision]:
+    return {app_id: decide(app_id) for app_id in app_ids}
+
+
+def print_notable_decisions(decisions: dict[str, Decision]) -> None:
+    for decision in decisions.values():
+        if decision.is_notable:
+            print(decision.reason)
+
+
+def build_filter_from_decisions(
+    decide: Callable[[str], Decision],
+    decisions: dict[str, Decision] | None = None,
+    *,
+    verbose: bool = True,
+) -> BallotFilter:
+    # Turn a decision function into a filter for filter_ballots(). If provided, the decisions dict is filled as a
+    # side effect, so that the decision table can be used as structured output.
+
+    if decisions is None:
+        decisions = {}
+
+    def is_kept(app_id: str) -> bool:
+        decisions[app_id] = decide(app_id)
+        if verbose and decisions[app_id].is_notable:
+            print(decisions[app_id].reason)
+        return decisions[app_id].keep
+
+    return is_kept
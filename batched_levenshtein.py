@@ -0,0 +1,279 @@
+import numpy as np
+
+# Code points are padded with a value which never matches any character.
+PADDING_CODE = -1
+
+# Names up to this length fit in a single bit vector.
+WORD_SIZE = 64
+
+
+def get_default_batch_params() -> dict[str, int]:
+    return {
+        # Names are grouped by length into buckets of this width, to limit the padding.
+        "bucket_width": 8,
+        # Maximal number of (query, candidate) pairs processed at once, to limit the memory footprint.
+        "max_num_pairs_per_chunk": 2**14,
+    }
+
+
+def encode_names(names: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    # Matrix of code points, padded to the length of the longest name, and the array of lengths.
+
+    lengths = np.array([len(name) for name in names], dtype=np.int64)
+
+    codes = np.full((len(names), lengths.max(initial=0)), PADDING_CODE, dtype=np.int32)
+    for i, name in enumerate(names):
+        codes[i, : len(name)] = [ord(character) for character in name]
+
+    return codes, lengths
+
+
+def compute_levenshtein_distance_matrix(
+    query_codes: np.ndarray,
+    query_lengths: np.ndarray,
+    candidate_codes: np.ndarray,
+    candidate_lengths: np.ndarray,
+) -> np.ndarray:
+    # Reference: https://en.wikipedia.org/wiki/Wagner%E2%80%93Fischer_algorithm
+    #
+    # Dynamic programming for every (query, candidate) pair at once: row i holds the distances between the first i
+    # characters of the query and every prefix of the candidate. Padding does not change the distances, because each
+    # cell only depends on the cells above and on the left, and because the distance of each query is read at the row
+    # matching its length, and at the column matching the length of the candidate.
+
+    num_queries = len(query_lengths)
+    num_candidates = len(candidate_lengths)
+    max_candidate_length = candidate_codes.shape[1]
+
+    columns = np.arange(max_candidate_length + 1, dtype=np.int32)
+
+    previous_row = np.broadcast_to(
+        columns,
+        (num_queries, num_candidates, max_candidate_length + 1),
+    )
+
+    distances = np.zeros((num_queries, num_candidates), dtype=np.int32)
+    distances[query_lengths == 0] = candidate_lengths
+
+    for i in range(1, query_codes.shape[1] + 1):
+        substitution_costs = (
+            query_codes[:, np.newaxis, i - 1, np.newaxis]
+            != candidate_codes[np.newaxis, :, :]
+        )
+
+        # Deletion or substitution, for every column at once.
+        partial_row = np.minimum(
+            previous_row[..., 1:] + 1,
+            previous_row[..., :-1] + substitution_costs,
+        )
+
+        # Insertion, with a running minimum along the row: row[j] = min_k (partial_row[k] + j - k)
+        current_row = np.concatenate(
+            [np.full((num_queries, num_candidates, 1), i, dtype=np.int32), partial_row],
+            axis=-1,
+        )
+        current_row = np.minimum.accumulate(current_row - columns, axis=-1) + columns
+
+        is_complete = query_lengths == i
+        distances[is_complete] = np.take_along_axis(
+            current_row[is_complete],
+            candidate_lengths[np.newaxis, :, np.newaxis],
+            axis=-1,
+        )[..., 0]
+
+        previous_row = current_row
+
+    return distances
+
+
+def compute_levenshtein_distance_matrix_with_bit_vectors(
+    query_codes: np.ndarray,
+    query_lengths: np.ndarray,
+    candidate_codes: np.ndarray,
+    candidate_lengths: np.ndarray,
+) -> np.ndarray:
+    # Reference: Myers, "A fast bit-vector algorithm for approximate string matching based on dynamic programming" (1999),
+    # as formulated for the edit distance by Hyyrö (2001).
+    #
+    # Each column of the dynamic programming matrix is encoded with bit vectors of vertical deltas, which requires
+    # candidates of at most WORD_SIZE characters. A query character is processed for every pair at once, with a few
+    # operations on arrays of 64-bit integers.
+
+    num_queries = len(query_lengths)
+    num_candidates = len(candidate_lengths)
+
+    # Bit masks of the positions of each query character in each candidate. The last column is for padding.
+    alphabet = np.unique(query_codes[query_codes != PADDING_CODE])
+
+    def get_alphabet_indices(codes: np.ndarray) -> np.ndarray:
+        if len(alphabet) == 0:
+            return np.zeros_like(codes)
+        indices = np.searchsorted(alphabet, codes)
+        is_in_alphabet = (indices < len(alphabet)) & (
+            alphabet[np.minimum(indices, len(alphabet) - 1)] == codes
+        )
+        return np.where(is_in_alphabet, indices, len(alphabet))
+
+    match_masks = np.zeros((len(alphabet) + 1, num_candidates), dtype=np.uint64)
+    candidate_alphabet_indices = get_alphabet_indices(candidate_codes)
+    for position in range(candidate_codes.shape[1]):
+        match_masks[
+            candidate_alphabet_indices[:, position],
+            np.arange(num_candidates),
+        ] |= np.uint64(1) << np.uint64(position)
+    match_masks[len(alphabet), :] = 0
+
+    query_alphabet_indices = get_alphabet_indices(query_codes)
+
+    one = np.uint64(1)
+    masks = np.where(
+        candidate_lengths >= WORD_SIZE,
+        ~np.uint64(0),
+        (one << np.minimum(candidate_lengths, WORD_SIZE - 1).astype(np.uint64)) - one,
+    )
+    last_bits = one << (np.maximum(candidate_lengths, 1) - 1).astype(np.uint64)
+
+    positive_vertical_deltas = np.broadcast_to(masks, (num_queries, num_candidates))
+    negative_vertical_deltas = np.zeros((num_queries, num_candidates), dtype=np.uint64)
+    scores = np.broadcast_to(candidate_lengths, (num_queries, num_candidates)).copy()
+
+    distances = np.zeros((num_queries, num_candidates), dtype=np.int64)
+    distances[query_lengths == 0] = candidate_lengths
+
+    for j in range(query_codes.shape[1]):
+        matches = match_masks[query_alphabet_indices[:, j]]
+
+        vertical_matches = matches | negative_vertical_deltas
+        horizontal_matches = (
+            ((matches & positive_vertical_deltas) + positive_vertical_deltas)
+            ^ positive_vertical_deltas
+        ) | matches
+        positive_horizontal_deltas = negative_vertical_deltas | ~(
+            horizontal_matches | positive_vertical_deltas
+        )
+        negative_horizontal_deltas = positive_vertical_deltas & horizontal_matches
+
+        scores += (positive_horizontal_deltas & last_bits) != 0
+        scores -= (negative_horizontal_deltas & last_bits) != 0
+
+        # The top row of the matrix increases by one with each query character.
+        positive_horizontal_deltas = (positive_horizontal_deltas << one) | one
+        negative_horizontal_deltas <<= one
+
+        positive_vertical_deltas = (
+            negative_horizontal_deltas
+            | ~(vertical_matches | positive_horizontal_deltas)
+        ) & masks
+        negative_vertical_deltas = positive_horizontal_deltas & vertical_matches & masks
+
+        is_complete = query_lengths == j + 1
+        distances[is_complete] = scores[is_complete]
+
+    # The score is not tracked for empty candidates, whose distance is the length of the query.
+    distances[:, candidate_lengths == 0] = query_lengths[:, np.newaxis]
+
+    return distances
+
+
+def get_length_buckets(lengths: np.ndarray, bucket_width: int) -> list[np.ndarray]:
+    bucket_indices = lengths // bucket_width
+
+    return [
+        np.flatnonzero(bucket_indices == bucket_index)
+        for bucket_index in np.unique(bucket_indices)
+    ]
+
+
+def compute_all_levenshtein_distances(
+    queries: list[str],
+    candidates: list[str],
+    batch_params: dict[str, int] | None = None,
+) -> np.ndarray:
+    # Matrix of Levenshtein distances between every query and every candidate.
+
+    if batch_params is None:
+        batch_params = get_default_batch_params()
+
+    query_codes, query_lengths = encode_names(queries)
+    candidate_codes, candidate_lengths = encode_names(candidates)
+
+    distances = np.zeros((len(queries), len(candidates)), dtype=np.int32)
+
+    # Candidates which fit in a bit vector form a single bucket. The other ones are grouped by length, and processed with
+    # the classic dynamic programming.
+    is_short = candidate_lengths <= WORD_SIZE
+    candidate_buckets = [np.flatnonzero(is_short)] + [
+        np.flatnonzero(~is_short)[bucket]
+        for bucket in get_length_buckets(
+            candidate_lengths[~is_short],
+            batch_params["bucket_width"],
+        )
+    ]
+
+    for query_bucket in get_length_buckets(query_lengths, batch_params["bucket_width"]):
+        num_candidates_per_chunk = max(
+            1,
+            batch_params["max_num_pairs_per_chunk"] // len(query_bucket),
+        )
+
+        bucket_query_codes = query_codes[
+            query_bucket,
+            : query_lengths[query_bucket].max(),
+        ]
+
+        for candidate_bucket in candidate_buckets:
+            if candidate_bucket is candidate_buckets[0]:
+                compute_distance_matrix = (
+                    compute_levenshtein_distance_matrix_with_bit_vectors
+                )
+            else:
+                compute_distance_matrix = compute_levenshtein_distance_matrix
+
+            for start in range(0, len(candidate_bucket), num_candidates_per_chunk):
+                candidate_chunk = candidate_bucket[
+                    start : start + num_candidates_per_chunk
+                ]
+
+                distances[np.ix_(query_bucket, candidate_chunk)] = (
+                    compute_distance_matrix(
+                        bucket_query_codes,
+                        query_lengths[query_bucket],
+                        candidate_codes[
+                            candidate_chunk,
+                            : candidate_lengths[candidate_chunk].max(),
+                        ],
+                        candidate_lengths[candidate_chunk],
+                    )
+                )
+
+    return distances
+
+
+def find_nearest_game_names_in_batch(
+    raw_names: list[str],
+    steamspy_database: dict,
+    num_neighbors: int,
+    batch_params: dict[str, int] | None = None,
+) -> dict[str, tuple[list[str], dict[str, int]]]:
+    # Dict: raw name ---> (sorted_app_ids, dist) for the nearest neighbors, with the same ordering as
+    # steampi.text_distances.find_most_similar_game_names(): by increasing distance, then in the order of the database.
+
+    app_ids = list(steamspy_database)
+
+    distances = compute_all_levenshtein_distances(
+        [raw_name.lower() for raw_name in raw_names],
+        [steamspy_database[app_id]["name"].lower() for app_id in app_ids],
+        batch_params=batch_params,
+    )
+
+    nearest_game_names = {}
+
+    for raw_name, row in zip(raw_names, distances, strict=True):
+        nearest_positions = np.argsort(row, kind="stable")[:num_neighbors]
+
+        nearest_game_names[raw_name] = (
+            [app_ids[i] for i in nearest_positions],
+            {app_ids[i]: int(row[i]) for i in nearest_positions},
+        )
+
+    return nearest_game_names
@@ -0,0 +1,170 @@
+import heapq
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+import Levenshtein
+
+from anonymize_data import get_data_folder
+from trigram_index import compute_catalog_hash
+
+
+@dataclass
+class BKTree:
+    # Reference: https://en.wikipedia.org/wiki/BK-tree
+    #
+    # Metric tree over the lower-case catalog names, with the Levenshtein distance. Each node is a distinct name, along
+    # with the positions of the appIDs which share this name, in the order of the SteamSpy database, like app_ids.
+    # children[i] maps the distance between node i and a child node, to the index of the child node. Node 0 is the root.
+
+    app_ids: list[str]
+    names: list[str]
+    positions: list[list[int]]
+    children: list[dict[int, int]]
+    catalog_hash: str
+
+    @classmethod
+    def from_database(cls, steamspy_database: dict) -> "BKTree":
+        bk_tree = cls(
+            app_ids=list(steamspy_database),
+            names=[],
+            positions=[],
+            children=[],
+            catalog_hash=compute_catalog_hash(steamspy_database),
+        )
+
+        for position, app_id in enumerate(bk_tree.app_ids):
+            bk_tree.insert(steamspy_database[app_id]["name"].lower(), position)
+
+        return bk_tree
+
+    def insert(self, name: str, position: int) -> None:
+        node = 0 if self.names else None
+
+        while node is not None:
+            distance = Levenshtein.distance(name, self.names[node])
+
+            if distance == 0:
+                self.positions[node].append(position)
+                return
+
+            if distance not in self.children[node]:
+                self.children[node][distance] = len(self.names)
+                break
+
+            node = self.children[node][distance]
+
+        self.names.append(name)
+        self.positions.append([position])
+        self.children.append({})
+
+    def find_nearest_game_names(
+        self,
+        input_game_name: str,
+        num_neighbors: int,
+    ) -> tuple[list[str], dict[str, int]]:
+        # Exact k-nearest neighbors, with the same ordering as steampi.text_distances.find_most_similar_game_names():
+        # by increasing Levenshtein distance, then in the order of the database.
+
+        lower_case_input = input_game_name.lower()
+
+        # Max-heap of the best (distance, position) pairs found so far, with negated values.
+        nearest_neighbors: list[tuple[int, int]] = []
+
+        def get_radius() -> float:
+            if len(nearest_neighbors) < num_neighbors:
+                return float("inf")
+            return -nearest_neighbors[0][0]
+
+        nodes_to_visit = [0] if self.names and num_neighbors > 0 else []
+
+        while nodes_to_visit:
+            node = nodes_to_visit.pop()
+            distance = Levenshtein.distance(lower_case_input, self.names[node])
+
+            for position in self.positions[node]:
+                heapq.heappush(nearest_neighbors, (-distance, -position))
+                if len(nearest_neighbors) > num_neighbors:
+                    heapq.heappop(nearest_neighbors)
+
+            # By the triangle inequality, a child subtree can only contain names within the radius if the distance
+            # between the node and the child is in [distance - radius, distance + radius].
+            radius = get_radius()
+            nodes_to_visit.extend(
+                child
+                for child_distance, child in self.children[node].items()
+                if abs(child_distance - distance) <= radius
+            )
+
+        sorted_neighbors = sorted(
+            (-negated_distance, -negated_position)
+            for negated_distance, negated_position in nearest_neighbors
+        )
+
+        sorted_app_ids = [self.app_ids[position] for _, position in sorted_neighbors]
+        text_distances = {
+            self.app_ids[position]: distance for distance, position in sorted_neighbors
+        }
+
+        return sorted_app_ids, text_distances
+
+    def to_dict(self) -> dict:
+        return {
+            "app_ids": self.app_ids,
+            "names": self.names,
+            "positions": self.positions,
+            # JSON keys are strings.
+            "children": [
+                {str(distance): child for distance, child in node_children.items()}
+                for node_children in self.children
+            ],
+            "catalog_hash": self.catalog_hash,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BKTree":
+        return cls(
+            app_ids=data["app_ids"],
+            names=data["names"],
+            positions=data["positions"],
+            children=[
+                {int(distance): child for distance, child in node_children.items()}
+                for node_children in data["children"]
+            ],
+            catalog_hash=data["catalog_hash"],
+        )
+
+
+def get_bk_tree_file_name() -> str:
+    # Dict: app_ids, names, positions, children, catalog_hash
+
+    return get_data_folder() + "bk_tree.json"
+
+
+def load_bk_tree(
+    steamspy_database: dict,
+    file_name: str | None = None,
+    *,
+    save_to_disk: bool = True,
+) -> BKTree:
+    # The tree is built once per catalog snapshot: it is built again if the catalog hash does not match.
+
+    if file_name is None:
+        file_name = get_bk_tree_file_name()
+
+    catalog_hash = compute_catalog_hash(steamspy_database)
+
+    try:
+        with Path(file_name).open(encoding="utf-8") as f:
+            bk_tree = BKTree.from_dict(json.load(f))
+    except FileNotFoundError:
+        bk_tree = None
+
+    if bk_tree is None or bk_tree.catalog_hash != catalog_hash:
+        bk_tree = BKTree.from_database(steamspy_database)
+
+        if save_to_disk:
+            with Path(file_name).open("w", encoding="utf-8") as f:
+                json.dump(bk_tree.to_dict(), f)
+
+    return bk_tree
@@ -0,0 +1,128 @@
+import numpy as np
+
+from my_types import Ballots, CandidateRegistry
+
+EMPTY_SLOT = -1
+
+
+def build_candidate_registry(standardized_ballots: Ballots) -> CandidateRegistry:
+    # Map every appID (Steam appID or IGDB ID) to a dense index, in the order of first appearance in the ballots.
+
+    candidate_registry: CandidateRegistry = {}
+
+    for voter in standardized_ballots:
+        current_ballots = standardized_ballots[voter]["ballots"]
+        for position in sorted(current_ballots.keys()):
+            app_id = current_ballots[position]
+            if app_id is not None and app_id not in candidate_registry:
+                candidate_registry[app_id] = len(candidate_registry)
+
+    return candidate_registry
+
+
+def get_app_ids_from_registry(candidate_registry: CandidateRegistry) -> list[str]:
+    # Indices are dense and assigned in insertion order, so the keys are already sorted by index.
+
+    return list(candidate_registry)
+
+
+def encode_standardized_ballots(
+    standardized_ballots: Ballots,
+    candidate_registry: CandidateRegistry,
+) -> tuple[list[str], np.ndarray]:
+    # Each row is a voter, each column is a position, and each value is the index of the candidate, or -1 if empty.
+
+    voter_names = list(standardized_ballots)
+
+    num_positions = max(
+        (len(standardized_ballots[voter]["ballots"]) for voter in voter_names),
+        default=0,
+    )
+
+    ballot_matrix = np.full(
+        (len(voter_names), num_positions),
+        EMPTY_SLOT,
+        dtype=np.int32,
+    )
+
+    for row, voter in enumerate(voter_names):
+        current_ballots = standardized_ballots[voter]["ballots"]
+        for column, position in enumerate(sorted(current_ballots.keys())):
+            app_id = current_ballots[position]
+            if app_id is not None:
+                ballot_matrix[row, column] = candidate_registry[app_id]
+
+    return voter_names, ballot_matrix
+
+
+def compact_ballot_matrix(ballot_matrix: np.ndarray) -> np.ndarray:
+    # Canonical form of interned ballots: repeated candidates are only kept at their first position, and the empty
+    # slots are moved to the end, so that two identical rankings are encoded by two identical rows.
+
+    num_positions = ballot_matrix.shape[1]
+
+    is_kept = ballot_matrix != EMPTY_SLOT
+    for column in range(1, num_positions):
+        is_kept[:, column] &= (
+            ballot_matrix[:, :column] != ballot_matrix[:, column, np.newaxis]
+        ).all(axis=1)
+
+    order = np.argsort(~is_kept, axis=1, kind="stable")
+
+    compacted_ballot_matrix = np.take_along_axis(ballot_matrix, order, axis=1)
+    compacted_ballot_matrix[~np.take_along_axis(is_kept, order, axis=1)] = EMPTY_SLOT
+
+    return compacted_ballot_matrix
+
+
+def collapse_identical_ballots(
+    ballot_matrix: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    # Identical rankings are collapsed into a single row, weighted by the number of voters who submitted it.
+
+    unique_ballot_matrix, weights = np.unique(
+        compact_ballot_matrix(ballot_matrix),
+        axis=0,
+        return_counts=True,
+    )
+
+    return unique_ballot_matrix, weights.astype(np.int64)
+
+
+def relabel_ranked_candidates(
+    ballot_matrix: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    # Only candidates which appear on at least one ballot are kept, with local indices 0, 1, ..., in registry order.
+
+    is_ranked = ballot_matrix != EMPTY_SLOT
+    candidate_indices = np.unique(ballot_matrix[is_ranked])
+
+    local_ballot_matrix = np.where(
+        is_ranked,
+        np.searchsorted(candidate_indices, ballot_matrix),
+        EMPTY_SLOT,
+    )
+
+    return candidate_indices, local_ballot_matrix
+
+
+def get_candidate_indices(
+    app_ids: list[str],
+    candidate_registry: CandidateRegistry,
+) -> np.ndarray:
+    return np.array(
+        [candidate_registry[app_id] for app_id in app_ids],
+        dtype=np.int32,
+    )
+
+
+def build_membership_mask(
+    candidate_indices: np.ndarray,
+    num_candidates: int,
+) -> np.ndarray:
+    # The extra slot at the end is never set, so that indexing the mask with an empty slot (-1) returns False.
+
+    membership_mask = np.zeros(num_candidates + 1, dtype=bool)
+    membership_mask[candidate_indices] = True
+
+    return membership_mask
@@ -0,0 +1,152 @@
+import numpy as np
+
+from my_types import Ranking, RankingMethod
+from pairwise_preferences import PairwisePreferences
+from schulze_engine import compute_strongest_paths, rank_candidates
+
+# Each ranking method derives a ranking from the same pairwise matrix d, where d[V,W] is the number of voters who
+# prefer candidate V over W.
+RANKING_METHODS: dict[str, RankingMethod] = {}
+
+
+def register_ranking_method(method_name: str, ranking_method: RankingMethod) -> None:
+    RANKING_METHODS[method_name] = ranking_method
+
+
+def group_candidates_by_score(
+    candidate_names: list[str],
+    scores: np.ndarray,
+) -> Ranking:
+    # Candidates are ranked by decreasing score, and candidates with the same score are tied.
+
+    return [
+        [candidate_names[i] for i in np.flatnonzero(scores == value)]
+        for value in sorted(set(scores.tolist()), reverse=True)
+    ]
+
+
+def rank_with_schulze(candidate_names: list[str], d: np.ndarray) -> Ranking:
+    return rank_candidates(candidate_names, compute_strongest_paths(d))
+
+
+def rank_with_copeland(candidate_names: list[str], d: np.ndarray) -> Ranking:
+    # One point per pairwise victory, half a point per pairwise tie. Scores are doubled to remain integers.
+
+    num_victories = (d > d.T).sum(axis=1)
+    num_ties = (d == d.T).sum(axis=1) - 1
+
+    return group_candidates_by_score(candidate_names, 2 * num_victories + num_ties)
+
+
+def rank_with_minimax(candidate_names: list[str], d: np.ndarray) -> Ranking:
+    # Candidates are ranked by their worst pairwise defeat, measured with winning votes, the smaller the better.
+
+    defeats = np.where(d < d.T, d.T, 0)
+
+    return group_candidates_by_score(candidate_names, -defeats.max(axis=1, initial=0))
+
+
+def rank_with_borda(candidate_names: list[str], d: np.ndarray) -> Ranking:
+    # With unranked candidates tied last on a ballot, the Borda score is the number of candidates beaten on each ballot,
+    # summed over the ballots, which is a row sum of the pairwise matrix.
+
+    return group_candidates_by_score(candidate_names, d.sum(axis=1))
+
+
+def rank_with_ranked_pairs(candidate_names: list[str], d: np.ndarray) -> Ranking:
+    # Reference: https://en.wikipedia.org/wiki/Ranked_pairs
+    #
+    # Pairwise victories are sorted by decreasing winning votes, then by increasing opposition, and locked in turn
+    # unless they would create a cycle. Candidates are then ranked by layers of the locked graph.
+
+    num_candidates = len(candidate_names)
+
+    winners, losers = np.nonzero(d > d.T)
+    order = np.lexsort((d[losers, winners], -d[winners, losers]))
+
+    # is_reachable[V,W] is True if there is a path from V to W in the locked graph.
+    is_reachable = np.eye(num_candidates, dtype=bool)
+    is_locked = np.zeros((num_candidates, num_candidates), dtype=bool)
+
+    for winner, loser in zip(winners[order], losers[order], strict=True):
+        if is_reachable[loser, winner]:
+            continue
+        is_locked[winner, loser] = True
+        is_reachable |= (
+            is_reachable[:, winner, np.newaxis] & is_reachable[np.newaxis, loser, :]
+        )
+
+    ranking = []
+    is_remaining = np.ones(num_candidates, dtype=bool)
+    while is_remaining.any():
+        is_unbeaten = is_remaining & ~is_locked[is_remaining].any(axis=0)
+        ranking.append([candidate_names[i] for i in np.flatnonzero(is_unbeaten)])
+        is_remaining &= ~is_unbeaten
+
+    return ranking
+
+
+register_ranking_method("schulze", rank_with_schulze)
+register_ranking_method("ranked_pairs", rank_with_ranked_pairs)
+register_ranking_method("copeland", rank_with_copeland)
+register_ranking_method("minimax", rank_with_minimax)
+register_ranking_method("borda", rank_with_borda)
+
+
+def compute_rankings_with_all_methods(
+    pairwise_preferences: PairwisePreferences,
+    method_names: list[str] | None = None,
+) -> dict[str, Ranking]:
+    if method_names is None:
+        method_names = list(RANKING_METHODS)
+
+    candidate_names, d = pairwise_preferences.get_active_candidates()
+
+    return {
+        method_name: RANKING_METHODS[method_name](candidate_names, d)
+        for method_name in method_names
+    }
+
+
+def get_rank_positions(ranking: Ranking) -> dict[str, int]:
+    # Position of each appID in the ranking, where tied appIDs share the best position (1, 2, 2, 4, ...).
+
+    rank_positions = {}
+    num_ranked_app_ids = 0
+    for app_id_group in ranking:
+        for app_id in app_id_group:
+            rank_positions[app_id] = num_ranked_app_ids + 1
+        num_ranked_app_ids += len(app_id_group)
+
+    return rank_positions
+
+
+def print_ranking_comparison(
+    rankings: dict[str, Ranking],
+    reference_method_name: str = "schulze",
+    num_app_id_groups_to_display: int = 7,
+) -> None:
+    method_names = list(rankings)
+    rank_positions = {
+        method_name: get_rank_positions(ranking)
+        for method_name, ranking in rankings.items()
+    }
+
+    print(
+        f"\nComparison of ranking methods (sorted by {reference_method_name} ranking):",
+    )
+
+    column_width = max(len(method_name) for method_name in method_names) + 2
+    print(
+        "appID".ljust(10) + "".join(name.rjust(column_width) for name in method_names),
+    )
+
+    for app_id_group in rankings[reference_method_name][0:num_app_id_groups_to_display]:
+        for app_id in app_id_group:
+            print(
+                app_id.ljust(10)
+                + "".join(
+                    str(rank_positions[method_name][app_id]).rjust(column_width)
+                    for method_name in method_names
+                ),
+            )
@@ -0,0 +1,149 @@
+import difflib
+import heapq
+from collections import Counter
+from dataclasses import dataclass
+
+import numpy as np
+from steampi.utils import build_lower_case_game_name_dictionary
+
+
+def compute_ratio_upper_bounds(
+    num_matches: np.ndarray,
+    lengths: np.ndarray,
+) -> np.ndarray:
+    # Same formula as difflib._calculate_ratio(), for every catalog name at once, so that the bounds are exactly the ones
+    # computed by difflib.SequenceMatcher.
+
+    return np.where(lengths > 0, 2.0 * num_matches / np.maximum(lengths, 1), 1.0)
+
+
+@dataclass
+class DifflibIndex:
+    # Dict: lower-case catalog name ---> appID, as in steampi.utils.build_lower_case_game_name_dictionary(), along with
+    # character postings: character ---> (positions of the names which contain it, numbers of occurrences).
+
+    lower_case_game_name_dictionary: dict[str, str]
+    names: list[str]
+    lengths: np.ndarray
+    postings: dict[str, tuple[np.ndarray, np.ndarray]]
+
+    @classmethod
+    def from_database(cls, steamspy_database: dict) -> "DifflibIndex":
+        lower_case_game_name_dictionary = build_lower_case_game_name_dictionary(
+            steamspy_database,
+        )
+
+        names = list(lower_case_game_name_dictionary)
+
+        postings: dict[str, tuple[list[int], list[int]]] = {}
+        for i, name in enumerate(names):
+            for character, count in Counter(name).items():
+                positions, counts = postings.setdefault(character, ([], []))
+                positions.append(i)
+                counts.append(count)
+
+        return cls(
+            lower_case_game_name_dictionary=lower_case_game_name_dictionary,
+            names=names,
+            lengths=np.array([len(name) for name in names], dtype=np.int64),
+            postings={
+                character: (
+                    np.array(positions, dtype=np.int64),
+                    np.array(counts, dtype=np.int64),
+                )
+                for character, (positions, counts) in postings.items()
+            },
+        )
+
+    def get_candidates(
+        self,
+        lower_case_input: str,
+        cutoff: float = 0.6,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        # Positions of the names whose upper bounds on the similarity ratio reach the cut-off: first real_quick_ratio(),
+        # based on the lengths, then quick_ratio(), based on the character counts. The other names cannot be matched.
+        # Candidates are sorted by decreasing quick_ratio(), which is returned along with the positions.
+
+        total_lengths = self.lengths + len(lower_case_input)
+
+        is_candidate = (
+            compute_ratio_upper_bounds(
+                np.minimum(self.lengths, len(lower_case_input)),
+                total_lengths,
+            )
+            >= cutoff
+        )
+
+        num_matches = np.zeros(len(self.names), dtype=np.int64)
+        for character, count in Counter(lower_case_input).items():
+            if character in self.postings:
+                positions, counts = self.postings[character]
+                num_matches[positions] += np.minimum(counts, count)
+
+        quick_ratios = compute_ratio_upper_bounds(num_matches, total_lengths)
+        is_candidate &= quick_ratios >= cutoff
+
+        positions = np.flatnonzero(is_candidate)
+        positions = positions[np.argsort(-quick_ratios[positions], kind="stable")]
+
+        return positions, quick_ratios[positions]
+
+    def get_close_matches_and_similarity_ratios(
+        self,
+        lower_case_input: str,
+        n: int = 3,
+        cutoff: float = 0.6,
+    ) -> list[tuple[str, float]]:
+        # Same output as steampi.difflib_utils.get_close_matches_and_similarity_ratios(), i.e. difflib.get_close_matches()
+        # along with the ratios, where ratio() is only computed for the candidates.
+        #
+        # Candidates are visited by decreasing quick_ratio(), which is an upper bound on ratio(). Once this bound is lower
+        # than the n-th best ratio so far, none of the remaining candidates can be among the n best matches.
+
+        sequence_matcher = difflib.SequenceMatcher()
+        sequence_matcher.set_seq2(lower_case_input)
+
+        # Min-heap of the n best (ratio, name) pairs so far, with the same ordering as heapq.nlargest().
+        result: list[tuple[float, str]] = []
+
+        positions, quick_ratios = self.get_candidates(lower_case_input, cutoff=cutoff)
+
+        for i, quick_ratio in zip(positions, quick_ratios, strict=True):
+            if len(result) == n and quick_ratio < result[0][0]:
+                break
+
+            sequence_matcher.set_seq1(self.names[i])
+            if (
+                sequence_matcher.real_quick_ratio() >= cutoff
+                and sequence_matcher.quick_ratio() >= cutoff
+                and sequence_matcher.ratio() >= cutoff
+            ):
+                heapq.heappush(result, (sequence_matcher.ratio(), self.names[i]))
+                if len(result) > n:
+                    heapq.heappop(result)
+
+        return [(name, ratio) for ratio, name in heapq.nlargest(n, result)]
+
+    def find_most_similar_game_names(
+        self,
+        input_game_name: str,
+        n: int = 3,
+        cutoff: float = 0.6,
+    ) -> tuple[list[str], dict[str, float]]:
+        # Same output as steampi.text_distances.find_most_similar_game_names() with difflib.
+
+        text_distances = {
+            self.lower_case_game_name_dictionary[name]: 1 - similarity_ratio
+            for name, similarity_ratio in self.get_close_matches_and_similarity_ratios(
+                input_game_name.lower(),
+                n=n,
+                cutoff=cutoff,
+            )
+        }
+
+        sorted_app_ids = sorted(
+            text_distances.keys(),
+            key=lambda app_id: text_distances[app_id],
+        )
+
+        return sorted_app_ids, text_distances
@@ -1,5 +1,6 @@
+from ballot_filters import filter_ballots
 from disqualify_vote_igdb import load_disqualified_igdb_ids
-from my_types import Ballots, HardCodedIDs
+from my_types import BallotFilter, Ballots, HardCodedIDs
 
 
 def get_hard_coded_disqualified_app_ids() -> HardCodedIDs:
@@ -26,49 +27,60 @@ def is_a_noisy_vote(game_name: str) -> bool:
     return bool(not game_name or (game_name in noisy_votes))
 
 
-def filter_out_votes_for_hard_coded_reasons(
-    standardized_ballots: Ballots,
+def load_disqualified_ids(
     release_year: str | None = None,
     *,
     use_igdb: bool = False,
-) -> dict:
-    # Objective: remove appID which gathered votes but were manually marked for disqualification
-
-    print()
-
-    removed_app_ids = []
-
+) -> HardCodedIDs:
     if use_igdb:
         disqualified_app_id_dict = load_disqualified_igdb_ids(release_year=release_year)
     else:
         disqualified_app_id_dict = get_hard_coded_disqualified_app_ids()
 
-    for voter in standardized_ballots:
-        current_ballots = standardized_ballots[voter]["ballots"]
-
-        current_ballots_list = []
-        for position in sorted(current_ballots.keys()):
-            app_id = current_ballots[position]
-            if app_id is not None:
-                if app_id not in disqualified_app_id_dict:
-                    current_ballots_list.append(app_id)
-                elif app_id not in removed_app_ids:
-                    print(
-                        "AppID "
-                        + app_id
-                        + " removed because "
-                        + disqualified_app_id_dict[app_id]["reason"],
-                    )
-                    removed_app_ids.append(app_id)
-
-        for i, current_ballot in enumerate(current_ballots_list):
-            position = i + 1
-            standardized_ballots[voter]["ballots"][position] = current_ballot
-        for i in range(len(current_ballots_list), len(current_ballots.keys())):
-            position = i + 1
-            standardized_ballots[voter]["ballots"][position] = None
-
-    return standardized_ballots
+    return disqualified_app_id_dict
+
+
+def build_hard_coded_filter(
+    release_year: str | None = None,
+    *,
+    use_igdb: bool = False,
+    disqualified_app_id_dict: HardCodedIDs | None = None,
+) -> BallotFilter:
+    # Objective: remove appID which gathered votes but were manually marked for disqualification
+
+    if disqualified_app_id_dict is None:
+        disqualified_app_id_dict = load_disqualified_ids(
+            release_year=release_year,
+            use_igdb=use_igdb,
+        )
+
+    def is_kept(app_id: str) -> bool:
+        if app_id not in disqualified_app_id_dict:
+            return True
+
+        print(
+            "AppID "
+            + app_id
+            + " removed because "
+            + disqualified_app_id_dict[app_id]["reason"],
+        )
+        return False
+
+    return is_kept
+
+
+def filter_out_votes_for_hard_coded_reasons(
+    standardized_ballots: Ballots,
+    release_year: str | None = None,
+    *,
+    use_igdb: bool = False,
+) -> dict:
+    print()
+
+    return filter_ballots(
+        standardized_ballots,
+        [build_hard_coded_filter(release_year=release_year, use_igdb=use_igdb)],
+    )
 
 
 if __name__ == "__main__":
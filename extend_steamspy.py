@@ -151,11 +151,16 @@ def get_app_name_for_problematic_app_id(app_id: str | None = None) -> str:
 def get_release_year_for_problematic_app_id(app_id: str) -> int:
     # As of December 2020, SteamSpy returns release_date_as_str = "29 янв. 2015" for appID = "319630".
     release_date_as_str = steampi.calendar.get_release_date_as_str(app_id=app_id)
-    matched_release_year = release_date_as_str.split(" ")[-1]
+
+    return get_release_year_from_problematic_release_date(release_date_as_str)
+
+
+def get_release_year_from_problematic_release_date(release_date_as_str: str) -> int:
+    matched_release_year = release_date_as_str.rsplit(" ", maxsplit=1)[-1]
     try:
         matched_release_year_as_int = int(matched_release_year[:YEAR_LENGTH])
     except ValueError:
-        matched_release_year = release_date_as_str.split(" ")[0]
+        matched_release_year = release_date_as_str.split(" ", maxsplit=1)[0]
         matched_release_year_as_int = int(matched_release_year)
 
     return matched_release_year_as_int
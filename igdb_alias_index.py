@@ -0,0 +1,137 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from anonymize_data import get_data_folder
+from igdb_databases import load_igdb_local_database
+from igdb_utils import get_game_category_no, get_pc_platform_no
+from name_normalization import get_canonical_name
+from release_year_index import is_release_year_eligible
+
+
+def get_aliases(igdb_data: dict) -> list[str]:
+    # Names of a game on IGDB: the name, then the alternative names, e.g. acronyms, then the names on external stores.
+
+    aliases = [igdb_data["name"]] if "name" in igdb_data else []
+
+    for field_name in ("alternative_names", "external_games"):
+        aliases += [
+            element["name"]
+            for element in igdb_data.get(field_name, [])
+            if "name" in element
+        ]
+
+    return aliases
+
+
+def is_igdb_data_eligible(
+    igdb_data: dict,
+    release_year: str | None = None,
+    *,
+    must_be_available_on_pc: bool = True,
+    must_be_a_game: bool = True,
+    year_constraint: str = "equality",
+) -> bool:
+    # Same filters as the ones applied by IGDB API in igdb_look_up.look_up_game_name(), cf. get_igdb_fields_for_games().
+
+    if must_be_available_on_pc and get_pc_platform_no() not in igdb_data.get(
+        "platforms",
+        [],
+    ):
+        return False
+
+    if must_be_a_game and igdb_data.get("category") not in get_game_category_no():
+        return False
+
+    if release_year is not None:
+        # Like get_comparison_symbol(), an unknown year constraint falls back to equality.
+        if year_constraint not in ("equality", "minimum", "maximum"):
+            year_constraint = "equality"
+
+        return any(
+            is_release_year_eligible(date["y"], release_year, year_constraint)
+            for date in igdb_data.get("release_dates", [])
+            if "y" in date
+        )
+
+    return True
+
+
+@dataclass
+class IGDBAliasIndex:
+    # Exact-match index: canonical alias ---> IGDB IDs, along with the data of every indexed game.
+    # The names of the games are indexed before their alternative names, and before their names on external stores.
+
+    igdb_ids: dict[str, list[str]] = field(default_factory=dict)
+    igdb_local_database: dict[str, dict] = field(default_factory=dict)
+
+    @classmethod
+    def from_local_databases(cls, igdb_local_databases: list[dict]) -> "IGDBAliasIndex":
+        alias_index = cls()
+
+        # NB: the most recent data about a game overwrites the previous data.
+        for igdb_local_database in igdb_local_databases:
+            for igdb_id, igdb_data in igdb_local_database.items():
+                alias_index.igdb_local_database[str(igdb_id)] = igdb_data
+
+        aliases = {
+            igdb_id: get_aliases(igdb_data)
+            for igdb_id, igdb_data in alias_index.igdb_local_database.items()
+        }
+
+        max_num_aliases = max(
+            (len(game_aliases) for game_aliases in aliases.values()),
+            default=0,
+        )
+
+        for alias_rank in range(max_num_aliases):
+            for igdb_id, game_aliases in aliases.items():
+                if alias_rank < len(game_aliases):
+                    igdb_ids = alias_index.igdb_ids.setdefault(
+                        get_canonical_name(game_aliases[alias_rank]),
+                        [],
+                    )
+                    if igdb_id not in igdb_ids:
+                        igdb_ids.append(igdb_id)
+
+        return alias_index
+
+    def look_up_game_name(
+        self,
+        game_name: str,
+        enforced_year: str | None = None,
+        *,
+        must_be_available_on_pc: bool = True,
+        must_be_a_game: bool = True,
+        year_constraint: str = "equality",
+    ) -> list[dict]:
+        # Offline counterpart of igdb_look_up.look_up_game_name(), with an exact match of the canonical name.
+
+        return [
+            self.igdb_local_database[igdb_id]
+            for igdb_id in self.igdb_ids.get(get_canonical_name(game_name), [])
+            if is_igdb_data_eligible(
+                self.igdb_local_database[igdb_id],
+                enforced_year,
+                must_be_available_on_pc=must_be_available_on_pc,
+                must_be_a_game=must_be_a_game,
+                year_constraint=year_constraint,
+            )
+        ]
+
+
+def get_igdb_local_database_file_names() -> list[str]:
+    # Local databases of every year, sorted by year, e.g. igdb_local_database_2018.json, then the one for 2019, etc.
+
+    return [
+        str(path)
+        for path in sorted(Path(get_data_folder()).glob("igdb_local_database*.json"))
+    ]
+
+
+def load_igdb_alias_index(file_names: list[str] | None = None) -> IGDBAliasIndex:
+    if file_names is None:
+        file_names = get_igdb_local_database_file_names()
+
+    return IGDBAliasIndex.from_local_databases(
+        [load_igdb_local_database(file_name=file_name) for file_name in file_names],
+    )
@@ -3,6 +3,7 @@ import time
 
 from disqualify_vote import is_a_noisy_vote
 from extend_igdb import extend_both_igdb_databases, extend_igdb_match_database
+from igdb_alias_index import load_igdb_alias_index
 from igdb_databases import (
     load_igdb_local_database,
     load_igdb_match_database,
@@ -13,6 +14,7 @@ from igdb_look_up import look_up_game_name, wait_for_cooldown
 from igdb_utils import get_pc_platform_no, get_pc_platform_range, get_steam_service_no
 from load_ballots import load_ballots
 from my_types import Ballots
+from name_normalization import get_canonical_name
 
 USE_MARKDOWN_DISPLAY = True
 
@@ -135,8 +137,16 @@ def match_names_with_igdb(
     goty_field: str = "goty_preferences",
     year_constraint: str = "equality",
     verbose: bool = True,
+    use_igdb_alias_index: bool = False,
 ) -> tuple[dict, dict]:
+    # With use_igdb_alias_index, names are first looked up offline, among the names, alternative names and names on
+    # external stores of the games in the local databases of every year. IGDB API is only queried if there is no match.
+    # NB: the first matched IGDB ID can differ from the one returned by IGDB API, hence this is not the default.
+
+    alias_index = load_igdb_alias_index() if use_igdb_alias_index else None
+
     seen_game_names = set()
+    igdb_matched_ids_by_canonical_name = {}
     igdb_match_database = {}
     igdb_local_database = {}
     num_requests = 0
@@ -148,50 +158,39 @@ def match_names_with_igdb(
                 seen_game_names.add(raw_name)
 
                 if not is_a_noisy_vote(raw_name):
-                    formatted_game_name_for_igdb = format_game_name_for_igdb(raw_name)
-
-                    igdb_matches = look_up_game_name(
-                        game_name=formatted_game_name_for_igdb,
-                        enforced_year=release_year,
-                        must_be_available_on_pc=must_be_available_on_pc,
-                        must_be_a_game=must_be_a_game,
-                        year_constraint=year_constraint,
-                    )
-                    num_requests += 1
-                    start_time = wait_for_cooldown(
-                        num_requests=num_requests,
-                        start_time=start_time,
-                    )
-
-                    try:
-                        igdb_matches[0]
-                    except IndexError:
-                        print(f"Relaxing the year constraint for {raw_name}")
+                    # Names made only of punctuation or symbols, e.g. "?!", have an empty canonical form, and are kept apart.
+                    canonical_name = get_canonical_name(raw_name) or raw_name
 
-                        igdb_matches = look_up_game_name(
-                            game_name=formatted_game_name_for_igdb,
-                            enforced_year=None,
-                            must_be_available_on_pc=must_be_available_on_pc,
-                            must_be_a_game=must_be_a_game,
+                    if canonical_name in igdb_matched_ids_by_canonical_name:
+                        # A spelling variant of this name was already matched.
+                        igdb_matched_ids = list(
+                            igdb_matched_ids_by_canonical_name[canonical_name],
                         )
-                        num_requests += 1
-                        start_time = wait_for_cooldown(
-                            num_requests=num_requests,
-                            start_time=start_time,
+                    else:
+                        formatted_game_name_for_igdb = format_game_name_for_igdb(
+                            raw_name,
                         )
 
-                        try:
-                            igdb_matches[0]
-                        except IndexError:
-                            print(
-                                f"Relaxing all of the constraints for {raw_name}",
+                        if alias_index is not None:
+                            igdb_matches = alias_index.look_up_game_name(
+                                raw_name,
+                                enforced_year=release_year,
+                                must_be_available_on_pc=must_be_available_on_pc,
+                                must_be_a_game=must_be_a_game,
+                                year_constraint=year_constraint,
                             )
+                        else:
+                            igdb_matches = []
 
+                        if igdb_matches:
+                            print(f"Offline match for {raw_name}")
+                        else:
                             igdb_matches = look_up_game_name(
                                 game_name=formatted_game_name_for_igdb,
-                                enforced_year=None,
-                                must_be_available_on_pc=False,
-                                must_be_a_game=False,
+                                enforced_year=release_year,
+                                must_be_available_on_pc=must_be_available_on_pc,
+                                must_be_a_game=must_be_a_game,
+                                year_constraint=year_constraint,
                             )
                             num_requests += 1
                             start_time = wait_for_cooldown(
@@ -199,15 +198,57 @@ def match_names_with_igdb(
                                 start_time=start_time,
                             )
 
-                    igdb_matched_ids = []
-
-                    for element in igdb_matches:
-                        igdb_id = element["id"]
-                        igdb_data = element
-
-                        igdb_matched_ids.append(igdb_id)
-
-                        igdb_local_database[igdb_id] = igdb_data
+                            try:
+                                igdb_matches[0]
+                            except IndexError:
+                                print(f"Relaxing the year constraint for {raw_name}")
+
+                                igdb_matches = look_up_game_name(
+                                    game_name=formatted_game_name_for_igdb,
+                                    enforced_year=None,
+                                    must_be_available_on_pc=must_be_available_on_pc,
+                                    must_be_a_game=must_be_a_game,
+                                )
+                                num_requests += 1
+                                start_time = wait_for_cooldown(
+                                    num_requests=num_requests,
+                                    start_time=start_time,
+                                )
+
+                                try:
+                                    igdb_matches[0]
+                                except IndexError:
+                                    print(
+                                        f"Relaxing all of the constraints for {raw_name}",
+                                    )
+
+                                    igdb_matches = look_up_game_name(
+                                        game_name=formatted_game_name_for_igdb,
+                                        enforced_year=None,
+                                        must_be_available_on_pc=False,
+                                        must_be_a_game=False,
+                                    )
+                                    num_requests += 1
+                                    start_time = wait_for_cooldown(
+                                        num_requests=num_requests,
+                                        start_time=start_time,
+                                    )
+
+                        igdb_matched_ids = []
+
+                        for element in igdb_matches:
+                            igdb_id = element["id"]
+                            igdb_data = element
+
+                            igdb_matched_ids.append(igdb_id)
+
+                            # Same keys as the local database stored on disk, so that fill_in_blanks_in_the_local_database()
+                            # does not download data which was just retrieved.
+                            igdb_local_database[str(igdb_id)] = igdb_data
+
+                        igdb_matched_ids_by_canonical_name[canonical_name] = (
+                            igdb_matched_ids
+                        )
 
                     # Caveat: For now, matches returned by match_names_with_igdb() does not have the same structure as
                     #         matches returned by precompute_matches(). cf. transform_structure_of_matches()
@@ -320,6 +361,7 @@ def download_igdb_local_databases(
     goty_field: str = "goty_preferences",
     year_constraint: str = "equality",
     verbose: bool = True,
+    use_igdb_alias_index: bool = False,
 ) -> tuple[dict, dict]:
     igdb_match_database, igdb_local_database = match_names_with_igdb(
         ballots,
@@ -328,6 +370,7 @@ def download_igdb_local_databases(
         must_be_a_game=must_be_a_game,
         goty_field=goty_field,
         year_constraint=year_constraint,
+        use_igdb_alias_index=use_igdb_alias_index,
     )
 
     # Merge with previous databases, if they were passed to the function as optional parameters
@@ -425,6 +468,7 @@ def download_igdb_data_for_ballots_with_missing_data(
     goty_field: str = "goty_preferences",
     year_constraint: str = "equality",
     verbose: bool = False,
+    use_igdb_alias_index: bool = False,
 ) -> tuple[dict, dict]:
     # Caveat: it is mandatory to set 'extend_previous_databases' to True, if you want to:
     # - first download data for new ballots,
@@ -443,6 +487,7 @@ def download_igdb_data_for_ballots_with_missing_data(
         goty_field=goty_field,
         year_constraint=year_constraint,
         verbose=verbose,
+        use_igdb_alias_index=use_igdb_alias_index,
     )
 
     return igdb_match_database, igdb_local_database
@@ -458,7 +503,11 @@ def load_igdb_local_databases(
     goty_field: str = "goty_preferences",
     year_constraint: str = "equality",
     verbose: bool = False,
+    use_igdb_alias_index: bool = False,
 ) -> tuple[dict, dict]:
+    # With use_igdb_alias_index, the names which are missing from the match database are first looked up offline, cf.
+    # match_names_with_igdb().
+
     try:
         igdb_match_database = load_igdb_match_database(release_year=release_year)
     except FileNotFoundError:
@@ -486,6 +535,7 @@ def load_igdb_local_databases(
         goty_field=goty_field,
         year_constraint=year_constraint,
         verbose=verbose,
+        use_igdb_alias_index=use_igdb_alias_index,
     )
 
     # Apply hard-coded changes: i) database extension and ii) fixes to name matching
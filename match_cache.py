@@ -0,0 +1,165 @@
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from anonymize_data import get_data_folder
+from hard_coded_matches import get_hard_coded_app_id_dict
+from trigram_index import compute_catalog_hash, get_default_shortlist_size
+
+
+@dataclass
+class MatchCache:
+    # Dict: cache key ---> SteamSpy match, i.e. matched_appID, matched_name and match_distance, as in precompute_matches().
+    # Matches are only valid for the catalog snapshot and the hard-coded matches with this hash.
+
+    catalog_hash: str
+    entries: dict[str, dict] = field(default_factory=dict)
+
+    def get_match(self, key: str) -> dict | None:
+        return self.entries.get(key)
+
+    def add_match(self, key: str, element: dict) -> None:
+        self.entries[key] = {
+            "matched_appID": element["matched_appID"],
+            "matched_name": element["matched_name"],
+            "match_distance": element["match_distance"],
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "catalog_hash": self.catalog_hash,
+            "entries": self.entries,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "MatchCache":
+        return cls(
+            catalog_hash=data["catalog_hash"],
+            entries=data["entries"],
+        )
+
+
+def get_match_cache_file_name() -> str:
+    # Dict: catalog_hash, entries
+
+    return get_data_folder() + "match_cache.json"
+
+
+def get_distance_metric_name(
+    num_closest_neighbors: int = 3,
+    max_num_tries_for_year: int = 2,
+    *,
+    use_levenshtein_distance: bool = True,
+    use_trigram_index: bool = False,
+    shortlist_size: int | None = None,
+    use_year_partitioned_index: bool = False,
+) -> str:
+    # Every setting which can change the matches, apart from the name, the year and the year constraint. The BK-tree and
+    # the batched Levenshtein distance are exact, hence they are not distinguished from the search over the database.
+    #
+    # NB: precompute_matches() does not cache the approximate matches found with the trigram index. The shortlist size
+    # is still part of the name, so that such matches could never be mistaken for exact ones.
+
+    distance_metric = "levenshtein" if use_levenshtein_distance else "difflib"
+    distance_metric += (
+        f";neighbors={num_closest_neighbors};tries={max_num_tries_for_year}"
+    )
+
+    if use_trigram_index and use_levenshtein_distance:
+        if shortlist_size is None:
+            shortlist_size = get_default_shortlist_size()
+        distance_metric += f";shortlist={shortlist_size}"
+
+    if use_year_partitioned_index:
+        distance_metric += ";eligible_first"
+
+    return distance_metric
+
+
+def is_matching_exact(
+    *,
+    use_levenshtein_distance: bool = True,
+    use_trigram_index: bool = False,
+    use_bk_tree: bool = False,
+    use_batched_levenshtein: bool = False,
+    is_searching_eligible_titles_first: bool = False,
+) -> bool:
+    # Whether precompute_matches() finds the same nearest neighbors as the search over the whole database. With the
+    # trigram index, they can be missed, cf. get_default_shortlist_size(), unless the BK-tree or the batched search,
+    # which are both exact, are used instead. NB: the batched search does not apply to the eligible titles first.
+
+    is_using_batched_levenshtein = (
+        use_batched_levenshtein and not is_searching_eligible_titles_first
+    )
+
+    return not (
+        use_levenshtein_distance
+        and use_trigram_index
+        and not use_bk_tree
+        and not is_using_batched_levenshtein
+    )
+
+
+def get_match_cache_key(
+    match_key: str,
+    release_year: str | None,
+    year_constraint: str | None,
+    distance_metric: str,
+) -> str:
+    # NB: the match key is computed by match_names.get_match_key(), so that spelling variants share the cached match.
+    # Without a release year, the year constraint does not change the matches.
+
+    if release_year is None:
+        year_constraint = None
+
+    return json.dumps([match_key, release_year, year_constraint, distance_metric])
+
+
+def compute_match_cache_hash(
+    steamspy_database: dict,
+    hard_coded_app_id_dict: dict[str, str] | None = None,
+) -> str:
+    # Fingerprint of the catalog snapshot and of the hard-coded matches, which are typically edited after inspecting the
+    # matches of a run, so that the cached matches are not used anymore once a hard-coded match is added or changed.
+
+    if hard_coded_app_id_dict is None:
+        hard_coded_app_id_dict = get_hard_coded_app_id_dict()
+
+    fingerprint = [
+        compute_catalog_hash(steamspy_database),
+        sorted(hard_coded_app_id_dict.items()),
+    ]
+
+    return hashlib.sha256(json.dumps(fingerprint).encode("utf-8")).hexdigest()
+
+
+def load_match_cache(
+    steamspy_database: dict,
+    file_name: str | None = None,
+) -> MatchCache:
+    # The cache is emptied if the hash does not match, i.e. if the SteamSpy database or the hard-coded matches changed.
+
+    if file_name is None:
+        file_name = get_match_cache_file_name()
+
+    catalog_hash = compute_match_cache_hash(steamspy_database)
+
+    try:
+        with Path(file_name).open(encoding="utf-8") as f:
+            match_cache = MatchCache.from_dict(json.load(f))
+    except FileNotFoundError:
+        match_cache = None
+
+    if match_cache is None or match_cache.catalog_hash != catalog_hash:
+        match_cache = MatchCache(catalog_hash=catalog_hash)
+
+    return match_cache
+
+
+def save_match_cache(match_cache: MatchCache, file_name: str | None = None) -> None:
+    if file_name is None:
+        file_name = get_match_cache_file_name()
+
+    with Path(file_name).open("w", encoding="utf-8") as f:
+        json.dump(match_cache.to_dict(), f)
@@ -1,10 +1,14 @@
-import steampi.calendar
+from concurrent.futures import ProcessPoolExecutor
+
 import steampi.text_distances
 
+from batched_levenshtein import find_nearest_game_names_in_batch
+from bk_tree import BKTree, load_bk_tree
+from difflib_index import DifflibIndex
 from disqualify_vote import is_a_noisy_vote
+from extend_igdb import extend_both_igdb_databases
 from extend_steamspy import (
     get_app_name_for_problematic_app_id,
-    get_release_year_for_problematic_app_id,
     load_extended_steamspy_database,
 )
 from hard_coded_matches import (
@@ -17,7 +21,31 @@ from igdb_match_names import (
     print_igdb_matches,
     transform_structure_of_matches,
 )
+from match_cache import (
+    get_distance_metric_name,
+    get_match_cache_key,
+    is_matching_exact,
+    load_match_cache,
+    save_match_cache,
+)
 from my_types import Ballots
+from name_normalization import get_canonical_name
+from pipeline_context import PipelineContext
+from release_year_index import (
+    build_release_year_index,
+    get_eligible_database,
+    get_release_year,
+    is_release_year_eligible,
+    load_release_year_index,
+    partition_database_by_release_year,
+    save_release_year_index,
+)
+from steam_app_details import prefetch_app_details
+from trigram_index import TrigramIndex, load_trigram_index
+
+# State of each worker process for parallel matching: the SteamSpy database and the parameters of search_closest_app_ids(),
+# set once per worker by initialize_matching_worker().
+MATCHING_WORKER_STATE: dict = {}
 
 
 def constrain_app_id_search_by_year(
@@ -26,7 +54,11 @@ def constrain_app_id_search_by_year(
     release_year: str | None,
     max_num_tries_for_year: int,
     year_constraint: str | None = "equality",
+    release_year_index: dict[str, int] | None = None,
 ) -> list[str]:
+    if release_year_index is None:
+        release_year_index = {}
+
     filtered_sorted_app_ids = sorted_app_ids.copy()
 
     if release_year is not None and year_constraint is not None:
@@ -44,35 +76,18 @@ def constrain_app_id_search_by_year(
                 and filtered_sorted_app_ids
             ):
                 first_match = filtered_sorted_app_ids[0]
-                try:
-                    matched_release_year = steampi.calendar.get_release_year(
-                        first_match,
-                    )
-                except ValueError:
-                    matched_release_year = get_release_year_for_problematic_app_id(
-                        app_id=first_match,
-                    )
+                matched_release_year = get_release_year(
+                    first_match,
+                    release_year_index,
+                )
 
-                if year_constraint == "equality":
-                    # We want the matched release year to be equal to the target release year.
-                    # NB: this is useful to compute the Game of the Year.
-                    is_the_first_match_released_in_a_wrong_year = bool(
-                        matched_release_year != int(release_year),
-                    )
-                elif year_constraint == "minimum":
-                    # We want the matched release year to be greater than or equal to the target release year.
-                    # NB: this should be useful to compute the Game of the last Decade.
-                    is_the_first_match_released_in_a_wrong_year = bool(
-                        matched_release_year < int(release_year),
-                    )
-                elif year_constraint == "maximum":
-                    # We want the matched release year to be less than or equal to the target release year.
-                    is_the_first_match_released_in_a_wrong_year = bool(
-                        matched_release_year > int(release_year),
+                is_the_first_match_released_in_a_wrong_year = (
+                    not is_release_year_eligible(
+                        matched_release_year,
+                        release_year,
+                        year_constraint=year_constraint,
                     )
-                else:
-                    # We do not want to apply any constraint.
-                    is_the_first_match_released_in_a_wrong_year = False
+                )
 
                 if is_the_first_match_released_in_a_wrong_year:
                     filtered_sorted_app_ids.pop(0)
@@ -105,31 +120,34 @@ def get_default_distance_cut_off_for_difflib() -> float:
     return 1 - similarity_cut_off
 
 
-def find_closest_app_id(
+def is_close_enough(
     game_name_input: str,
-    steamspy_database: dict,
+    distance: float,
+    *,
+    use_levenshtein_distance: bool = True,
+) -> bool:
+    # Relative cut-off, so that Levenshtein distances are comparable with difflib distances, whatever the name length.
+
+    if use_levenshtein_distance:
+        distance = distance / max(len(game_name_input), 1)
+
+    return distance <= get_default_distance_cut_off_for_difflib()
+
+
+def select_closest_app_ids(
+    game_name_input: str,
+    sorted_app_ids: list[str],
+    dist: dict,
     release_year: str | None = None,
     num_closest_neighbors: int = 1,
     max_num_tries_for_year: int = 2,
     *,
-    use_levenshtein_distance: bool = True,
-    year_constraint: str = "equality",
-    is_steamspy_api_paginated: bool = True,
+    year_constraint: str | None = "equality",
+    release_year_index: dict[str, int] | None = None,
+    is_dist_partial: bool = False,
 ) -> tuple[list[str], list[int]]:
-    if use_levenshtein_distance:
-        # n is not used by Levenshtein distance.
-        n = None
-    else:
-        # n is only used by difflib.
-        # NB: difflib may not return as many neighbors as requested, because difflib relies on a similarity cut-off.
-        n = num_closest_neighbors + max_num_tries_for_year
-
-    (sorted_app_ids, dist) = steampi.text_distances.find_most_similar_game_names(
-        game_name_input,
-        steamspy_database,
-        use_levenshtein_distance=use_levenshtein_distance,
-        n=n,
-    )
+    # Post-processing of the output of a search, i.e. appIDs sorted by distance to the input: year constraint, then
+    # hard-coded fixes. If is_dist_partial, dist is not expected to include every hard-coded appID.
 
     filtered_sorted_app_ids = sorted_app_ids
 
@@ -140,6 +158,7 @@ def find_closest_app_id(
             release_year,
             max_num_tries_for_year,
             year_constraint=year_constraint,
+            release_year_index=release_year_index,
         )
 
     closest_app_id = filtered_sorted_app_ids[0:num_closest_neighbors]
@@ -151,11 +170,7 @@ def find_closest_app_id(
             num_closest_neighbors,
         )
 
-        if not use_levenshtein_distance or is_steamspy_api_paginated:
-            # With difflib, computations are more expensive than with Levenshtein distance, therefore dist only contains
-            # distances for a few entries. So, we set the distance to 0.4 (default cut-off) for all the other entries.
-            #
-            # Edit: moreover, due to the pagination recently adopted by SteamSpy API, dist misses many entries nowadays.
+        if is_dist_partial:
             for app_id in closest_app_id:
                 if app_id not in dist:
                     dist[app_id] = get_default_distance_cut_off_for_difflib()
@@ -165,6 +180,325 @@ def find_closest_app_id(
     return closest_app_id, closest_distance
 
 
+def search_closest_app_ids(
+    game_name_input: str,
+    steamspy_database: dict,
+    release_year: str | None = None,
+    num_closest_neighbors: int = 1,
+    max_num_tries_for_year: int = 2,
+    *,
+    use_levenshtein_distance: bool = True,
+    year_constraint: str = "equality",
+    is_steamspy_api_paginated: bool = True,
+    eligible_database: dict | None = None,
+    trigram_index: TrigramIndex | None = None,
+    shortlist_size: int | None = None,
+    bk_tree: BKTree | None = None,
+    difflib_index: DifflibIndex | None = None,
+) -> tuple[list[str], dict, str | None, bool]:
+    # Search step of find_closest_app_id(), without any release year lookup: appIDs sorted by distance to the input,
+    # the distances, then the release year and is_dist_partial, to be passed to select_closest_app_ids().
+    #
+    # If provided, eligible_database is the part of the SteamSpy database which satisfies the year constraint, e.g.
+    # computed with get_eligible_database(). Eligible titles are matched first, and kept if they are close enough, unless
+    # a title of the whole SteamSpy database is strictly closer. The whole database is not searched for an exact match.
+    #
+    # If provided, trigram_index is used for the search over the whole SteamSpy database with Levenshtein distance:
+    # only a shortlist of shortlist_size names, which share the most trigrams with the input, are compared to it.
+    #
+    # If provided, bk_tree is used instead, for an exact search of the nearest neighbors with Levenshtein distance.
+    #
+    # If provided, difflib_index is used for the search over the whole SteamSpy database with difflib: the names which
+    # cannot reach the similarity cut-off are pruned first, with the same output as the search over the whole database.
+
+    is_using_bk_tree = bk_tree is not None and use_levenshtein_distance
+    is_using_trigram_index = (
+        trigram_index is not None and use_levenshtein_distance and not is_using_bk_tree
+    )
+
+    if use_levenshtein_distance:
+        # n is not used by Levenshtein distance.
+        n = None
+    else:
+        # n is only used by difflib.
+        # NB: difflib may not return as many neighbors as requested, because difflib relies on a similarity cut-off.
+        n = num_closest_neighbors + max_num_tries_for_year
+
+    is_searching_eligible_titles = bool(
+        eligible_database and release_year is not None and year_constraint is not None,
+    )
+
+    if is_searching_eligible_titles:
+        (eligible_app_ids, eligible_dist) = (
+            steampi.text_distances.find_most_similar_game_names(
+                game_name_input,
+                eligible_database,
+                use_levenshtein_distance=use_levenshtein_distance,
+                n=n,
+            )
+        )
+
+        is_searching_eligible_titles = bool(
+            eligible_app_ids
+            and is_close_enough(
+                game_name_input,
+                eligible_dist[eligible_app_ids[0]],
+                use_levenshtein_distance=use_levenshtein_distance,
+            ),
+        )
+
+    # An exact match among eligible titles cannot be improved. Otherwise, the whole SteamSpy database is searched too.
+    is_searching_whole_database = (
+        not is_searching_eligible_titles or eligible_dist[eligible_app_ids[0]] > 0
+    )
+
+    if is_searching_whole_database and is_using_bk_tree:
+        # The neighbors which could be discarded by constrain_app_id_search_by_year() are also retrieved.
+        (sorted_app_ids, dist) = bk_tree.find_nearest_game_names(
+            game_name_input,
+            num_neighbors=num_closest_neighbors + max_num_tries_for_year,
+        )
+    elif is_searching_whole_database and is_using_trigram_index:
+        (sorted_app_ids, dist) = trigram_index.find_most_similar_game_names(
+            game_name_input,
+            shortlist_size=shortlist_size,
+        )
+    elif (
+        is_searching_whole_database
+        and not use_levenshtein_distance
+        and difflib_index is not None
+    ):
+        (sorted_app_ids, dist) = difflib_index.find_most_similar_game_names(
+            game_name_input,
+            n=n,
+            cutoff=1 - get_default_distance_cut_off_for_difflib(),
+        )
+    elif is_searching_whole_database:
+        (sorted_app_ids, dist) = steampi.text_distances.find_most_similar_game_names(
+            game_name_input,
+            steamspy_database,
+            use_levenshtein_distance=use_levenshtein_distance,
+            n=n,
+        )
+
+    if is_searching_eligible_titles and is_searching_whole_database:
+        # The eligible titles are preferred, unless a title of the whole database is strictly closer to the input, e.g.
+        # an exact match for a title released in another year, which is kept as without the index.
+        is_searching_eligible_titles = not (
+            sorted_app_ids
+            and dist[sorted_app_ids[0]] < eligible_dist[eligible_app_ids[0]]
+        )
+
+    if is_searching_eligible_titles:
+        (sorted_app_ids, dist) = (eligible_app_ids, eligible_dist)
+
+    # With difflib, computations are more expensive than with Levenshtein distance, therefore dist only contains
+    # distances for a few entries. So, we set the distance to 0.4 (default cut-off) for all the other entries.
+    #
+    # Edit: moreover, due to the pagination recently adopted by SteamSpy API, dist misses many entries nowadays.
+    # Likewise, dist misses every title which is not eligible, when the search is restricted to eligible titles,
+    # and every title which is not shortlisted, when the search relies on the trigram index or on the BK-tree.
+    is_dist_partial = (
+        not use_levenshtein_distance
+        or is_steamspy_api_paginated
+        or is_searching_eligible_titles
+        or is_using_trigram_index
+        or is_using_bk_tree
+    )
+
+    # Eligible titles already satisfy the year constraint.
+    return (
+        sorted_app_ids,
+        dist,
+        None if is_searching_eligible_titles else release_year,
+        is_dist_partial,
+    )
+
+
+def find_closest_app_id(
+    game_name_input: str,
+    steamspy_database: dict,
+    release_year: str | None = None,
+    num_closest_neighbors: int = 1,
+    max_num_tries_for_year: int = 2,
+    *,
+    use_levenshtein_distance: bool = True,
+    year_constraint: str = "equality",
+    is_steamspy_api_paginated: bool = True,
+    release_year_index: dict[str, int] | None = None,
+    eligible_database: dict | None = None,
+    trigram_index: TrigramIndex | None = None,
+    shortlist_size: int | None = None,
+    bk_tree: BKTree | None = None,
+    difflib_index: DifflibIndex | None = None,
+) -> tuple[list[str], list[int]]:
+    # See search_closest_app_ids() for the search options, and select_closest_app_ids() for the post-processing.
+
+    (sorted_app_ids, dist, release_year, is_dist_partial) = search_closest_app_ids(
+        game_name_input,
+        steamspy_database,
+        release_year,
+        num_closest_neighbors,
+        max_num_tries_for_year,
+        use_levenshtein_distance=use_levenshtein_distance,
+        year_constraint=year_constraint,
+        is_steamspy_api_paginated=is_steamspy_api_paginated,
+        eligible_database=eligible_database,
+        trigram_index=trigram_index,
+        shortlist_size=shortlist_size,
+        bk_tree=bk_tree,
+        difflib_index=difflib_index,
+    )
+
+    return select_closest_app_ids(
+        game_name_input,
+        sorted_app_ids,
+        dist,
+        release_year=release_year,
+        num_closest_neighbors=num_closest_neighbors,
+        max_num_tries_for_year=max_num_tries_for_year,
+        year_constraint=year_constraint,
+        release_year_index=release_year_index,
+        is_dist_partial=is_dist_partial,
+    )
+
+
+def initialize_matching_worker(steamspy_database: dict, search_params: dict) -> None:
+    # With the "fork" start method, the SteamSpy database is shared copy-on-write. Otherwise, it is sent once per worker.
+
+    MATCHING_WORKER_STATE["steamspy_database"] = steamspy_database
+    MATCHING_WORKER_STATE["search_params"] = search_params
+
+
+def search_closest_app_ids_in_worker(
+    raw_name: str,
+) -> tuple[list[str], dict, str | None, bool]:
+    # Only the neighbors which can be selected by select_closest_app_ids() are sent back, along with their distances,
+    # and the distance of the hard-coded match, if any.
+
+    search_params = MATCHING_WORKER_STATE["search_params"]
+
+    (sorted_app_ids, dist, release_year, is_dist_partial) = search_closest_app_ids(
+        raw_name,
+        MATCHING_WORKER_STATE["steamspy_database"],
+        **search_params,
+    )
+
+    sorted_app_ids = sorted_app_ids[
+        : search_params["num_closest_neighbors"]
+        + search_params["max_num_tries_for_year"]
+    ]
+
+    app_ids_with_distance = list(sorted_app_ids)
+    if check_database_of_problematic_game_names(raw_name):
+        app_ids_with_distance.append(find_hard_coded_app_id(raw_name))
+
+    return (
+        sorted_app_ids,
+        {app_id: dist[app_id] for app_id in app_ids_with_distance if app_id in dist},
+        release_year,
+        is_dist_partial,
+    )
+
+
+def find_closest_app_ids_in_parallel(
+    raw_names: list[str],
+    steamspy_database: dict,
+    search_params: dict,
+    release_year_index: dict[str, int],
+    max_workers: int | None = None,
+) -> dict[str, tuple[list[str], list[int]]]:
+    # Dict: raw name ---> (closest_app_id, closest_distance), in the order of raw_names, whatever the number of workers.
+    #
+    # The workers only compute the distances. Release years are looked up by the parent process, with app details which
+    # are prefetched once, with the rate limit of the Steam store, so that the workers never download anything.
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=initialize_matching_worker,
+        initargs=(steamspy_database, search_params),
+    ) as executor:
+        search_results = list(
+            executor.map(search_closest_app_ids_in_worker, raw_names),
+        )
+
+    # AppIDs which can be checked by constrain_app_id_search_by_year(), if their release year is unknown.
+    app_ids = [
+        app_id
+        for sorted_app_ids, _, release_year, _ in search_results
+        if release_year is not None and search_params["year_constraint"] is not None
+        for app_id in sorted_app_ids[: search_params["max_num_tries_for_year"]]
+        if app_id not in release_year_index and int(app_id) > 0
+    ]
+
+    steam_app_details = prefetch_app_details(list(dict.fromkeys(app_ids)))
+
+    # Release years of app details which could not be loaded are used during this run, but they are not indexed.
+    release_years = dict(release_year_index)
+    for app_id, app_details in steam_app_details.items():
+        release_years[app_id] = get_release_year(
+            app_id,
+            release_year_index,
+            app_details=app_details,
+        )
+
+    closest_app_ids = {}
+
+    for raw_name, (sorted_app_ids, dist, release_year, is_dist_partial) in zip(
+        raw_names,
+        search_results,
+        strict=True,
+    ):
+        closest_app_ids[raw_name] = select_closest_app_ids(
+            raw_name,
+            sorted_app_ids,
+            dist,
+            release_year=release_year,
+            num_closest_neighbors=search_params["num_closest_neighbors"],
+            max_num_tries_for_year=search_params["max_num_tries_for_year"],
+            year_constraint=search_params["year_constraint"],
+            release_year_index=release_years,
+            is_dist_partial=is_dist_partial,
+        )
+
+    # Release years which were looked up during the selection, e.g. for dummy appIDs, were successfully loaded.
+    release_year_index.update(
+        {
+            app_id: release_years[app_id]
+            for app_id in release_years
+            if app_id not in steam_app_details
+        },
+    )
+
+    return closest_app_ids
+
+
+def get_match_key(raw_name: str) -> str:
+    # Spelling variants of a name share the same match, except for names with a hard-coded match, which is specific to
+    # the raw name, and except for names made only of punctuation or symbols, e.g. "?!", whose canonical form is empty.
+
+    if check_database_of_problematic_game_names(raw_name):
+        return raw_name
+
+    return get_canonical_name(raw_name) or raw_name
+
+
+def get_distinct_raw_names(
+    raw_votes: dict,
+    goty_field: str = "goty_preferences",
+) -> list[str]:
+    # Raw names which are not noisy, one per match key, in order of first appearance on the ballots.
+
+    distinct_raw_names = {}
+
+    for voter in raw_votes:
+        for raw_name in raw_votes[voter][goty_field].values():
+            if not is_a_noisy_vote(raw_name):
+                distinct_raw_names.setdefault(get_match_key(raw_name), raw_name)
+
+    return list(distinct_raw_names.values())
+
+
 def precompute_matches(
     raw_votes: dict,
     release_year: str | None = None,
@@ -175,11 +509,160 @@ def precompute_matches(
     year_constraint: str = "equality",
     goty_field: str = "goty_preferences",
     is_steamspy_api_paginated: bool = True,
+    steamspy_database: dict | None = None,
+    use_year_partitioned_index: bool = False,
+    use_trigram_index: bool = False,
+    shortlist_size: int | None = None,
+    use_bk_tree: bool = False,
+    use_batched_levenshtein: bool = False,
+    max_workers: int | None = 1,
+    use_match_cache: bool = False,
+    match_cache_file_name: str | None = None,
+    use_difflib_index: bool = True,
+    release_year_index_file_name: str | None = None,
 ) -> dict:
+    # NB: steamspy_database is the extended SteamSpy database, e.g. the local database of a PipelineContext, if any.
+    #
+    # With use_year_partitioned_index, names are first matched with the titles released during the target year(s),
+    # based on the release years of every appID with app details cached on disk. See find_closest_app_id().
+    #
+    # With use_trigram_index, the Levenshtein distance is only computed for a shortlist of names, thanks to a trigram
+    # index which is built once per snapshot of the SteamSpy database.
+    #
+    # With use_bk_tree, the nearest neighbors are exactly the same as with the search over the whole SteamSpy database,
+    # but most of the database is pruned thanks to a BK-tree, which is also built once per snapshot of the database.
+    #
+    # With use_batched_levenshtein, the distances between every distinct name and the SteamSpy database are computed at
+    # once with array operations, instead of one search per name. The nearest neighbors are exactly the same.
+    #
+    # If max_workers is not 1, the distinct names are matched in parallel with a pool of processes, where None means one
+    # process per CPU. The matches are the same, and in the same order, as with a single process.
+    #
+    # With use_match_cache, matches are stored on disk, so that names which were matched during a previous run, with the
+    # same release year, year constraint and distance metric, are not matched again. See load_match_cache(). Matches
+    # are not cached if they rely on the trigram index, which is approximate.
+    #
+    # Spelling variants of a name, i.e. raw names with the same match key, are matched once and share the match.
+    #
+    # With use_difflib_index, difflib is only run for the names which can reach the similarity cut-off, with the same
+    # matches as without the index. It is only relevant if Levenshtein distance is not used.
+
     seen_game_names = set()
     matches = {}
+    matches_by_key = {}
+
+    if steamspy_database is None:
+        steamspy_database = load_extended_steamspy_database()
+
+    # Release years are parsed at most once per appID, across runs.
+    if use_year_partitioned_index and release_year is not None:
+        release_year_index = build_release_year_index(
+            file_name=release_year_index_file_name,
+        )
+        eligible_database = get_eligible_database(
+            partition_database_by_release_year(steamspy_database, release_year_index),
+            release_year,
+            year_constraint=year_constraint,
+        )
+    else:
+        release_year_index = load_release_year_index(
+            file_name=release_year_index_file_name,
+        )
+        eligible_database = None
+    num_indexed_app_ids = len(release_year_index)
+
+    if use_trigram_index and use_levenshtein_distance:
+        trigram_index = load_trigram_index(steamspy_database)
+    else:
+        trigram_index = None
+
+    if use_bk_tree and use_levenshtein_distance:
+        bk_tree = load_bk_tree(steamspy_database)
+    else:
+        bk_tree = None
+
+    if use_difflib_index and not use_levenshtein_distance:
+        difflib_index = DifflibIndex.from_database(steamspy_database)
+    else:
+        difflib_index = None
 
-    steamspy_database = load_extended_steamspy_database()
+    # Approximate matches are not cached, so that they do not persist across runs.
+    if use_match_cache and is_matching_exact(
+        use_levenshtein_distance=use_levenshtein_distance,
+        use_trigram_index=use_trigram_index,
+        use_bk_tree=use_bk_tree,
+        use_batched_levenshtein=use_batched_levenshtein,
+        is_searching_eligible_titles_first=eligible_database is not None,
+    ):
+        match_cache = load_match_cache(
+            steamspy_database,
+            file_name=match_cache_file_name,
+        )
+        distance_metric = get_distance_metric_name(
+            num_closest_neighbors,
+            max_num_tries_for_year,
+            use_levenshtein_distance=use_levenshtein_distance,
+            use_trigram_index=use_trigram_index,
+            shortlist_size=shortlist_size,
+            use_year_partitioned_index=use_year_partitioned_index,
+        )
+        num_cached_matches = len(match_cache.entries)
+    else:
+        match_cache = None
+
+    def get_cached_match(match_key: str) -> dict | None:
+        if match_cache is None:
+            return None
+        return match_cache.get_match(
+            get_match_cache_key(
+                match_key,
+                release_year,
+                year_constraint,
+                distance_metric,
+            ),
+        )
+
+    raw_names_to_match = [
+        raw_name
+        for raw_name in get_distinct_raw_names(raw_votes, goty_field=goty_field)
+        if get_cached_match(get_match_key(raw_name)) is None
+    ]
+
+    if (
+        use_batched_levenshtein
+        and use_levenshtein_distance
+        and eligible_database is None
+    ):
+        nearest_game_names = find_nearest_game_names_in_batch(
+            raw_names_to_match,
+            steamspy_database,
+            num_neighbors=num_closest_neighbors + max_num_tries_for_year,
+        )
+    else:
+        nearest_game_names = {}
+
+    if max_workers != 1 and not nearest_game_names:
+        closest_app_ids = find_closest_app_ids_in_parallel(
+            raw_names_to_match,
+            steamspy_database,
+            search_params={
+                "release_year": release_year,
+                "num_closest_neighbors": num_closest_neighbors,
+                "max_num_tries_for_year": max_num_tries_for_year,
+                "use_levenshtein_distance": use_levenshtein_distance,
+                "year_constraint": year_constraint,
+                "is_steamspy_api_paginated": is_steamspy_api_paginated,
+                "eligible_database": eligible_database,
+                "trigram_index": trigram_index,
+                "shortlist_size": shortlist_size,
+                "bk_tree": bk_tree,
+                "difflib_index": difflib_index,
+            },
+            release_year_index=release_year_index,
+            max_workers=max_workers,
+        )
+    else:
+        closest_app_ids = {}
 
     for voter in raw_votes:
         for raw_name in raw_votes[voter][goty_field].values():
@@ -187,36 +670,95 @@ def precompute_matches(
                 seen_game_names.add(raw_name)
 
                 if not is_a_noisy_vote(raw_name):
-                    (closest_app_id, closest_distance) = find_closest_app_id(
-                        raw_name,
-                        steamspy_database,
-                        release_year,
-                        num_closest_neighbors,
-                        max_num_tries_for_year,
-                        use_levenshtein_distance=use_levenshtein_distance,
-                        year_constraint=year_constraint,
-                        is_steamspy_api_paginated=is_steamspy_api_paginated,
-                    )
+                    match_key = get_match_key(raw_name)
+
+                    if match_key in matches_by_key:
+                        cached_match = matches_by_key[match_key]
+                    else:
+                        cached_match = get_cached_match(match_key)
+
+                    if cached_match is not None:
+                        element = {
+                            "input_name": raw_name,
+                            "matched_appID": cached_match["matched_appID"],
+                            "matched_name": cached_match["matched_name"],
+                            "match_distance": cached_match["match_distance"],
+                        }
+                    else:
+                        if raw_name in nearest_game_names:
+                            (closest_app_id, closest_distance) = select_closest_app_ids(
+                                raw_name,
+                                *nearest_game_names[raw_name],
+                                release_year=release_year,
+                                num_closest_neighbors=num_closest_neighbors,
+                                max_num_tries_for_year=max_num_tries_for_year,
+                                year_constraint=year_constraint,
+                                release_year_index=release_year_index,
+                                is_dist_partial=True,
+                            )
+                        elif raw_name in closest_app_ids:
+                            (closest_app_id, closest_distance) = closest_app_ids[
+                                raw_name
+                            ]
+                        else:
+                            (closest_app_id, closest_distance) = find_closest_app_id(
+                                raw_name,
+                                steamspy_database,
+                                release_year,
+                                num_closest_neighbors,
+                                max_num_tries_for_year,
+                                use_levenshtein_distance=use_levenshtein_distance,
+                                year_constraint=year_constraint,
+                                is_steamspy_api_paginated=is_steamspy_api_paginated,
+                                release_year_index=release_year_index,
+                                eligible_database=eligible_database,
+                                trigram_index=trigram_index,
+                                shortlist_size=shortlist_size,
+                                bk_tree=bk_tree,
+                                difflib_index=difflib_index,
+                            )
+
+                        # Due to the pagination recently adopted by SteamSpy API, dist misses many entries nowadays.
+                        if is_steamspy_api_paginated:
+                            for app_id in closest_app_id:
+                                if app_id not in steamspy_database:
+                                    steamspy_database[app_id] = {}
+                                    steamspy_database[app_id]["name"] = (
+                                        get_app_name_for_problematic_app_id(app_id)
+                                    )
+
+                        element = {
+                            "input_name": raw_name,
+                            "matched_appID": closest_app_id,
+                            "matched_name": [
+                                steamspy_database[appID]["name"]
+                                for appID in closest_app_id
+                            ],
+                            "match_distance": closest_distance,
+                        }
+
+                        if match_cache is not None:
+                            match_cache.add_match(
+                                get_match_cache_key(
+                                    match_key,
+                                    release_year,
+                                    year_constraint,
+                                    distance_metric,
+                                ),
+                                element,
+                            )
+
+                    matches_by_key[match_key] = element
+                    matches[raw_name] = element
 
-                    # Due to the pagination recently adopted by SteamSpy API, dist misses many entries nowadays.
-                    if is_steamspy_api_paginated:
-                        for app_id in closest_app_id:
-                            if app_id not in steamspy_database:
-                                steamspy_database[app_id] = {}
-                                steamspy_database[app_id]["name"] = (
-                                    get_app_name_for_problematic_app_id(app_id)
-                                )
-
-                    element = {
-                        "input_name": raw_name,
-                        "matched_appID": closest_app_id,
-                        "matched_name": [
-                            steamspy_database[appID]["name"] for appID in closest_app_id
-                        ],
-                        "match_distance": closest_distance,
-                    }
+    if len(release_year_index) > num_indexed_app_ids:
+        save_release_year_index(
+            release_year_index,
+            file_name=release_year_index_file_name,
+        )
 
-                    matches[raw_name] = element
+    if match_cache is not None and len(match_cache.entries) > num_cached_matches:
+        save_match_cache(match_cache, file_name=match_cache_file_name)
 
     return matches
 
@@ -228,8 +770,10 @@ def display_matches(matches: dict, *, print_after_sort: bool = True) -> None:
     if print_after_sort:
         sorted_keys = sorted(
             matches.keys(),
-            key=lambda x: matches[x]["match_distance"][neighbor_reference_index]
-            / (1 + len(matches[x]["input_name"])),
+            key=lambda x: (
+                matches[x]["match_distance"][neighbor_reference_index]
+                / (1 + len(matches[x]["input_name"]))
+            ),
         )
     else:
         sorted_keys = list(matches.keys())
@@ -317,7 +861,17 @@ def standardize_ballots(
     year_constraint: str = "equality",
     print_matches: bool = True,
     verbose: bool = False,
+    context: PipelineContext | None = None,
+    use_year_partitioned_index: bool = False,
+    use_trigram_index: bool = False,
+    use_bk_tree: bool = False,
+    use_batched_levenshtein: bool = False,
+    max_workers: int | None = 1,
+    use_match_cache: bool = False,
+    use_igdb_alias_index: bool = False,
 ) -> tuple[dict, dict]:
+    # If provided, the context supplies the SteamSpy database, or receives the IGDB databases, for the next stages.
+
     if use_igdb:
         # Using IGDB
 
@@ -333,6 +887,7 @@ def standardize_ballots(
                 goty_field=goty_field,
                 year_constraint=year_constraint,
                 verbose=verbose,
+                use_igdb_alias_index=use_igdb_alias_index,
             )
         else:
             igdb_match_database, igdb_local_database = load_igdb_local_databases(
@@ -344,6 +899,7 @@ def standardize_ballots(
                 goty_field=goty_field,
                 year_constraint=year_constraint,
                 verbose=verbose,
+                use_igdb_alias_index=use_igdb_alias_index,
             )
 
         if print_matches:
@@ -359,6 +915,18 @@ def standardize_ballots(
             igdb_local_database,
         )
 
+        if context is not None:
+            if not apply_hard_coded_extension_and_fixes:
+                # The next stages rely on the extended databases, even if the matches do not.
+                igdb_match_database, igdb_local_database = extend_both_igdb_databases(
+                    release_year=release_year,
+                    igdb_match_database=igdb_match_database,
+                    igdb_local_database=igdb_local_database,
+                    verbose=verbose,
+                )
+
+            context.set_igdb_databases(igdb_match_database, igdb_local_database)
+
     else:
         # Using SteamSpy
 
@@ -370,6 +938,13 @@ def standardize_ballots(
             use_levenshtein_distance=use_levenshtein_distance,
             year_constraint=year_constraint,
             goty_field=goty_field,
+            steamspy_database=context.local_database if context is not None else None,
+            use_year_partitioned_index=use_year_partitioned_index,
+            use_trigram_index=use_trigram_index,
+            use_bk_tree=use_bk_tree,
+            use_batched_levenshtein=use_batched_levenshtein,
+            max_workers=max_workers,
+            use_match_cache=use_match_cache,
         )
 
         if print_matches:
@@ -1,3 +1,7 @@
+from collections.abc import Callable
+
+import numpy as np
+
 type Ballots = dict[str, dict]
 type HardCodedIDs = dict[str, dict[str, str]]
 type Indices = dict[str, dict[str, list[int | None]]]
@@ -5,3 +9,7 @@ type Params = dict[str, dict[str, int]]
 type Ranking = list[list[str]]
 type OptionalBallots = list[str]
 type OptionalRanking = list[tuple[str, int]]
+type CandidateRegistry = dict[str, int]
+type TieBreakCache = dict[tuple[frozenset[str], int], Ranking]
+type RankingMethod = Callable[[list[str], np.ndarray], Ranking]
+type BallotFilter = Callable[[str], bool]
@@ -0,0 +1,85 @@
+import unicodedata
+
+
+def get_trademark_symbols() -> tuple[str, ...]:
+    # Removed before the Unicode normalization, which would otherwise turn "™" into "TM".
+
+    return ("™", "®", "©", "℠")
+
+
+def get_apostrophes() -> tuple[str, ...]:
+    # Removed without a space, so that "Baldur's Gate" and "Baldurs Gate" are the same.
+
+    return (
+        "'",
+        "\N{RIGHT SINGLE QUOTATION MARK}",
+        "\N{LEFT SINGLE QUOTATION MARK}",
+        "`",
+    )
+
+
+def get_roman_numerals() -> dict[str, str]:
+    # Roman numerals, as separate words, are replaced with arabic numerals. "i" and "x" are skipped on purpose: the former
+    # is mostly the pronoun, and the latter is often part of the name, e.g. "Mega Man X" is not "Mega Man 10".
+
+    roman_numerals = [
+        "ii",
+        "iii",
+        "iv",
+        "v",
+        "vi",
+        "vii",
+        "viii",
+        "ix",
+        "xi",
+        "xii",
+        "xiii",
+        "xiv",
+        "xv",
+        "xvi",
+        "xvii",
+        "xviii",
+        "xix",
+        "xx",
+    ]
+
+    numbers = [2, 3, 4, 5, 6, 7, 8, 9, 11, 12, 13, 14, 15, 16, 17, 18, 19, 20]
+
+    return {
+        roman_numeral: str(number)
+        for roman_numeral, number in zip(roman_numerals, numbers, strict=True)
+    }
+
+
+def is_punctuation_or_symbol(character: str) -> bool:
+    # Unicode categories: P* for punctuation, S* for symbols.
+
+    return unicodedata.category(character)[0] in ("P", "S")
+
+
+def get_canonical_name(raw_name: str) -> str:
+    # Canonical form of a game name, shared by every spelling variant, e.g. "ELDEN RING™", "Elden Ring " and "elden ring".
+    # It is a key to deduplicate names before matching them. It is not meant to be displayed, nor to be matched.
+
+    name = raw_name
+
+    for character in get_trademark_symbols() + get_apostrophes():
+        name = name.replace(character, "")
+
+    # Compatibility decomposition, e.g. full-width characters and ligatures, then removal of the accents.
+    name = "".join(
+        character
+        for character in unicodedata.normalize("NFKD", name)
+        if not unicodedata.combining(character)
+    )
+
+    name = name.casefold()
+
+    name = "".join(
+        " " if is_punctuation_or_symbol(character) else character for character in name
+    )
+
+    roman_numerals = get_roman_numerals()
+
+    # NB: split() also collapses the whitespace.
+    return " ".join(roman_numerals.get(word, word) for word in name.split())
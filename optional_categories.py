@@ -63,11 +63,21 @@ def match_optional_ballots(
     must_be_available_on_pc: bool = False,
     must_be_a_game: bool = False,
     use_levenshtein_distance: bool = True,
+    use_trigram_index: bool = False,
+    use_match_cache: bool = False,
 ) -> OptionalBallots:
     import steampi.calendar
 
+    from difflib_index import DifflibIndex
     from extend_steamspy import load_extended_steamspy_database
-    from match_names import find_closest_app_id
+    from match_cache import (
+        get_distance_metric_name,
+        get_match_cache_key,
+        load_match_cache,
+        save_match_cache,
+    )
+    from match_names import find_closest_app_id, get_match_key
+    from trigram_index import load_trigram_index
 
     seen_game_names = set()
     matches: dict = {}
@@ -111,6 +121,28 @@ def match_optional_ballots(
         igdb_match_database = {}
         local_database = load_extended_steamspy_database()
 
+    if use_trigram_index and not use_igdb and use_levenshtein_distance:
+        trigram_index = load_trigram_index(local_database)
+    else:
+        trigram_index = None
+
+    if not use_igdb and not use_levenshtein_distance:
+        difflib_index = DifflibIndex.from_database(local_database)
+    else:
+        difflib_index = None
+
+    # Matches are shared across optional categories, and across runs, as long as the SteamSpy database does not change.
+    if use_match_cache and not use_igdb:
+        match_cache = load_match_cache(local_database)
+        distance_metric = get_distance_metric_name(
+            num_closest_neighbors=1,
+            use_levenshtein_distance=use_levenshtein_distance,
+            use_trigram_index=trigram_index is not None,
+        )
+        num_cached_matches = len(match_cache.entries)
+    else:
+        match_cache = None
+
     print()
 
     for raw_name in optional_ballots:
@@ -150,11 +182,40 @@ def match_optional_ballots(
             else:
                 # Using SteamSpy
 
-                (closest_app_id, _) = find_closest_app_id(
-                    raw_name,
-                    steamspy_database=local_database,
-                    use_levenshtein_distance=use_levenshtein_distance,
-                )
+                if match_cache is not None:
+                    match_cache_key = get_match_cache_key(
+                        get_match_key(raw_name),
+                        release_year=None,
+                        year_constraint=None,
+                        distance_metric=distance_metric,
+                    )
+                    cached_match = match_cache.get_match(match_cache_key)
+                else:
+                    cached_match = None
+
+                if cached_match is not None:
+                    closest_app_id = cached_match["matched_appID"]
+                else:
+                    (closest_app_id, closest_distance) = find_closest_app_id(
+                        raw_name,
+                        steamspy_database=local_database,
+                        use_levenshtein_distance=use_levenshtein_distance,
+                        trigram_index=trigram_index,
+                        difflib_index=difflib_index,
+                    )
+
+                    if match_cache is not None:
+                        match_cache.add_match(
+                            match_cache_key,
+                            {
+                                "matched_appID": closest_app_id,
+                                "matched_name": [
+                                    local_database[app_id]["name"]
+                                    for app_id in closest_app_id
+                                ],
+                                "match_distance": closest_distance,
+                            },
+                        )
 
                 app_id = closest_app_id[0]
 
@@ -193,6 +254,9 @@ def match_optional_ballots(
 
         matched_optional_ballots.append(my_str)
 
+    if match_cache is not None and len(match_cache.entries) > num_cached_matches:
+        save_match_cache(match_cache)
+
     return matched_optional_ballots
 
 
@@ -0,0 +1,191 @@
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from anonymize_data import get_data_folder
+from candidate_registry import (
+    build_candidate_registry,
+    collapse_identical_ballots,
+    encode_standardized_ballots,
+    get_app_ids_from_registry,
+)
+from my_types import Ballots, CandidateRegistry, Ranking
+from schulze_engine import (
+    compute_pairwise_preferences_from_ballot_matrix,
+    compute_strongest_paths,
+    count_rankings,
+    rank_candidates,
+)
+
+
+@dataclass
+class PairwisePreferences:
+    # d[V,W] is the number of voters who prefer candidate V over W, where unranked candidates tie last on a ballot.
+    # num_rankings[V] is the number of voters who rank candidate V.
+    # Both are indexed like app_ids, which is the interned candidate registry.
+    #
+    # Ballot sources can be counted independently, then merged by addition before the strongest-path step.
+
+    app_ids: list[str]
+    d: np.ndarray
+    num_rankings: np.ndarray
+    num_voters: int = 0
+
+    @classmethod
+    def from_standardized_ballots(
+        cls,
+        standardized_ballots: Ballots,
+        candidate_registry: CandidateRegistry | None = None,
+    ) -> "PairwisePreferences":
+        if candidate_registry is None:
+            candidate_registry = build_candidate_registry(standardized_ballots)
+
+        _, ballot_matrix = encode_standardized_ballots(
+            standardized_ballots,
+            candidate_registry,
+        )
+
+        unique_ballot_matrix, weights = collapse_identical_ballots(ballot_matrix)
+        num_candidates = len(candidate_registry)
+
+        return cls(
+            app_ids=get_app_ids_from_registry(candidate_registry),
+            d=compute_pairwise_preferences_from_ballot_matrix(
+                unique_ballot_matrix,
+                weights,
+                num_candidates=num_candidates,
+            ),
+            num_rankings=count_rankings(unique_ballot_matrix, weights, num_candidates),
+            num_voters=ballot_matrix.shape[0],
+        )
+
+    def get_candidate_registry(self) -> CandidateRegistry:
+        return {app_id: i for i, app_id in enumerate(self.app_ids)}
+
+    def align(self, app_ids: list[str]) -> "PairwisePreferences":
+        # Re-index the counts on a superset of the candidates. A candidate which is absent from this ballot source is
+        # unranked on every ballot, hence it loses to every candidate which is ranked: d[V,W] = num_rankings[V].
+
+        candidate_registry = self.get_candidate_registry()
+        old_indices = np.array(
+            [candidate_registry.get(app_id, -1) for app_id in app_ids],
+            dtype=np.int64,
+        )
+        is_known = old_indices >= 0
+
+        num_rankings = np.zeros(len(app_ids), dtype=np.int64)
+        num_rankings[is_known] = self.num_rankings[old_indices[is_known]]
+
+        d = np.zeros((len(app_ids), len(app_ids)), dtype=np.int64)
+        d[:, ~is_known] = num_rankings[:, np.newaxis]
+        d[np.ix_(is_known, is_known)] = self.d[
+            np.ix_(old_indices[is_known], old_indices[is_known])
+        ]
+        np.fill_diagonal(d, 0)
+
+        return type(self)(
+            app_ids=list(app_ids),
+            d=d,
+            num_rankings=num_rankings,
+            num_voters=self.num_voters,
+        )
+
+    def __add__(self, other: "PairwisePreferences") -> "PairwisePreferences":
+        known_app_ids = set(self.app_ids)
+        app_ids = self.app_ids + [
+            app_id for app_id in other.app_ids if app_id not in known_app_ids
+        ]
+
+        left = self.align(app_ids)
+        right = other.align(app_ids)
+
+        return type(self)(
+            app_ids=app_ids,
+            d=left.d + right.d,
+            num_rankings=left.num_rankings + right.num_rankings,
+            num_voters=left.num_voters + right.num_voters,
+        )
+
+    def get_active_candidates(self) -> tuple[list[str], np.ndarray]:
+        # Only candidates which are ranked on at least one ballot are ranked, as with compute_schulze_ranking().
+
+        is_active = self.num_rankings > 0
+
+        candidate_names = [self.app_ids[i] for i in np.flatnonzero(is_active)]
+
+        return candidate_names, self.d[np.ix_(is_active, is_active)]
+
+    def get_ranking(self, top_k: int | None = None) -> Ranking:
+        candidate_names, d = self.get_active_candidates()
+
+        return rank_candidates(candidate_names, compute_strongest_paths(d), top_k=top_k)
+
+    def to_dict(self) -> dict:
+        return {
+            "app_ids": self.app_ids,
+            "d": self.d.tolist(),
+            "num_rankings": self.num_rankings.tolist(),
+            "num_voters": self.num_voters,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PairwisePreferences":
+        num_candidates = len(data["app_ids"])
+
+        return cls(
+            app_ids=data["app_ids"],
+            d=np.array(data["d"], dtype=np.int64).reshape(
+                num_candidates,
+                num_candidates,
+            ),
+            num_rankings=np.array(data["num_rankings"], dtype=np.int64),
+            num_voters=data["num_voters"],
+        )
+
+
+def get_pairwise_preferences_file_name(source_name: str) -> str:
+    # Dict: app_ids, d, num_rankings, num_voters
+
+    return get_data_folder() + "pairwise_preferences_" + source_name + ".json"
+
+
+def save_pairwise_preferences(
+    pairwise_preferences: PairwisePreferences,
+    source_name: str,
+    file_name: str | None = None,
+) -> None:
+    if file_name is None:
+        file_name = get_pairwise_preferences_file_name(source_name)
+
+    with Path(file_name).open("w", encoding="utf-8") as f:
+        json.dump(pairwise_preferences.to_dict(), f)
+
+
+def load_pairwise_preferences(
+    source_name: str,
+    file_name: str | None = None,
+) -> PairwisePreferences:
+    if file_name is None:
+        file_name = get_pairwise_preferences_file_name(source_name)
+
+    with Path(file_name).open(encoding="utf-8") as f:
+        return PairwisePreferences.from_dict(json.load(f))
+
+
+def merge_pairwise_preferences(
+    pairwise_preferences_list: list[PairwisePreferences],
+) -> PairwisePreferences:
+    # Without any ballot source, the counts are empty, i.e. no candidate and no voter.
+
+    merged_pairwise_preferences = PairwisePreferences(
+        app_ids=[],
+        d=np.zeros((0, 0), dtype=np.int64),
+        num_rankings=np.zeros(0, dtype=np.int64),
+    )
+
+    for pairwise_preferences in pairwise_preferences_list:
+        merged_pairwise_preferences += pairwise_preferences
+
+    return merged_pairwise_preferences
@@ -0,0 +1,61 @@
+from dataclasses import dataclass, field
+
+from ballot_filters import Decision
+from disqualify_vote import load_disqualified_ids
+from extend_steamspy import load_extended_steamspy_database
+from my_types import HardCodedIDs
+from whitelist_vote import load_whitelisted_ids
+
+
+@dataclass
+class PipelineContext:
+    # Databases shared by every stage of apply_pipeline(), so that each one is loaded and extended exactly once per run.
+    #
+    # With SteamSpy, the local database is the extended SteamSpy database, and there is no match database.
+    # With IGDB, both databases depend on the ballots, hence they are set by standardize_ballots().
+    #
+    # The decision table of the release-year filter, i.e. appID ---> Decision(keep, reason), is filled during the run,
+    # cf. build_release_year_filter(), so that it can be read afterwards, e.g. for the audit log.
+
+    release_year: str | None = None
+    use_igdb: bool = False
+    match_database: dict = field(default_factory=dict)
+    local_database: dict = field(default_factory=dict)
+    whitelisted_ids: HardCodedIDs = field(default_factory=dict)
+    disqualified_ids: HardCodedIDs = field(default_factory=dict)
+    release_year_decisions: dict[str, Decision] = field(default_factory=dict)
+
+    @classmethod
+    def load(
+        cls,
+        release_year: str | None = None,
+        *,
+        use_igdb: bool = False,
+        steamspy_database: dict | None = None,
+    ) -> "PipelineContext":
+        if use_igdb:
+            local_database = {}
+        else:
+            local_database = load_extended_steamspy_database(steamspy_database)
+
+        return cls(
+            release_year=release_year,
+            use_igdb=use_igdb,
+            local_database=local_database,
+            whitelisted_ids=load_whitelisted_ids(
+                release_year=release_year,
+                use_igdb=use_igdb,
+            ),
+            disqualified_ids=load_disqualified_ids(
+                release_year=release_year,
+                use_igdb=use_igdb,
+            ),
+        )
+
+    def set_igdb_databases(
+        self,
+        igdb_match_database: dict,
+        igdb_local_database: dict,
+    ) -> None:
+        self.match_database = igdb_match_database
+        self.local_database = igdb_local_database
@@ -0,0 +1,196 @@
+import json
+from pathlib import Path
+
+import steampi.api
+
+from anonymize_data import get_data_folder
+from extend_steamspy import get_release_year_from_problematic_release_date
+from steam_app_details import (
+    get_release_date_as_str_from_app_details,
+    get_release_year_from_app_details,
+)
+
+
+def get_release_year_index_file_name() -> str:
+    # Dict: appID ---> release year, stored next to the SteamSpy database. The year is -1 without a release date.
+
+    return get_data_folder() + "release_year_index.json"
+
+
+def load_release_year_index(file_name: str | None = None) -> dict[str, int]:
+    if file_name is None:
+        file_name = get_release_year_index_file_name()
+
+    try:
+        with Path(file_name).open(encoding="utf-8") as f:
+            release_year_index = json.load(f)
+    except FileNotFoundError:
+        release_year_index = {}
+
+    return release_year_index
+
+
+def save_release_year_index(
+    release_year_index: dict[str, int],
+    file_name: str | None = None,
+) -> None:
+    if file_name is None:
+        file_name = get_release_year_index_file_name()
+
+    with Path(file_name).open("w", encoding="utf-8") as f:
+        json.dump(release_year_index, f)
+
+
+def compute_release_year(app_id: str, app_details: dict | None = None) -> int:
+    # Same as steampi.calendar.get_release_year(), with get_release_year_for_problematic_app_id() as a fallback for
+    # unexpected date formats.
+
+    if app_details is None:
+        app_details, _, _ = steampi.api.load_app_details(app_id)
+
+    try:
+        release_year = get_release_year_from_app_details(app_id, app_details)
+    except ValueError:
+        release_year = get_release_year_from_problematic_release_date(
+            get_release_date_as_str_from_app_details(app_id, app_details),
+        )
+
+    return release_year
+
+
+def get_release_year(
+    app_id: str,
+    release_year_index: dict[str, int],
+    app_details: dict | None = None,
+) -> int:
+    # Lookup in the index. On a miss, the release date is parsed once, and the release year is added to the index.
+    #
+    # NB: if the app details could not be loaded, e.g. due to a network error or to rate limits, the release year is not
+    # added to the index, so that the download is tried again later, instead of storing a year of -1 for good.
+
+    app_id = str(app_id)
+
+    if app_id not in release_year_index:
+        if app_details is None:
+            app_details, success_flag, _ = steampi.api.load_app_details(app_id)
+        else:
+            # Prefetched app details are empty if they could not be loaded, cf. load_app_details_with_rate_limit().
+            success_flag = bool(app_details)
+
+        release_year = compute_release_year(app_id, app_details)
+
+        if not success_flag:
+            return release_year
+
+        release_year_index[app_id] = release_year
+
+    return release_year_index[app_id]
+
+
+def get_app_ids_with_cached_app_details() -> list[str]:
+    app_details_folder = Path(steampi.api.get_appdetails_filename("")).parent
+
+    return [
+        path.stem.removeprefix("appID_")
+        for path in sorted(app_details_folder.glob("appID_*.json"))
+    ]
+
+
+def build_release_year_index(
+    app_ids: list[str] | None = None,
+    file_name: str | None = None,
+    *,
+    save_to_disk: bool = True,
+    steam_app_details: dict[str, dict] | None = None,
+) -> dict[str, int]:
+    # One-time build of the index, then incremental updates: only appIDs which are missing from the index are parsed.
+    # By default, the index covers every appID with app details cached on disk.
+    #
+    # NB: SteamSpy does not provide release dates, hence why they are read from the app details of the Steam store.
+
+    if app_ids is None:
+        app_ids = get_app_ids_with_cached_app_details()
+
+    if steam_app_details is None:
+        steam_app_details = {}
+
+    release_year_index = load_release_year_index(file_name=file_name)
+
+    num_indexed_app_ids = len(release_year_index)
+
+    for app_id in app_ids:
+        get_release_year(
+            app_id,
+            release_year_index,
+            app_details=steam_app_details.get(app_id),
+        )
+
+    if save_to_disk and len(release_year_index) > num_indexed_app_ids:
+        save_release_year_index(release_year_index, file_name=file_name)
+
+    return release_year_index
+
+
+def is_release_year_eligible(
+    matched_release_year: int,
+    release_year: str,
+    year_constraint: str | None = "equality",
+) -> bool:
+    if year_constraint == "equality":
+        # We want the matched release year to be equal to the target release year.
+        # NB: this is useful to compute the Game of the Year.
+        is_eligible = bool(matched_release_year == int(release_year))
+    elif year_constraint == "minimum":
+        # We want the matched release year to be greater than or equal to the target release year.
+        # NB: this should be useful to compute the Game of the last Decade.
+        is_eligible = bool(matched_release_year >= int(release_year))
+    elif year_constraint == "maximum":
+        # We want the matched release year to be less than or equal to the target release year.
+        is_eligible = bool(matched_release_year <= int(release_year))
+    else:
+        # We do not want to apply any constraint.
+        is_eligible = True
+
+    return is_eligible
+
+
+def partition_database_by_release_year(
+    steamspy_database: dict,
+    release_year_index: dict[str, int],
+) -> dict[int, dict]:
+    # Dict: release year ---> sub-database with the entries of the SteamSpy database released during this year.
+    #
+    # NB: appIDs which are missing from the release year index are not assigned to any partition.
+
+    partitions: dict[int, dict] = {}
+
+    for app_id, entry in steamspy_database.items():
+        if app_id in release_year_index:
+            partitions.setdefault(release_year_index[app_id], {})[app_id] = entry
+
+    return partitions
+
+
+def get_eligible_database(
+    partitions: dict[int, dict],
+    release_year: str,
+    year_constraint: str | None = "equality",
+) -> dict:
+    # Union of the partitions which satisfy the year constraint, e.g. a single year for the GotY, or a range of years
+    # for the Game of the Decade.
+
+    eligible_database = {}
+
+    for matched_release_year in sorted(partitions):
+        if is_release_year_eligible(
+            matched_release_year,
+            release_year,
+            year_constraint=year_constraint,
+        ):
+            eligible_database.update(partitions[matched_release_year])
+
+    return eligible_database
+
+
+if __name__ == "__main__":
+    release_year_index = build_release_year_index()
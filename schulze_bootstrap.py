@@ -0,0 +1,301 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from candidate_registry import (
+    build_candidate_registry,
+    collapse_identical_ballots,
+    encode_standardized_ballots,
+    get_app_ids_from_registry,
+    relabel_ranked_candidates,
+)
+from my_types import Ballots, CandidateRegistry, Ranking
+from schulze_engine import compute_strongest_paths
+
+# State of each worker process for the bootstrap: the distinct ballots, their probabilities, the number of voters and
+# the number of candidates, set once per worker by initialize_bootstrap_worker().
+BOOTSTRAP_WORKER_STATE: dict = {}
+
+
+def get_default_bootstrap_memory_budget() -> int:
+    # Memory budget of a batch of resamples, in bytes, per process. The pairwise tensors of a batch grow with the square
+    # of the number of candidates, hence the batch size is derived from this budget, cf. get_bootstrap_batch_size().
+
+    return 64 * 1024 * 1024
+
+
+def get_bootstrap_batch_size(
+    num_candidates: int,
+    memory_budget: int | None = None,
+) -> int:
+    # Number of resamples per batch, so that the int64 tensors of shape (batch size, C, C) fit in the memory budget.
+    # About 5 such tensors are alive at once: the bincount output, d, p, and the temporaries of compute_strongest_paths().
+
+    if memory_budget is None:
+        memory_budget = get_default_bootstrap_memory_budget()
+
+    num_bytes_per_resample = 5 * np.dtype(np.int64).itemsize * num_candidates**2
+
+    return max(1, memory_budget // max(num_bytes_per_resample, 1))
+
+
+def compute_pairwise_preferences_for_resamples(
+    ballot_matrix: np.ndarray,
+    resampled_weights: np.ndarray,
+    num_candidates: int,
+) -> np.ndarray:
+    # Same as compute_pairwise_preferences_from_ballot_matrix(), for a stack of weights with shape (B, K), where K is the
+    # number of distinct ballots. Output: the pairwise matrices of the B resamples, with shape (B, C, C).
+    #
+    # Only the pairs of ranked candidates are weighted, so that the work is linear in the number of ranked entries per
+    # resample, and no C x C matrix is ever stored per ballot.
+
+    num_resamples = resampled_weights.shape[0]
+    num_positions = ballot_matrix.shape[1]
+
+    above_positions, below_positions = np.triu_indices(num_positions, k=1)
+    candidates_above = ballot_matrix[:, above_positions]
+    candidates_below = ballot_matrix[:, below_positions]
+
+    is_pair = (candidates_above >= 0) & (candidates_below >= 0)
+    pair_ballots, _ = np.nonzero(is_pair)
+    pair_indices = candidates_above[is_pair] * num_candidates + candidates_below[is_pair]
+
+    resample_offsets = np.arange(num_resamples)[:, np.newaxis]
+
+    ranked_above = np.bincount(
+        (resample_offsets * num_candidates**2 + pair_indices).ravel(),
+        weights=resampled_weights[:, pair_ballots].ravel(),
+        minlength=num_resamples * num_candidates**2,
+    ).astype(np.int64)
+    ranked_above = ranked_above.reshape(num_resamples, num_candidates, num_candidates)
+
+    is_ranked = ballot_matrix >= 0
+    ranked_ballots, _ = np.nonzero(is_ranked)
+
+    num_rankings = np.bincount(
+        (resample_offsets * num_candidates + ballot_matrix[is_ranked]).ravel(),
+        weights=resampled_weights[:, ranked_ballots].ravel(),
+        minlength=num_resamples * num_candidates,
+    ).astype(np.int64)
+    num_rankings = num_rankings.reshape(num_resamples, num_candidates)
+
+    d = num_rankings[:, :, np.newaxis] - ranked_above.swapaxes(-1, -2)
+
+    diagonal = np.arange(num_candidates)
+    d[:, diagonal, diagonal] = 0
+
+    return d
+
+
+def compute_rank_positions(p: np.ndarray) -> np.ndarray:
+    # Position of each candidate in the Schulze ranking, where tied candidates share the best position (1, 2, 2, 4...).
+
+    num_wins = (p > p.swapaxes(-1, -2)).sum(axis=-1)
+
+    return 1 + (num_wins[..., np.newaxis, :] > num_wins[..., :, np.newaxis]).sum(
+        axis=-1,
+    )
+
+
+def compute_bootstrap_rank_positions(
+    ballot_matrix: np.ndarray,
+    ballot_probabilities: np.ndarray,
+    num_voters: int,
+    num_candidates: int,
+    num_resamples: int,
+    seed_sequence: np.random.SeedSequence,
+) -> np.ndarray:
+    # Resampling voters with replacement amounts to drawing the number of copies of each distinct ballot from a
+    # multinomial distribution. The resamples of a batch are then solved at once, as a 3-D pairwise tensor.
+
+    rng = np.random.default_rng(seed_sequence)
+    resampled_weights = rng.multinomial(
+        num_voters,
+        ballot_probabilities,
+        size=num_resamples,
+    )
+
+    d = compute_pairwise_preferences_for_resamples(
+        ballot_matrix,
+        resampled_weights,
+        num_candidates,
+    )
+
+    return compute_rank_positions(compute_strongest_paths(d)).astype(np.int32)
+
+
+def initialize_bootstrap_worker(
+    ballot_matrix: np.ndarray,
+    ballot_probabilities: np.ndarray,
+    num_voters: int,
+    num_candidates: int,
+) -> None:
+    # The distinct ballots are sent once per worker, instead of once per batch.
+
+    BOOTSTRAP_WORKER_STATE["ballot_matrix"] = ballot_matrix
+    BOOTSTRAP_WORKER_STATE["ballot_probabilities"] = ballot_probabilities
+    BOOTSTRAP_WORKER_STATE["num_voters"] = num_voters
+    BOOTSTRAP_WORKER_STATE["num_candidates"] = num_candidates
+
+
+def compute_bootstrap_rank_positions_in_worker(
+    num_resamples: int,
+    seed_sequence: np.random.SeedSequence,
+) -> np.ndarray:
+    return compute_bootstrap_rank_positions(
+        BOOTSTRAP_WORKER_STATE["ballot_matrix"],
+        BOOTSTRAP_WORKER_STATE["ballot_probabilities"],
+        BOOTSTRAP_WORKER_STATE["num_voters"],
+        BOOTSTRAP_WORKER_STATE["num_candidates"],
+        num_resamples,
+        seed_sequence,
+    )
+
+
+def run_bootstrap(
+    standardized_ballots: Ballots,
+    num_resamples: int = 10_000,
+    *,
+    candidate_registry: CandidateRegistry | None = None,
+    num_resamples_per_batch: int | None = None,
+    max_workers: int | None = None,
+    seed: int = 0,
+) -> tuple[list[str], np.ndarray]:
+    # Output: the appIDs of the candidates, and their rank positions for each resample, with shape (N, C).
+    #
+    # By default, the number of resamples per batch is derived from the memory budget, cf. get_bootstrap_batch_size().
+    #
+    # NB: a candidate which does not receive any vote in a resample is ranked after every other candidate.
+
+    if candidate_registry is None:
+        candidate_registry = build_candidate_registry(standardized_ballots)
+
+    _, ballot_matrix = encode_standardized_ballots(
+        standardized_ballots,
+        candidate_registry,
+    )
+    num_voters = ballot_matrix.shape[0]
+
+    unique_ballot_matrix, weights = collapse_identical_ballots(ballot_matrix)
+    candidate_indices, local_ballot_matrix = relabel_ranked_candidates(
+        unique_ballot_matrix,
+    )
+
+    app_ids = get_app_ids_from_registry(candidate_registry)
+    candidate_names = [app_ids[i] for i in candidate_indices]
+
+    if num_voters == 0 or len(candidate_names) == 0:
+        return candidate_names, np.zeros((0, len(candidate_names)), dtype=np.int32)
+
+    num_candidates = len(candidate_names)
+    ballot_probabilities = weights / num_voters
+
+    if num_resamples_per_batch is None:
+        num_resamples_per_batch = get_bootstrap_batch_size(num_candidates)
+
+    # The batches get their own random streams, so that the output does not depend on the number of workers.
+    batch_sizes = [
+        min(num_resamples_per_batch, num_resamples - start)
+        for start in range(0, num_resamples, num_resamples_per_batch)
+    ]
+    seed_sequences = np.random.SeedSequence(seed).spawn(len(batch_sizes))
+
+    if max_workers == 1:
+        batches = [
+            compute_bootstrap_rank_positions(
+                local_ballot_matrix,
+                ballot_probabilities,
+                num_voters,
+                num_candidates,
+                batch_size,
+                seed_sequence,
+            )
+            for batch_size, seed_sequence in zip(
+                batch_sizes,
+                seed_sequences,
+                strict=True,
+            )
+        ]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=initialize_bootstrap_worker,
+            initargs=(
+                local_ballot_matrix,
+                ballot_probabilities,
+                num_voters,
+                num_candidates,
+            ),
+        ) as executor:
+            batches = list(
+                executor.map(
+                    compute_bootstrap_rank_positions_in_worker,
+                    batch_sizes,
+                    seed_sequences,
+                ),
+            )
+
+    return candidate_names, np.concatenate(batches)
+
+
+def summarize_bootstrap_rank_positions(
+    app_ids: list[str],
+    bootstrap_rank_positions: np.ndarray,
+    confidence_level: float = 0.95,
+) -> dict[str, dict]:
+    # Per-game rank distribution, median rank, and percentile confidence interval.
+
+    alpha = (1 - confidence_level) / 2
+
+    lower_ranks, median_ranks, upper_ranks = np.percentile(
+        bootstrap_rank_positions,
+        [100 * alpha, 50, 100 * (1 - alpha)],
+        axis=0,
+        method="inverted_cdf",
+    ).astype(int)
+
+    num_resamples = bootstrap_rank_positions.shape[0]
+
+    bootstrap_summary = {}
+    for i, app_id in enumerate(app_ids):
+        rank_counts = Counter(bootstrap_rank_positions[:, i].tolist())
+
+        bootstrap_summary[app_id] = {
+            "median_rank": int(median_ranks[i]),
+            "confidence_interval": (int(lower_ranks[i]), int(upper_ranks[i])),
+            "rank_distribution": {
+                rank: count / num_resamples
+                for rank, count in sorted(rank_counts.items())
+            },
+        }
+
+    return bootstrap_summary
+
+
+def print_bootstrap_stability(
+    schulze_ranking: Ranking,
+    bootstrap_summary: dict[str, dict],
+    num_app_id_groups_to_display: int = 7,
+    confidence_level: float = 0.95,
+) -> None:
+    print(
+        f"\nBootstrap stability of the top {num_app_id_groups_to_display} groups ({confidence_level:.0%} intervals)",
+    )
+
+    for app_id_group in schulze_ranking[0:num_app_id_groups_to_display]:
+        for app_id in app_id_group:
+            summary = bootstrap_summary[app_id]
+            lower_rank, upper_rank = summary["confidence_interval"]
+            # Only the ranks inside the confidence interval are displayed, to keep the output short.
+            rank_distribution = {
+                rank: round(frequency, 3)
+                for rank, frequency in summary["rank_distribution"].items()
+                if lower_rank <= rank <= upper_rank
+            }
+
+            print(
+                f"\nappID:{app_id}\tmedian rank: {summary['median_rank']}\tinterval: [{lower_rank}, {upper_rank}]",
+            )
+            print(f"rank distribution:\t{rank_distribution}")
@@ -0,0 +1,207 @@
+import numpy as np
+
+from candidate_registry import collapse_identical_ballots, relabel_ranked_candidates
+from my_types import Ranking
+
+
+def build_rank_matrix(
+    candidate_names: list[str],
+    weighted_ranks: list[tuple[Ranking, int]],
+) -> tuple[np.ndarray, np.ndarray]:
+    # Each row is a ballot, each column is a candidate, and each value is the rank level of the candidate.
+    # Candidates which are absent from a ballot get the level -1, so that they are not compared on this ballot.
+
+    candidate_indices = {candidate: i for i, candidate in enumerate(candidate_names)}
+
+    rank_matrix = np.full(
+        (len(weighted_ranks), len(candidate_names)),
+        -1,
+        dtype=np.int32,
+    )
+    weights = np.zeros(len(weighted_ranks), dtype=np.int64)
+
+    for ballot_no, (ranks, weight) in enumerate(weighted_ranks):
+        for level, tied_candidates in enumerate(ranks):
+            for candidate in tied_candidates:
+                rank_matrix[ballot_no, candidate_indices[candidate]] = level
+        weights[ballot_no] = weight
+
+    return rank_matrix, weights
+
+
+def compute_pairwise_preferences(
+    rank_matrix: np.ndarray,
+    weights: np.ndarray,
+) -> np.ndarray:
+    # d[V,W] is the number of voters who prefer candidate V over W.
+    #
+    # For every rank level, the candidates at this level are preferred to the candidates at a strictly lower level
+    # (i.e. a higher value in the rank matrix), which turns the pairwise count into a sum of matrix products.
+
+    num_candidates = rank_matrix.shape[1]
+    d = np.zeros((num_candidates, num_candidates), dtype=np.int64)
+
+    max_level = int(rank_matrix.max(initial=-1))
+
+    for level in range(max_level):
+        is_at_level = (rank_matrix == level).astype(np.int64)
+        is_below_level = (rank_matrix > level).astype(np.int64)
+        d += (is_at_level * weights[:, np.newaxis]).T @ is_below_level
+
+    return d
+
+
+def count_rankings(
+    ballot_matrix: np.ndarray,
+    weights: np.ndarray,
+    num_candidates: int,
+) -> np.ndarray:
+    # Number of voters who rank each candidate, with interned ballots as input.
+
+    is_ranked = ballot_matrix >= 0
+
+    return np.bincount(
+        ballot_matrix[is_ranked],
+        weights=np.broadcast_to(weights[:, np.newaxis], ballot_matrix.shape)[is_ranked],
+        minlength=num_candidates,
+    ).astype(np.int64)
+
+
+def compute_pairwise_preferences_from_ballot_matrix(
+    ballot_matrix: np.ndarray,
+    weights: np.ndarray,
+    num_candidates: int,
+) -> np.ndarray:
+    # Same as compute_pairwise_preferences(), with compacted interned ballots as input, cf. compact_ballot_matrix().
+    #
+    # On each ballot, the candidates which are not ranked implicitly tie last, so that they never have to be listed:
+    #   d[V,W] = (number of voters who rank V) - (number of voters who rank W above V)
+    # The first term is a row sum, and the second term only involves the pairs of ranked candidates, so that the work
+    # is linear in the number of ranked entries instead of the number of voters times the number of candidates.
+
+    num_positions = ballot_matrix.shape[1]
+
+    above_positions, below_positions = np.triu_indices(num_positions, k=1)
+    candidates_above = ballot_matrix[:, above_positions]
+    candidates_below = ballot_matrix[:, below_positions]
+
+    is_pair = (candidates_above >= 0) & (candidates_below >= 0)
+
+    ranked_above = np.bincount(
+        candidates_above[is_pair] * num_candidates + candidates_below[is_pair],
+        weights=np.broadcast_to(weights[:, np.newaxis], is_pair.shape)[is_pair],
+        minlength=num_candidates * num_candidates,
+    ).astype(np.int64)
+    ranked_above = ranked_above.reshape(num_candidates, num_candidates)
+
+    num_rankings = count_rankings(ballot_matrix, weights, num_candidates)
+
+    d = num_rankings[:, np.newaxis] - ranked_above.T
+    np.fill_diagonal(d, 0)
+
+    return d
+
+
+def compute_strongest_paths(d: np.ndarray) -> np.ndarray:
+    # p[V,W] is the strength of the strongest path from candidate V to W.
+    #
+    # Reference: https://en.wikipedia.org/wiki/Schulze_method#Computation (Floyd-Warshall, widest path variant)
+    #
+    # NB: d can also be a stack of pairwise matrices, with shape (..., C, C), in which case every election is solved
+    # at once.
+
+    d_transpose = d.swapaxes(-1, -2)
+    p = np.where(d > d_transpose, d, 0)
+
+    num_candidates = p.shape[-1]
+
+    for k in range(num_candidates):
+        np.maximum(
+            p,
+            np.minimum(p[..., :, k, np.newaxis], p[..., np.newaxis, k, :]),
+            out=p,
+        )
+
+    diagonal = np.arange(num_candidates)
+    p[..., diagonal, diagonal] = 0
+
+    return p
+
+
+def check_top_k(top_k: int | None) -> None:
+    # top_k is either None, for the whole ranking, or a positive number of groups of tied candidates.
+
+    if top_k is not None and (
+        isinstance(top_k, bool) or not isinstance(top_k, int) or top_k <= 0
+    ):
+        msg = f"top_k must be a positive integer or None, not {top_k!r}."
+        raise ValueError(msg)
+
+
+def rank_candidates(
+    candidate_names: list[str],
+    p: np.ndarray,
+    top_k: int | None = None,
+) -> Ranking:
+    # Candidates are ranked by their number of wins, and candidates with the same number of wins are tied.
+    # If top_k is provided, candidates are visited by decreasing number of wins, and the visit stops once the first k
+    # groups of tied candidates are complete.
+
+    check_top_k(top_k)
+
+    num_wins = (p > p.T).sum(axis=1)
+
+    # NB: the sort is stable, so that tied candidates are listed in the same order as candidate_names.
+    ranking = []
+    previous_num_wins = None
+
+    for i in np.argsort(-num_wins, kind="stable").tolist():
+        if num_wins[i] != previous_num_wins:
+            if len(ranking) == top_k:
+                break
+            ranking.append([])
+            previous_num_wins = num_wins[i]
+
+        ranking[-1].append(candidate_names[i])
+
+    return ranking
+
+
+def compute_ranks(
+    candidate_names: list[str],
+    weighted_ranks: list[tuple[Ranking, int]],
+) -> Ranking:
+    # Drop-in replacement for schulze.compute_ranks(), with the same input and output formats.
+
+    rank_matrix, weights = build_rank_matrix(candidate_names, weighted_ranks)
+
+    d = compute_pairwise_preferences(rank_matrix, weights)
+    p = compute_strongest_paths(d)
+
+    return rank_candidates(candidate_names, p)
+
+
+def compute_ranks_from_ballot_matrix(
+    ballot_matrix: np.ndarray,
+    app_ids: list[str],
+    top_k: int | None = None,
+) -> Ranking:
+    # Same as compute_ranks(), with interned ballots as input. NB: app_ids maps candidate indices to appIDs.
+
+    unique_ballot_matrix, weights = collapse_identical_ballots(ballot_matrix)
+
+    # Only candidates which appear on at least one ballot are ranked.
+    candidate_indices, local_ballot_matrix = relabel_ranked_candidates(
+        unique_ballot_matrix,
+    )
+
+    d = compute_pairwise_preferences_from_ballot_matrix(
+        local_ballot_matrix,
+        weights,
+        num_candidates=len(candidate_indices),
+    )
+    p = compute_strongest_paths(d)
+
+    candidate_names = [app_ids[i] for i in candidate_indices]
+
+    return rank_candidates(candidate_names, p, top_k=top_k)
@@ -1,13 +1,34 @@
 from collections import Counter
+from collections.abc import Callable
 
+import numpy as np
 import steampi.calendar
 
+from ballot_filters import (
+    Decision,
+    apply_keep_decisions,
+    build_filter_from_decisions,
+    compute_decisions,
+    filter_ballots,
+    get_distinct_app_ids,
+    print_notable_decisions,
+)
+from candidate_registry import (
+    build_candidate_registry,
+    build_membership_mask,
+    encode_standardized_ballots,
+    get_app_ids_from_registry,
+    get_candidate_indices,
+)
+from condorcet_methods import (
+    compute_rankings_with_all_methods,
+    print_ranking_comparison,
+)
 from constants import BALLOT_YEAR
-from disqualify_vote import filter_out_votes_for_hard_coded_reasons
+from disqualify_vote import build_hard_coded_filter
 from extend_igdb import extend_both_igdb_databases
 from extend_steamspy import (
     get_app_name_for_problematic_app_id,
-    get_release_year_for_problematic_app_id,
     load_extended_steamspy_database,
 )
 from igdb_credentials import download_latest_credentials
@@ -18,20 +39,45 @@ from igdb_match_names import (
 )
 from load_ballots import load_ballots, print_reviews
 from match_names import standardize_ballots
-from my_types import Ballots, HardCodedIDs, Ranking
-from steam_store_utils import get_early_access_status, get_link_to_store
+from my_types import BallotFilter, Ballots, CandidateRegistry, HardCodedIDs, Ranking
+from pairwise_preferences import PairwisePreferences
+from pipeline_context import PipelineContext
+from release_year_index import (
+    build_release_year_index,
+    get_release_year,
+    load_release_year_index,
+)
+from schulze_bootstrap import (
+    print_bootstrap_stability,
+    run_bootstrap,
+    summarize_bootstrap_rank_positions,
+)
+from schulze_engine import check_top_k, compute_ranks_from_ballot_matrix
+from schulze_tie_break import break_ties_in_schulze_ranking
+from steam_app_details import (
+    collect_matched_app_ids,
+    get_release_date_as_str_from_app_details,
+    prefetch_app_details,
+)
+from steam_store_utils import (
+    get_default_early_access_max_age_in_days,
+    get_link_to_store,
+    prefetch_early_access_statuses,
+)
 from whitelist_vote import load_whitelisted_ids
 
 
-def filter_out_votes_for_early_access_titles(
-    standardized_ballots: Ballots,
+def build_early_access_filter(
+    early_access_statuses: dict[str, bool],
     whitelisted_ids: HardCodedIDs | None = None,
-) -> Ballots:
+) -> BallotFilter:
     # Objective: remove appID which gathered votes but are tagged as 'Early Access' titles
+    #
+    # NB: the statuses are prefetched with prefetch_early_access_statuses(), so that the filter only performs lookups.
 
     if whitelisted_ids is None:
         # Caveat: Early Access status is only retrieved when using SteamSpy, hence why 'release_year' and 'use_igdb'
-        # are not function parameters of filter_out_votes_for_early_access_titles()
+        # are not function parameters of build_early_access_filter()
         release_year = None
         use_igdb = False
 
@@ -40,40 +86,49 @@ def filter_out_votes_for_early_access_titles(
             use_igdb=use_igdb,
         )
 
-    for voter in standardized_ballots:
-        current_ballots = standardized_ballots[voter]["ballots"]
+    def is_kept(app_id: str) -> bool:
+        is_early_access = early_access_statuses[app_id]
 
-        current_ballots_list = []
-        for position in sorted(current_ballots.keys()):
-            app_id = current_ballots[position]
-            if app_id is not None:
-                is_early_access = get_early_access_status(app_id)
-
-                if not is_early_access:
-                    current_ballots_list.append(app_id)
-                elif app_id in whitelisted_ids:
-                    print(
-                        "AppID "
-                        + app_id
-                        + " whitelisted because "
-                        + whitelisted_ids[app_id]["reason"],
-                    )
-                    current_ballots_list.append(app_id)
-                else:
-                    print(
-                        "AppID "
-                        + app_id
-                        + " removed because it is tagged as an Early Access title",
-                    )
+        if not is_early_access:
+            return True
 
-        for i, current_ballot in enumerate(current_ballots_list):
-            position = i + 1
-            standardized_ballots[voter]["ballots"][position] = current_ballot
-        for i in range(len(current_ballots_list), len(current_ballots.keys())):
-            position = i + 1
-            standardized_ballots[voter]["ballots"][position] = None
+        if app_id in whitelisted_ids:
+            print(
+                "AppID "
+                + app_id
+                + " whitelisted because "
+                + whitelisted_ids[app_id]["reason"],
+            )
+            return True
 
-    return standardized_ballots
+        print(
+            "AppID "
+            + app_id
+            + " removed because it is tagged as an Early Access title",
+        )
+        return False
+
+    return is_kept
+
+
+def filter_out_votes_for_early_access_titles(
+    standardized_ballots: Ballots,
+    whitelisted_ids: HardCodedIDs | None = None,
+) -> Ballots:
+    early_access_statuses = prefetch_early_access_statuses(
+        get_distinct_app_ids(standardized_ballots),
+        max_age_in_days=get_default_early_access_max_age_in_days(),
+    )
+
+    return filter_ballots(
+        standardized_ballots,
+        [
+            build_early_access_filter(
+                early_access_statuses,
+                whitelisted_ids=whitelisted_ids,
+            ),
+        ],
+    )
 
 
 def get_local_database(
@@ -94,119 +149,215 @@ def get_local_database(
     return local_database
 
 
-def filter_out_votes_for_wrong_release_years(
-    standardized_ballots: Ballots,
+def build_release_year_decider(
     target_release_year: str,
     *,
     use_igdb: bool = False,
     year_constraint: str = "equality",
     whitelisted_ids: HardCodedIDs | None = None,
     is_steamspy_api_paginated: bool = True,
-) -> Ballots:
+    steam_app_details: dict[str, dict] | None = None,
+    release_year_index: dict[str, int] | None = None,
+    context: PipelineContext | None = None,
+) -> Callable[[str], Decision]:
     # Objective: remove appID which gathered votes but were not released during the target release year
+    #
+    # NB: steam_app_details is the warm map returned by prefetch_app_details(), if any.
+    # Likewise, release_year_index is the index returned by build_release_year_index(), if any.
+    # If provided, the context supplies the local database and the whitelisted IDs, which are then not loaded again.
+
+    if steam_app_details is None:
+        steam_app_details = {}
+
+    if release_year_index is None and not use_igdb:
+        release_year_index = load_release_year_index()
 
     if whitelisted_ids is None:
-        whitelisted_ids = load_whitelisted_ids(
-            release_year=target_release_year,
+        if context is not None:
+            whitelisted_ids = context.whitelisted_ids
+        else:
+            whitelisted_ids = load_whitelisted_ids(
+                release_year=target_release_year,
+                use_igdb=use_igdb,
+            )
+
+    if context is not None:
+        local_database = context.local_database
+    else:
+        local_database = get_local_database(
+            target_release_year=target_release_year,
             use_igdb=use_igdb,
         )
 
-    local_database = get_local_database(
-        target_release_year=target_release_year,
-        use_igdb=use_igdb,
+    def decide(app_id: str) -> Decision:
+        app_id_as_str = str(app_id)
+
+        # Due to the pagination recently adopted by SteamSpy API, local_database can miss many entries nowadays.
+        if (
+            not use_igdb
+            and is_steamspy_api_paginated
+            and app_id_as_str not in local_database
+        ):
+            local_database[app_id_as_str] = {}
+            local_database[app_id_as_str]["name"] = get_app_name_for_problematic_app_id(
+                app_id_as_str,
+            )
+
+        app_data = local_database[app_id_as_str]
+        app_name = app_data["name"]
+
+        if use_igdb:
+            (
+                _possible_release_years,
+                release_year,
+            ) = get_igdb_release_years(
+                app_data,
+                target_release_year=target_release_year,
+            )
+        else:
+            release_year = get_release_year(
+                app_id,
+                release_year_index,
+                app_details=steam_app_details.get(app_id),
+            )
+
+        if release_year == int(target_release_year):
+            # Always keep the game, whichever the value of 'year_constraint' ('equality', 'minimum', 'maximum').
+            return Decision(
+                keep=True,
+                reason=f"AppID {app_id} ({app_name}) released in {release_year}",
+            )
+
+        if release_year == -1:
+            return Decision(
+                keep=True,
+                reason=f"AppID {app_id} ({app_name}) not found on Steam (either a console game, or from another PC store)",
+                is_notable=True,
+            )
+
+        if (
+            year_constraint == "minimum" and release_year >= int(target_release_year)
+        ) or (
+            year_constraint == "maximum" and release_year <= int(target_release_year)
+        ):
+            return Decision(
+                keep=True,
+                reason=f"AppID {app_id} ({app_name}) released in {release_year}, which satisfies the {year_constraint} year",
+            )
+
+        if app_id in whitelisted_ids:
+            return Decision(
+                keep=True,
+                reason="AppID "
+                + app_id
+                + " whitelisted because "
+                + whitelisted_ids[app_id]["reason"],
+                is_notable=True,
+            )
+
+        return Decision(
+            keep=False,
+            reason=f"AppID {app_id} ({app_name}) removed because it was released in {release_year}",
+            is_notable=True,
+        )
+
+    return decide
+
+
+def build_release_year_filter(
+    target_release_year: str,
+    *,
+    use_igdb: bool = False,
+    year_constraint: str = "equality",
+    whitelisted_ids: HardCodedIDs | None = None,
+    is_steamspy_api_paginated: bool = True,
+    verbose: bool = True,
+    steam_app_details: dict[str, dict] | None = None,
+    release_year_index: dict[str, int] | None = None,
+    context: PipelineContext | None = None,
+) -> BallotFilter:
+    # If provided, the context receives the decision table, cf. PipelineContext.release_year_decisions.
+
+    return build_filter_from_decisions(
+        build_release_year_decider(
+            target_release_year,
+            use_igdb=use_igdb,
+            year_constraint=year_constraint,
+            whitelisted_ids=whitelisted_ids,
+            is_steamspy_api_paginated=is_steamspy_api_paginated,
+            steam_app_details=steam_app_details,
+            release_year_index=release_year_index,
+            context=context,
+        ),
+        context.release_year_decisions if context is not None else None,
+        verbose=verbose,
     )
 
-    print()
 
-    release_years = {}
-    removed_app_ids = []
+def compute_release_year_decisions(
+    standardized_ballots: Ballots,
+    target_release_year: str,
+    *,
+    use_igdb: bool = False,
+    year_constraint: str = "equality",
+    whitelisted_ids: HardCodedIDs | None = None,
+    is_steamspy_api_paginated: bool = True,
+    context: PipelineContext | None = None,
+) -> dict[str, Decision]:
+    # Decision table over the distinct appIDs: appID ---> Decision(keep, reason)
 
-    for voter in standardized_ballots:
-        current_ballots = standardized_ballots[voter]["ballots"]
+    app_ids = get_distinct_app_ids(standardized_ballots)
 
-        current_ballots_list = []
-        for position in sorted(current_ballots.keys()):
-            app_id = current_ballots[position]
-            if app_id is not None:
-                app_id_as_str = str(app_id)
-
-                # Due to the pagination recently adopted by SteamSpy API, local_database can miss many entries nowadays.
-                if (
-                    not use_igdb
-                    and is_steamspy_api_paginated
-                    and app_id_as_str not in local_database
-                ):
-                    local_database[app_id_as_str] = {}
-                    local_database[app_id_as_str]["name"] = (
-                        get_app_name_for_problematic_app_id(app_id_as_str)
-                    )
+    release_year_index = None if use_igdb else build_release_year_index(app_ids)
 
-                app_data = local_database[app_id_as_str]
-                app_name = app_data["name"]
-
-                if app_id not in release_years:
-                    if use_igdb:
-                        (
-                            _possible_release_years,
-                            year_to_remember,
-                        ) = get_igdb_release_years(
-                            app_data,
-                            target_release_year=target_release_year,
-                        )
-                        release_years[app_id] = year_to_remember
-                    else:
-                        try:
-                            release_years[app_id] = steampi.calendar.get_release_year(
-                                app_id,
-                            )
-                        except ValueError:
-                            release_years[app_id] = (
-                                get_release_year_for_problematic_app_id(app_id=app_id)
-                            )
-                if release_years[app_id] == int(target_release_year):
-                    # Always keep the game, whichever the value of 'year_constraint' ('equality', 'minimum', 'maximum').
-                    current_ballots_list.append(app_id)
-                elif release_years[app_id] == -1:
-                    print(
-                        f"AppID {app_id} ({app_name}) not found on Steam (either a console game, or from another PC store)",
-                    )
-                    current_ballots_list.append(app_id)
-                elif (
-                    year_constraint == "minimum"
-                    and release_years[app_id]
-                    >= int(
-                        target_release_year,
-                    )
-                ) or (
-                    year_constraint == "maximum"
-                    and release_years[app_id]
-                    <= int(
-                        target_release_year,
-                    )
-                ):
-                    current_ballots_list.append(app_id)
-                elif app_id in whitelisted_ids:
-                    print(
-                        "AppID "
-                        + app_id
-                        + " whitelisted because "
-                        + whitelisted_ids[app_id]["reason"],
-                    )
-                    current_ballots_list.append(app_id)
-                elif app_id not in removed_app_ids:
-                    print(
-                        f"AppID {app_id} ({app_name}) removed because it was released in {release_years[app_id]}",
-                    )
-                    removed_app_ids.append(app_id)
+    return compute_decisions(
+        app_ids,
+        build_release_year_decider(
+            target_release_year,
+            use_igdb=use_igdb,
+            year_constraint=year_constraint,
+            whitelisted_ids=whitelisted_ids,
+            is_steamspy_api_paginated=is_steamspy_api_paginated,
+            release_year_index=release_year_index,
+            context=context,
+        ),
+    )
 
-        for i, current_ballot in enumerate(current_ballots_list):
-            position = i + 1
-            standardized_ballots[voter]["ballots"][position] = current_ballot
-        for i in range(len(current_ballots_list), len(current_ballots.keys())):
-            position = i + 1
-            standardized_ballots[voter]["ballots"][position] = None
 
-    return standardized_ballots
+def filter_out_votes_for_wrong_release_years(
+    standardized_ballots: Ballots,
+    target_release_year: str,
+    *,
+    use_igdb: bool = False,
+    year_constraint: str = "equality",
+    whitelisted_ids: HardCodedIDs | None = None,
+    is_steamspy_api_paginated: bool = True,
+    verbose: bool = True,
+    context: PipelineContext | None = None,
+) -> Ballots:
+    # If provided, the context receives the decision table, cf. PipelineContext.release_year_decisions.
+
+    release_year_decisions = compute_release_year_decisions(
+        standardized_ballots,
+        target_release_year,
+        use_igdb=use_igdb,
+        year_constraint=year_constraint,
+        whitelisted_ids=whitelisted_ids,
+        is_steamspy_api_paginated=is_steamspy_api_paginated,
+        context=context,
+    )
+
+    if context is not None:
+        context.release_year_decisions.update(release_year_decisions)
+
+    if verbose:
+        print()
+        print_notable_decisions(release_year_decisions)
+
+    return apply_keep_decisions(
+        standardized_ballots,
+        {app_id: decision.keep for app_id, decision in release_year_decisions.items()},
+    )
 
 
 def adapt_votes_format_for_schulze_computations(
@@ -221,7 +372,8 @@ def adapt_votes_format_for_schulze_computations(
             if app_id is not None:
                 candidate_names.add(app_id)
 
-    weighted_ranks = []
+    # Identical rankings are collapsed into a single weighted ranking, so that the pairwise counts are computed once.
+    ranking_counts: Counter[tuple[str, ...]] = Counter()
 
     for voter in standardized_ballots:
         current_ballots = standardized_ballots[voter]["ballots"]
@@ -230,29 +382,66 @@ def adapt_votes_format_for_schulze_computations(
         for position in sorted(current_ballots.keys()):
             app_id = current_ballots[position]
             if app_id is not None and app_id not in currently_seen_candidates:
-                current_ranking.append([app_id])
+                current_ranking.append(app_id)
                 currently_seen_candidates.add(app_id)
 
-        remaining_app_ids = list(candidate_names.difference(currently_seen_candidates))
+        ranking_counts[tuple(current_ranking)] += 1
+
+    weighted_ranks = []
+
+    for ranked_app_ids, current_weight in ranking_counts.items():
+        current_ranking = [[app_id] for app_id in ranked_app_ids]
+
+        # The schulze package requires the unranked candidates to be explicitly listed, as a last tied group.
+        # NB: the NumPy engine does not need this, cf. compute_pairwise_preferences_from_ballot_matrix().
+        remaining_app_ids = list(candidate_names.difference(ranked_app_ids))
         if remaining_app_ids:
             current_ranking.append(remaining_app_ids)
 
-        current_weight = 1
         weighted_ranks.append((current_ranking, current_weight))
 
     return list(candidate_names), weighted_ranks
 
 
-def compute_schulze_ranking(standardized_ballots: Ballots) -> Ranking:
+def compute_schulze_ranking(
+    standardized_ballots: Ballots,
+    *,
+    use_numpy_engine: bool = False,
+    candidate_registry: CandidateRegistry | None = None,
+    top_k: int | None = None,
+) -> Ranking:
     # Reference: https://github.com/mgp/schulze-method
+    #
+    # If top_k is provided, only the first k groups of tied appIDs are returned, so that the tie-breaking step can skip
+    # the groups below the cutoff. With the numpy engine, the ranking stops once these groups are complete, cf.
+    # rank_candidates(). NB: the strongest paths between every pair of candidates are still required, because the rank
+    # of a candidate depends on its comparison with every other candidate. Without the numpy engine, the whole ranking
+    # is computed, then truncated.
 
-    import schulze
+    check_top_k(top_k)
+
+    if use_numpy_engine:
+        if candidate_registry is None:
+            candidate_registry = build_candidate_registry(standardized_ballots)
+
+        _, ballot_matrix = encode_standardized_ballots(
+            standardized_ballots,
+            candidate_registry,
+        )
+
+        return compute_ranks_from_ballot_matrix(
+            ballot_matrix,
+            get_app_ids_from_registry(candidate_registry),
+            top_k=top_k,
+        )
 
     (candidate_names, weighted_ranks) = adapt_votes_format_for_schulze_computations(
         standardized_ballots,
     )
 
-    return schulze.compute_ranks(candidate_names, weighted_ranks)
+    import schulze
+
+    return schulze.compute_ranks(candidate_names, weighted_ranks)[:top_k]
 
 
 def print_schulze_ranking(
@@ -260,11 +449,19 @@ def print_schulze_ranking(
     target_release_year: str | None = None,
     *,
     use_igdb: bool = False,
+    steam_app_details: dict[str, dict] | None = None,
+    context: PipelineContext | None = None,
 ) -> None:
-    local_database = get_local_database(
-        target_release_year=target_release_year,
-        use_igdb=use_igdb,
-    )
+    if steam_app_details is None:
+        steam_app_details = {}
+
+    if context is not None:
+        local_database = context.local_database
+    else:
+        local_database = get_local_database(
+            target_release_year=target_release_year,
+            use_igdb=use_igdb,
+        )
 
     print()
 
@@ -288,7 +485,15 @@ def print_schulze_ranking(
                 )
                 app_url = get_link_to_igdb_website(app_id, local_database)
             else:
-                app_id_release_date = steampi.calendar.get_release_date_as_str(app_id)
+                if app_id in steam_app_details:
+                    app_id_release_date = get_release_date_as_str_from_app_details(
+                        app_id,
+                        steam_app_details[app_id],
+                    )
+                else:
+                    app_id_release_date = steampi.calendar.get_release_date_as_str(
+                        app_id,
+                    )
                 app_url = get_link_to_store(app_id)
 
             if app_id_release_date is None:
@@ -375,6 +580,8 @@ def try_to_break_ties_in_app_id_group(
     app_id_group: list[str],
     standardized_ballots: Ballots,
     threshold_n: int | None = None,
+    *,
+    use_numpy_engine: bool = False,
 ) -> Ranking:
     len(app_id_group)
 
@@ -398,12 +605,14 @@ def try_to_break_ties_in_app_id_group(
         )
         schulze_ranking_for_tied_app_id_group = compute_schulze_ranking(
             standardized_ballots_for_tied_app_id_group,
+            use_numpy_engine=use_numpy_engine,
         )
         schulze_ranking_for_tied_app_id_group = unwind_ranking(
             input_ranking=schulze_ranking_for_tied_app_id_group,
             app_id_group=app_id_group,
             standardized_ballots=standardized_ballots,
             threshold_n=threshold_n,
+            use_numpy_engine=use_numpy_engine,
         )
 
     return schulze_ranking_for_tied_app_id_group
@@ -414,6 +623,8 @@ def unwind_ranking(
     app_id_group: list[str],
     standardized_ballots: Ballots,
     threshold_n: int,
+    *,
+    use_numpy_engine: bool = False,
 ) -> Ranking:
     if len(input_ranking) == 1:
         print("Tie still there. Trying again with a higher threshold.")
@@ -421,12 +632,14 @@ def unwind_ranking(
             app_id_group,
             standardized_ballots,
             threshold_n=threshold_n + 1,
+            use_numpy_engine=use_numpy_engine,
         )
     else:
         print(f"Tie has been partially broken: {input_ranking}")
         output_ranking = dissect_ranking(
             input_ranking=input_ranking,
             standardized_ballots=standardized_ballots,
+            use_numpy_engine=use_numpy_engine,
         )
 
     return output_ranking
@@ -435,6 +648,8 @@ def unwind_ranking(
 def dissect_ranking(
     input_ranking: Ranking,
     standardized_ballots: Ballots,
+    *,
+    use_numpy_engine: bool = False,
 ) -> Ranking:
     output_ranking = []
 
@@ -449,6 +664,7 @@ def dissect_ranking(
                 small_app_id_group,
                 standardized_ballots,
                 threshold_n=None,
+                use_numpy_engine=use_numpy_engine,
             )
             output_ranking += untied_ranking
 
@@ -481,7 +697,18 @@ def display_info_about_tie(
 def try_to_break_ties_in_schulze_ranking(
     schulze_ranking: Ranking,
     standardized_ballots: Ballots,
+    *,
+    use_numpy_engine: bool = False,
+    candidate_registry: CandidateRegistry | None = None,
 ) -> Ranking:
+    if use_numpy_engine:
+        # The ballots are interned once, and each sub-election is solved at most once.
+        return break_ties_in_schulze_ranking(
+            schulze_ranking,
+            standardized_ballots,
+            candidate_registry,
+        )
+
     untied_schulze_ranking = []
 
     for group_no, app_id_group in enumerate(schulze_ranking):
@@ -490,6 +717,7 @@ def try_to_break_ties_in_schulze_ranking(
                 app_id_group,
                 standardized_ballots,
                 threshold_n=None,
+                use_numpy_engine=use_numpy_engine,
             )
 
             if len(schulze_ranking_for_tied_app_id_group) > 1:
@@ -507,21 +735,20 @@ def try_to_break_ties_in_schulze_ranking(
 def print_ballot_distribution_for_given_appid(
     app_id_group: list[str],
     standardized_ballots: Ballots,
+    candidate_registry: CandidateRegistry | None = None,
 ) -> None:
-    for app_id in app_id_group:
-        ballot_distribution = None
-
-        for voter_name in standardized_ballots:
-            current_ballots = standardized_ballots[voter_name]["ballots"]
-
-            if ballot_distribution is None:
-                ballot_distribution = [0 for _ in range(len(current_ballots))]
+    if candidate_registry is None:
+        candidate_registry = build_candidate_registry(standardized_ballots)
 
-            positions = sorted(current_ballots.keys())
+    _, ballot_matrix = encode_standardized_ballots(
+        standardized_ballots,
+        candidate_registry,
+    )
 
-            for index, position in enumerate(positions):
-                if current_ballots[position] == app_id:
-                    ballot_distribution[index] += 1
+    for app_id in app_id_group:
+        ballot_distribution = (
+            (ballot_matrix == candidate_registry[app_id]).sum(axis=0).tolist()
+        )
 
         print("\nappID:" + app_id, end="\t")
         print(
@@ -534,9 +761,17 @@ def print_ballot_distribution_for_top_ranked_games(
     schulze_ranking: Ranking,
     standardized_ballots: Ballots,
     num_app_id_groups_to_display: int = 3,
+    candidate_registry: CandidateRegistry | None = None,
 ) -> None:
+    if candidate_registry is None:
+        candidate_registry = build_candidate_registry(standardized_ballots)
+
     for app_id_group in schulze_ranking[0:num_app_id_groups_to_display]:
-        print_ballot_distribution_for_given_appid(app_id_group, standardized_ballots)
+        print_ballot_distribution_for_given_appid(
+            app_id_group,
+            standardized_ballots,
+            candidate_registry=candidate_registry,
+        )
 
 
 def print_reviews_for_top_ranked_games(
@@ -557,32 +792,38 @@ def print_voter_stats(
     num_app_id_groups_to_display: int = 7,
     *,
     verbose: bool = True,
+    candidate_registry: CandidateRegistry | None = None,
 ) -> None:
     # Check how many people voted for N games which ended up in the top 10 of the GOTY ranking
     # Reference:
     # https://metacouncil.com/threads/metacouncils-pc-games-of-the-year-awards-2018-results.525/page-2
 
+    if candidate_registry is None:
+        candidate_registry = build_candidate_registry(standardized_ballots)
+
     goty = []
     for app_id_group in schulze_ranking[0:num_app_id_groups_to_display]:
-        goty.extend([int(app_id) for app_id in app_id_group])
+        goty.extend(app_id_group)
 
     print(f"\nVoter stats are displayed based on the top {len(goty)} games")
 
-    max_num_ballots_per_person = 0
+    voter_names, ballot_matrix = encode_standardized_ballots(
+        standardized_ballots,
+        candidate_registry,
+    )
 
-    counter = {}
-    for voter in standardized_ballots:
-        current_ballots = standardized_ballots[voter]["ballots"].values()
-        max_num_ballots_per_person = max(
-            max_num_ballots_per_person,
-            len(current_ballots),
-        )
+    is_in_goty = build_membership_mask(
+        get_candidate_indices(goty, candidate_registry),
+        num_candidates=len(candidate_registry),
+    )
+    num_votes_in_goty = is_in_goty[ballot_matrix].sum(axis=1)
 
-        vote = [int(i) for i in current_ballots if i is not None]
-        counter[voter] = sum(i in goty for i in vote)
+    max_num_ballots_per_person = ballot_matrix.shape[1]
 
     for num_votes in reversed(range(max_num_ballots_per_person + 1)):
-        ballots = [v for v, c in counter.items() if c == num_votes]
+        ballots = [
+            voter_names[i] for i in np.flatnonzero(num_votes_in_goty == num_votes)
+        ]
         print(
             f"\n{len(ballots)} ballots included {num_votes} games present in the top {len(goty)}.",
         )
@@ -603,9 +844,40 @@ def apply_pipeline(
     year_constraint: str = "equality",
     print_matches: bool = True,
     num_app_id_groups_to_display: int = 7,
+    use_numpy_engine: bool = False,
+    num_bootstrap_resamples: int = 0,
+    top_k: int | None = None,
+    compare_ranking_methods: bool = False,
+    prefetch_steam_app_details: bool = False,
+    use_year_partitioned_index: bool = False,
+    use_igdb_alias_index: bool = False,
+    use_trigram_index: bool = False,
+    use_bk_tree: bool = False,
+    use_batched_levenshtein: bool = False,
+    max_workers: int | None = 1,
+    use_match_cache: bool = False,
+    context: PipelineContext | None = None,
 ) -> bool:
+    # If provided, the context is used instead of loading the databases, and it holds the decision table of the
+    # release-year filter at the end of the run, cf. PipelineContext.release_year_decisions (audit log).
+    #
+    # With use_year_partitioned_index, names are first matched with the titles released during the target year(s), as
+    # in match_names.precompute_matches(). It only applies to SteamSpy, i.e. if use_igdb is False.
+    #
+    # With use_igdb_alias_index, names are first looked up offline among the aliases of the games in the IGDB local
+    # databases, as in igdb_match_names.match_names_with_igdb(). It only applies to IGDB, i.e. if use_igdb is True.
+    #
+    # The trigram index, the BK-tree, the batched Levenshtein distance, the pool of processes (max_workers) and the
+    # match cache speed up the matching with SteamSpy, as in match_names.precompute_matches(). They only apply to
+    # SteamSpy, i.e. if use_igdb is False.
+
     ballots = load_ballots(input_filename)
 
+    # The databases are loaded once, then shared by every stage.
+
+    if context is None:
+        context = PipelineContext.load(release_year, use_igdb=use_igdb)
+
     # Standardize ballots
 
     (standardized_ballots, matches) = standardize_ballots(
@@ -619,56 +891,110 @@ def apply_pipeline(
         goty_field=goty_field,
         year_constraint=year_constraint,
         print_matches=print_matches,
+        context=context,
+        use_year_partitioned_index=use_year_partitioned_index,
+        use_igdb_alias_index=use_igdb_alias_index,
+        use_trigram_index=use_trigram_index,
+        use_bk_tree=use_bk_tree,
+        use_batched_levenshtein=use_batched_levenshtein,
+        max_workers=max_workers,
+        use_match_cache=use_match_cache,
     )
 
-    whitelisted_ids = load_whitelisted_ids(release_year=release_year, use_igdb=use_igdb)
+    candidate_registry = build_candidate_registry(standardized_ballots)
 
-    standardized_ballots = filter_out_votes_for_wrong_release_years(
-        standardized_ballots,
-        release_year,
-        use_igdb=use_igdb,
-        year_constraint=year_constraint,
-        whitelisted_ids=whitelisted_ids,
-    )
+    if prefetch_steam_app_details and not use_igdb:
+        # The app details of every matched appID, including the closest neighbors, are loaded once, concurrently.
+        steam_app_details = prefetch_app_details(
+            collect_matched_app_ids(matches, standardized_ballots),
+        )
+    else:
+        steam_app_details = None
+
+    if use_igdb:
+        release_year_index = None
+    else:
+        # Release years are parsed at most once per appID, across runs, then read from the index.
+        release_year_index = build_release_year_index(
+            get_distinct_app_ids(standardized_ballots),
+            steam_app_details=steam_app_details,
+        )
+
+    # The filters are evaluated once per distinct appID, then applied to every ballot in a single pass.
+
+    ballot_filters = [
+        build_release_year_filter(
+            release_year,
+            use_igdb=use_igdb,
+            year_constraint=year_constraint,
+            steam_app_details=steam_app_details,
+            release_year_index=release_year_index,
+            context=context,
+        ),
+    ]
 
     if not use_igdb:
-        standardized_ballots = filter_out_votes_for_early_access_titles(
-            standardized_ballots,
-            whitelisted_ids=whitelisted_ids,
+        early_access_statuses = prefetch_early_access_statuses(
+            get_distinct_app_ids(standardized_ballots),
+            max_age_in_days=get_default_early_access_max_age_in_days(),
+            steam_app_details=steam_app_details,
+        )
+        ballot_filters.append(
+            build_early_access_filter(
+                early_access_statuses,
+                whitelisted_ids=context.whitelisted_ids,
+            ),
         )
 
-    standardized_ballots = filter_out_votes_for_hard_coded_reasons(
-        standardized_ballots,
-        release_year=release_year,
-        use_igdb=use_igdb,
+    ballot_filters.append(
+        build_hard_coded_filter(
+            release_year=release_year,
+            use_igdb=use_igdb,
+            disqualified_app_id_dict=context.disqualified_ids,
+        ),
     )
 
+    print()
+
+    standardized_ballots = filter_ballots(standardized_ballots, ballot_filters)
+
     # Apply Schulze method
 
-    schulze_ranking = compute_schulze_ranking(standardized_ballots)
+    schulze_ranking = compute_schulze_ranking(
+        standardized_ballots,
+        use_numpy_engine=use_numpy_engine,
+        candidate_registry=candidate_registry,
+        top_k=top_k,
+    )
 
     if try_to_break_ties:
         schulze_ranking = try_to_break_ties_in_schulze_ranking(
             schulze_ranking,
             standardized_ballots,
+            use_numpy_engine=use_numpy_engine,
+            candidate_registry=candidate_registry,
         )
 
     print_schulze_ranking(
         schulze_ranking,
         target_release_year=release_year,
         use_igdb=use_igdb,
+        steam_app_details=steam_app_details,
+        context=context,
     )
 
     print_ballot_distribution_for_top_ranked_games(
         schulze_ranking,
         standardized_ballots,
         num_app_id_groups_to_display=num_app_id_groups_to_display,
+        candidate_registry=candidate_registry,
     )
 
     print_voter_stats(
         schulze_ranking,
         standardized_ballots,
         num_app_id_groups_to_display=num_app_id_groups_to_display,
+        candidate_registry=candidate_registry,
     )
 
     print_reviews_for_top_ranked_games(
@@ -679,6 +1005,31 @@ def apply_pipeline(
         num_app_id_groups_to_display=num_app_id_groups_to_display,
     )
 
+    if compare_ranking_methods:
+        # The pairwise matrix is computed once, and shared by every ranking method.
+        pairwise_preferences = PairwisePreferences.from_standardized_ballots(
+            standardized_ballots,
+            candidate_registry,
+        )
+
+        print_ranking_comparison(
+            compute_rankings_with_all_methods(pairwise_preferences),
+            num_app_id_groups_to_display=num_app_id_groups_to_display,
+        )
+
+    if num_bootstrap_resamples > 0:
+        app_ids, bootstrap_rank_positions = run_bootstrap(
+            standardized_ballots,
+            num_bootstrap_resamples,
+            candidate_registry=candidate_registry,
+        )
+
+        print_bootstrap_stability(
+            schulze_ranking,
+            summarize_bootstrap_rank_positions(app_ids, bootstrap_rank_positions),
+            num_app_id_groups_to_display=num_app_id_groups_to_display,
+        )
+
     return True
 
 
@@ -693,6 +1044,10 @@ if __name__ == "__main__":
     use_levenshtein_distance = True
     update_credentials = False
 
+    # Speed-ups of the matching with SteamSpy, i.e. if use_igdb is False. The matches are the same.
+    use_batched_levenshtein = True
+    use_match_cache = True
+
     if update_credentials:
         download_latest_credentials(verbose=False)
 
@@ -712,4 +1067,6 @@ if __name__ == "__main__":
         goty_field=goty_field,
         year_constraint=year_constraint,
         num_app_id_groups_to_display=9,
+        use_batched_levenshtein=use_batched_levenshtein,
+        use_match_cache=use_match_cache,
     )
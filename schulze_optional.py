@@ -27,6 +27,7 @@ def apply_pipeline_for_optional_categories(
     num_app_id_groups_to_display: int = 3,
     must_be_available_on_pc: bool = False,
     must_be_a_game: bool = False,
+    use_numpy_engine: bool = False,
     verbose: bool = False,
 ) -> bool:
     ballots = load_ballots(input_filename)
@@ -50,12 +51,16 @@ def apply_pipeline_for_optional_categories(
 
     # Apply Schulze method
 
-    schulze_ranking = compute_schulze_ranking(standardized_ballots)
+    schulze_ranking = compute_schulze_ranking(
+        standardized_ballots,
+        use_numpy_engine=use_numpy_engine,
+    )
 
     if try_to_break_ties:
         schulze_ranking = try_to_break_ties_in_schulze_ranking(
             schulze_ranking,
             standardized_ballots,
+            use_numpy_engine=use_numpy_engine,
         )
 
     print_schulze_ranking(
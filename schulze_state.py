@@ -0,0 +1,225 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from candidate_registry import get_app_ids_from_registry
+from my_types import Ballots, CandidateRegistry, Ranking
+from pairwise_preferences import PairwisePreferences
+from schulze_engine import compute_strongest_paths, rank_candidates
+
+INFINITE_STRENGTH = np.iinfo(np.int64).max
+
+
+def get_path_edges(d: np.ndarray) -> np.ndarray:
+    # Edge V->W exists in the Schulze graph if more voters prefer V over W than W over V.
+
+    return np.where(d > d.T, d, 0)
+
+
+def repair_strongest_paths_around_candidate(
+    p: np.ndarray,
+    edges: np.ndarray,
+    candidate_index: int,
+) -> None:
+    # Update p in place after the edges incident to a single candidate have been strengthened (and never weakened).
+    #
+    # Any new strongest path goes through this candidate: it is the concatenation of a path towards the candidate,
+    # ending with one of its (new) in-edges, and of a path from the candidate, starting with one of its (new) out-edges.
+    # Both halves only use the other edges, which have not changed, so they can be read from the current p.
+
+    u = candidate_index
+
+    q = p.copy()
+    np.fill_diagonal(q, INFINITE_STRENGTH)
+
+    strength_to_u = np.minimum(q, edges[:, u][np.newaxis, :]).max(axis=1, initial=0)
+    strength_from_u = np.minimum(edges[u, :][:, np.newaxis], q).max(axis=0, initial=0)
+
+    strength_to_u[u] = INFINITE_STRENGTH
+    strength_from_u[u] = INFINITE_STRENGTH
+
+    np.maximum(
+        p,
+        np.minimum(strength_to_u[:, np.newaxis], strength_from_u[np.newaxis, :]),
+        out=p,
+    )
+    np.fill_diagonal(p, 0)
+
+
+def find_sources_affected_by_weakened_edges(
+    p: np.ndarray,
+    previous_edges: np.ndarray,
+    weakened_edges: np.ndarray,
+) -> np.ndarray:
+    # A strongest path from V to W may only weaken if a weakened edge lies on one of the strongest paths from V to W.
+    # Candidates V with at least one such path are returned, so that their strongest paths can be computed again.
+
+    q = p.copy()
+    np.fill_diagonal(q, INFINITE_STRENGTH)
+
+    is_affected = np.zeros(p.shape, dtype=bool)
+    for x, y in weakened_edges:
+        strength_through_edge = np.minimum(
+            np.minimum(q[:, x, np.newaxis], previous_edges[x, y]),
+            q[np.newaxis, y, :],
+        )
+        is_affected |= strength_through_edge >= p
+
+    is_affected &= p > 0
+
+    return np.flatnonzero(is_affected.any(axis=1))
+
+
+def compute_strongest_paths_from_sources(
+    edges: np.ndarray,
+    sources: np.ndarray,
+) -> np.ndarray:
+    # Widest paths from a few sources, by relaxing every edge at once until the strengths do not change anymore.
+
+    strengths = edges[sources, :].copy()
+
+    while True:
+        new_strengths = np.maximum(
+            strengths,
+            np.minimum(strengths[:, :, np.newaxis], edges[np.newaxis, :, :]).max(
+                axis=1,
+                initial=0,
+            ),
+        )
+        if np.array_equal(new_strengths, strengths):
+            break
+        strengths = new_strengths
+
+    strengths[np.arange(len(sources)), sources] = 0
+
+    return strengths
+
+
+@dataclass
+class SchulzeState:
+    # d[V,W] is the number of voters who prefer candidate V over W, where unranked candidates tie last on a ballot.
+    # p[V,W] is the strength of the strongest path from candidate V to W.
+    # num_rankings[V] is the number of ballots which rank candidate V.
+
+    candidate_registry: CandidateRegistry = field(default_factory=dict)
+    d: np.ndarray = field(default_factory=lambda: np.zeros((0, 0), dtype=np.int64))
+    p: np.ndarray = field(default_factory=lambda: np.zeros((0, 0), dtype=np.int64))
+    num_rankings: np.ndarray = field(
+        default_factory=lambda: np.zeros(0, dtype=np.int64),
+    )
+
+    @classmethod
+    def from_standardized_ballots(cls, standardized_ballots: Ballots) -> "SchulzeState":
+        return cls.from_pairwise_preferences(
+            PairwisePreferences.from_standardized_ballots(standardized_ballots),
+        )
+
+    @classmethod
+    def from_pairwise_preferences(
+        cls,
+        pairwise_preferences: PairwisePreferences,
+    ) -> "SchulzeState":
+        return cls(
+            candidate_registry=pairwise_preferences.get_candidate_registry(),
+            d=pairwise_preferences.d.copy(),
+            p=compute_strongest_paths(pairwise_preferences.d),
+            num_rankings=pairwise_preferences.num_rankings.copy(),
+        )
+
+    def register_candidate(self, app_id: str) -> int:
+        # A new candidate is unranked on every previous ballot, hence it loses to every candidate ranked on them.
+        # This only adds in-edges to the new candidate, so the strongest paths are repaired around it.
+
+        candidate_index = len(self.candidate_registry)
+        self.candidate_registry[app_id] = candidate_index
+
+        self.d = np.pad(self.d, ((0, 1), (0, 1)))
+        self.d[:, candidate_index] = np.append(self.num_rankings, 0)
+        self.p = np.pad(self.p, ((0, 1), (0, 1)))
+        self.num_rankings = np.append(self.num_rankings, 0)
+
+        repair_strongest_paths_around_candidate(
+            self.p,
+            get_path_edges(self.d),
+            candidate_index,
+        )
+
+        return candidate_index
+
+    def get_ranked_indices(
+        self,
+        app_ids: list[str | None],
+        *,
+        register_new_candidates: bool = False,
+    ) -> list[int]:
+        ranked_indices: list[int] = []
+
+        for app_id in app_ids:
+            if app_id is None:
+                continue
+            if app_id not in self.candidate_registry and register_new_candidates:
+                self.register_candidate(app_id)
+            candidate_index = self.candidate_registry[app_id]
+            if candidate_index not in ranked_indices:
+                ranked_indices.append(candidate_index)
+
+        return ranked_indices
+
+    def update_ballot(self, ranked_indices: list[int], weight: int) -> None:
+        # A ballot ranks its candidates above the candidates ranked after them, and above every unranked candidate.
+        # Only the k rows of the ranked candidates change, with O(k²) corrections for the pairs among them.
+        #
+        # The strongest paths are repaired in two steps: first for the weakened edges, by computing again the paths from
+        # the few candidates which relied on them, then for the strengthened edges, which are all incident to a ranked
+        # candidate. If too many candidates are affected, the strongest paths are computed again from scratch.
+
+        previous_edges = get_path_edges(self.d)
+
+        for i, candidate_index in enumerate(ranked_indices):
+            self.d[candidate_index, :] += weight
+            self.d[candidate_index, ranked_indices[: i + 1]] -= weight
+        self.num_rankings[ranked_indices] += weight
+
+        edges = get_path_edges(self.d)
+
+        weakened_edges = np.argwhere(edges < previous_edges)
+
+        if len(weakened_edges) > 0:
+            sources = find_sources_affected_by_weakened_edges(
+                self.p,
+                previous_edges,
+                weakened_edges,
+            )
+
+            if 2 * len(sources) > len(self.candidate_registry):
+                self.p = compute_strongest_paths(self.d)
+                return
+
+            if len(sources) > 0:
+                self.p[sources, :] = compute_strongest_paths_from_sources(
+                    np.minimum(edges, previous_edges),
+                    sources,
+                )
+
+        for candidate_index in ranked_indices:
+            repair_strongest_paths_around_candidate(self.p, edges, candidate_index)
+
+    def add_ballot(self, app_ids: list[str | None], weight: int = 1) -> None:
+        ranked_indices = self.get_ranked_indices(app_ids, register_new_candidates=True)
+
+        self.update_ballot(ranked_indices, weight)
+
+    def remove_ballot(self, app_ids: list[str | None], weight: int = 1) -> None:
+        ranked_indices = self.get_ranked_indices(app_ids)
+
+        self.update_ballot(ranked_indices, -weight)
+
+    def get_ranking(self) -> Ranking:
+        # Candidates which are not ranked on any ballot anymore are left out, as if they had never received a vote.
+
+        is_active = self.num_rankings > 0
+
+        app_ids = get_app_ids_from_registry(self.candidate_registry)
+        candidate_names = [app_ids[i] for i in np.flatnonzero(is_active)]
+
+        return rank_candidates(candidate_names, self.p[np.ix_(is_active, is_active)])
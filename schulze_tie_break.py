@@ -0,0 +1,171 @@
+from collections import Counter
+
+import numpy as np
+
+from candidate_registry import (
+    EMPTY_SLOT,
+    build_candidate_registry,
+    build_membership_mask,
+    compact_ballot_matrix,
+    encode_standardized_ballots,
+    get_app_ids_from_registry,
+    get_candidate_indices,
+)
+from my_types import Ballots, CandidateRegistry, Ranking, TieBreakCache
+from schulze_engine import compute_ranks_from_ballot_matrix
+
+
+def build_sub_election_ballots(
+    ballot_matrix: np.ndarray,
+    candidate_indices: np.ndarray,
+    num_candidates: int,
+    threshold_n: int,
+) -> np.ndarray:
+    # Interned equivalent of build_standardized_ballots_for_tie(): only voters who voted for at least n of the tied
+    # candidates are kept, and their ballots are restricted to the tied candidates.
+    #
+    # NB: the input is expected to be compacted, so that a candidate ranked twice by a voter only counts once.
+
+    is_tied = build_membership_mask(candidate_indices, num_candidates)[ballot_matrix]
+
+    has_voted_for_at_least_n_tied_app_ids = is_tied.sum(axis=1) >= threshold_n
+
+    sub_election_ballots = np.where(is_tied, ballot_matrix, EMPTY_SLOT)
+
+    return compact_ballot_matrix(
+        sub_election_ballots[has_voted_for_at_least_n_tied_app_ids],
+    )
+
+
+def display_info_about_tie_from_ballot_matrix(
+    app_id_group: list[str],
+    sub_election_ballots: np.ndarray,
+    app_ids: list[str],
+    threshold_n: int,
+) -> None:
+    print(
+        f"\nInfo regarding tie with appIDs in {app_id_group} with threshold = {threshold_n}",
+    )
+
+    for column in range(sub_election_ballots.shape[1]):
+        count_at_position = Counter(
+            app_ids[i] if i != EMPTY_SLOT else None
+            for i in sub_election_ballots[:, column].tolist()
+        )
+        if any(k is not None for k in count_at_position):
+            print(f"Position n°{column + 1} ; {count_at_position}")
+
+
+def break_ties_in_app_id_group(
+    app_id_group: list[str],
+    ballot_matrix: np.ndarray,
+    candidate_registry: CandidateRegistry,
+    app_ids: list[str],
+    cache: TieBreakCache,
+    threshold_n: int | None = None,
+) -> Ranking:
+    # Same recursion as try_to_break_ties_in_app_id_group(), but every sub-election is solved at most once.
+
+    if threshold_n is None:
+        threshold_n = 1
+
+    key = (frozenset(app_id_group), threshold_n)
+    if key in cache:
+        return cache[key]
+
+    sub_election_ballots = build_sub_election_ballots(
+        ballot_matrix,
+        get_candidate_indices(app_id_group, candidate_registry),
+        num_candidates=len(candidate_registry),
+        threshold_n=threshold_n,
+    )
+
+    if sub_election_ballots.shape[0] == 0:
+        print("Cannot break the tie.")
+        output_ranking = [app_id_group]
+    else:
+        display_info_about_tie_from_ballot_matrix(
+            app_id_group,
+            sub_election_ballots,
+            app_ids,
+            threshold_n,
+        )
+
+        # Only the tied candidates which appear on the selected ballots take part in the sub-election.
+        input_ranking = compute_ranks_from_ballot_matrix(sub_election_ballots, app_ids)
+
+        if len(input_ranking) == 1:
+            print("Tie still there. Trying again with a higher threshold.")
+            output_ranking = break_ties_in_app_id_group(
+                app_id_group,
+                ballot_matrix,
+                candidate_registry,
+                app_ids,
+                cache,
+                threshold_n=threshold_n + 1,
+            )
+        else:
+            print(f"Tie has been partially broken: {input_ranking}")
+            output_ranking = []
+            for small_app_id_group in input_ranking:
+                if len(small_app_id_group) == 1:
+                    output_ranking.append(small_app_id_group)
+                else:
+                    print(
+                        f"Looking more closely at a **strictly** smaller tie: {small_app_id_group}",
+                    )
+                    output_ranking += break_ties_in_app_id_group(
+                        small_app_id_group,
+                        ballot_matrix,
+                        candidate_registry,
+                        app_ids,
+                        cache,
+                        threshold_n=None,
+                    )
+
+    cache[key] = output_ranking
+
+    return output_ranking
+
+
+def break_ties_in_schulze_ranking(
+    schulze_ranking: Ranking,
+    standardized_ballots: Ballots,
+    candidate_registry: CandidateRegistry | None = None,
+) -> Ranking:
+    # The ballots are interned once, and the sub-elections are memoized by (tied appIDs, threshold).
+
+    if candidate_registry is None:
+        candidate_registry = build_candidate_registry(standardized_ballots)
+
+    _, ballot_matrix = encode_standardized_ballots(
+        standardized_ballots,
+        candidate_registry,
+    )
+    ballot_matrix = compact_ballot_matrix(ballot_matrix)
+
+    app_ids = get_app_ids_from_registry(candidate_registry)
+    cache: TieBreakCache = {}
+
+    untied_schulze_ranking = []
+
+    for group_no, app_id_group in enumerate(schulze_ranking):
+        if len(app_id_group) > 1:
+            schulze_ranking_for_tied_app_id_group = break_ties_in_app_id_group(
+                app_id_group,
+                ballot_matrix,
+                candidate_registry,
+                app_ids,
+                cache,
+            )
+
+            if len(schulze_ranking_for_tied_app_id_group) > 1:
+                print(
+                    f"\nAt least one tie has been broken for group n°{group_no + 1}",
+                )
+
+            untied_schulze_ranking.extend(schulze_ranking_for_tied_app_id_group)
+        else:
+            untied_schulze_ranking.append(app_id_group)
+
+    return untied_schulze_ranking
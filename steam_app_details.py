@@ -0,0 +1,143 @@
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import steampi.api
+
+from my_types import Ballots
+
+
+def get_steam_store_rate_limits() -> dict[str, int]:
+    return {
+        # The Steam store throttles the app details endpoint at about 200 requests per 5 minutes.
+        "num_requests": 200,
+        "num_seconds": 300,
+        # Number of threads used to load or download app details.
+        "max_num_open_requests": 8,
+    }
+
+
+def build_rate_limiter(num_requests: int, num_seconds: float) -> Callable[[], None]:
+    # Sliding window shared by every thread: a call blocks until fewer than num_requests requests were made during the
+    # last num_seconds seconds.
+
+    request_times: deque[float] = deque()
+    lock = threading.Lock()
+
+    def wait_for_rate_limit() -> None:
+        while True:
+            with lock:
+                current_time = time.monotonic()
+                while request_times and current_time - request_times[0] >= num_seconds:
+                    request_times.popleft()
+
+                if len(request_times) < num_requests:
+                    request_times.append(current_time)
+                    return
+
+                cooldown_duration = num_seconds - (current_time - request_times[0])
+
+            time.sleep(cooldown_duration)
+
+    return wait_for_rate_limit
+
+
+def collect_matched_app_ids(
+    matches: dict,
+    standardized_ballots: Ballots | None = None,
+    num_closest_neighbors: int = 3,
+) -> list[str]:
+    # Distinct appIDs of the matches, including the closest neighbors, and of the ballots, which can include hard-coded
+    # matches. Dummy appIDs, which are not positive, do not exist on the Steam store and are skipped.
+
+    app_ids = {}
+
+    for element in matches.values():
+        for app_id in element["matched_appID"][:num_closest_neighbors]:
+            app_ids[str(app_id)] = None
+
+    if standardized_ballots is not None:
+        for voter in standardized_ballots:
+            for app_id in standardized_ballots[voter]["ballots"].values():
+                if app_id is not None:
+                    app_ids[str(app_id)] = None
+
+    return [app_id for app_id in app_ids if int(app_id) > 0]
+
+
+def load_app_details_with_rate_limit(
+    app_id: str,
+    wait_for_rate_limit: Callable[[], None],
+) -> dict:
+    # Only downloads count towards the rate limit: app details which are cached on disk are loaded right away.
+
+    if not Path(steampi.api.get_appdetails_filename(app_id)).exists():
+        wait_for_rate_limit()
+
+    app_details, _, _ = steampi.api.load_app_details(app_id)
+
+    return app_details
+
+
+def prefetch_app_details(
+    app_ids: list[str],
+    steam_store_rate_limits: dict[str, int] | None = None,
+) -> dict[str, dict]:
+    # Warm in-memory map: appID ---> app details, loaded or downloaded concurrently.
+
+    if steam_store_rate_limits is None:
+        steam_store_rate_limits = get_steam_store_rate_limits()
+
+    wait_for_rate_limit = build_rate_limiter(
+        steam_store_rate_limits["num_requests"],
+        steam_store_rate_limits["num_seconds"],
+    )
+
+    with ThreadPoolExecutor(
+        max_workers=steam_store_rate_limits["max_num_open_requests"],
+    ) as executor:
+        app_details = executor.map(
+            lambda app_id: load_app_details_with_rate_limit(
+                app_id,
+                wait_for_rate_limit,
+            ),
+            app_ids,
+        )
+
+        return dict(zip(app_ids, app_details, strict=True))
+
+
+def get_release_date_as_str_from_app_details(
+    app_id: str,
+    app_details: dict,
+) -> str | None:
+    # Same as steampi.calendar.get_release_date_as_str(), with app details which are already loaded.
+
+    try:
+        release_date = app_details[app_id]["data"]["release_date"]["date"]
+    except KeyError:
+        try:
+            release_date = app_details["release_date"]["date"]
+        except KeyError:
+            release_date = None
+
+    return release_date
+
+
+def get_release_year_from_app_details(app_id: str, app_details: dict) -> int:
+    # Same as steampi.calendar.get_release_year(), including the ValueError raised for unexpected date formats.
+
+    release_date_as_str = get_release_date_as_str_from_app_details(app_id, app_details)
+
+    if not release_date_as_str:
+        return -1
+
+    try:
+        release_date = time.strptime(release_date_as_str, "%d %b, %Y")
+    except ValueError:
+        release_date = time.strptime(release_date_as_str, "%b %d, %Y")
+
+    return release_date.tm_year
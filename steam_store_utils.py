@@ -1,5 +1,11 @@
+import json
+import time
+from pathlib import Path
+
 import steampi.api
 
+from anonymize_data import get_data_folder
+
 
 def get_link_to_store(app_id: str, *, hide_dummy_app_id: bool = True) -> str:
     steam_store_base_url = "https://store.steampowered.com/app/"
@@ -15,11 +21,14 @@ def get_link_to_store(app_id: str, *, hide_dummy_app_id: bool = True) -> str:
     return link_to_store
 
 
-def get_early_access_status(app_id: str) -> bool:
-    if int(app_id) > 0:
-        app_details, _, _ = steampi.api.load_app_details(app_id)
-    else:
-        app_details = {}
+def get_early_access_status(app_id: str, app_details: dict | None = None) -> bool:
+    # NB: app details can be provided if they were already loaded, e.g. with prefetch_app_details().
+
+    if app_details is None:
+        if int(app_id) > 0:
+            app_details, _, _ = steampi.api.load_app_details(app_id)
+        else:
+            app_details = {}
 
     try:
         is_early_access = any(
@@ -29,3 +38,112 @@ def get_early_access_status(app_id: str) -> bool:
         is_early_access = False
 
     return is_early_access
+
+
+def get_default_early_access_max_age_in_days() -> float:
+    # Titles leave Early Access, so the statuses are looked up again after this many days.
+
+    return 30
+
+
+def get_early_access_index_file_name() -> str:
+    # Dict: appID ---> {"is_early_access": bool, "save_timestamp": int}
+
+    return get_data_folder() + "early_access_index.json"
+
+
+def load_early_access_index(file_name: str | None = None) -> dict[str, dict]:
+    if file_name is None:
+        file_name = get_early_access_index_file_name()
+
+    try:
+        with Path(file_name).open(encoding="utf-8") as f:
+            early_access_index = json.load(f)
+    except FileNotFoundError:
+        early_access_index = {}
+
+    return early_access_index
+
+
+def save_early_access_index(
+    early_access_index: dict[str, dict],
+    file_name: str | None = None,
+) -> None:
+    if file_name is None:
+        file_name = get_early_access_index_file_name()
+
+    with Path(file_name).open("w", encoding="utf-8") as f:
+        json.dump(early_access_index, f)
+
+
+def prefetch_early_access_statuses(
+    app_ids: list[str],
+    file_name: str | None = None,
+    max_age_in_days: float | None = None,
+    *,
+    save_to_disk: bool = True,
+    steam_app_details: dict[str, dict] | None = None,
+) -> dict[str, bool]:
+    # Early Access status of each distinct appID, looked up once and persisted on disk, so that the filter only
+    # performs dictionary lookups. Entries older than max_age_in_days are looked up again, as the status can change.
+    #
+    # NB: if the app details could not be loaded, e.g. due to a network error or to rate limits, the status is used for
+    # this run, but it is not persisted, so that the download is tried again later. A previous entry is kept, if any.
+
+    if steam_app_details is None:
+        steam_app_details = {}
+
+    early_access_index = load_early_access_index(file_name=file_name)
+
+    current_time_stamp = int(time.time())
+
+    def is_stale(app_id: str) -> bool:
+        if app_id not in early_access_index:
+            return True
+        if max_age_in_days is None:
+            return False
+        age_in_seconds = (
+            current_time_stamp - early_access_index[app_id]["save_timestamp"]
+        )
+        return age_in_seconds > max_age_in_days * 24 * 3600
+
+    app_ids_to_look_up = [
+        app_id for app_id in dict.fromkeys(app_ids) if is_stale(app_id)
+    ]
+
+    failed_lookups = {}
+    is_index_updated = False
+
+    for app_id in app_ids_to_look_up:
+        app_details = steam_app_details.get(app_id)
+
+        if app_details is not None:
+            # Prefetched app details are empty if they could not be loaded, cf. load_app_details_with_rate_limit().
+            success_flag = bool(app_details)
+        elif int(app_id) > 0:
+            app_details, success_flag, _ = steampi.api.load_app_details(app_id)
+        else:
+            # Dummy appIDs do not exist on the Steam store, hence they are not Early Access titles.
+            app_details = {}
+            success_flag = True
+
+        is_early_access = get_early_access_status(app_id, app_details=app_details)
+
+        if success_flag:
+            early_access_index[app_id] = {
+                "is_early_access": is_early_access,
+                "save_timestamp": current_time_stamp,
+            }
+            is_index_updated = True
+        elif app_id not in early_access_index:
+            failed_lookups[app_id] = is_early_access
+
+    if save_to_disk and is_index_updated:
+        save_early_access_index(early_access_index, file_name=file_name)
+
+    return {
+        app_id: failed_lookups[app_id]
+        if app_id in failed_lookups
+        else early_access_index[app_id]["is_early_access"]
+        for app_id in app_ids
+    }
@@ -1,24 +1,51 @@
+import time
 import unittest
+from collections import Counter
 from pathlib import Path
 
+import Levenshtein
+import numpy as np
+import pytest
+import steampi.api
+import steampi.json_utils
+import steampi.text_distances
+
 import anonymize_data
+import ballot_filters
+import batched_levenshtein
+import bk_tree
+import candidate_registry
+import condorcet_methods
+import difflib_index
 import disqualify_vote
 import disqualify_vote_igdb
 import extend_igdb
 import extend_steamspy
 import hard_coded_matches
+import igdb_alias_index
 import igdb_databases
 import igdb_local_secrets
 import igdb_look_up
 import igdb_match_names
 import igdb_utils
 import load_ballots
+import match_cache
 import match_names
+import name_normalization
 import optional_categories
+import pairwise_preferences
 import parsing_params
 import parsing_utils
+import pipeline_context
+import release_year_index
+import schulze_bootstrap
+import schulze_engine
 import schulze_goty
+import schulze_state
+import schulze_tie_break
+import steam_app_details
 import steam_store_utils
+import trigram_index
 import whitelist_vote
 import whitelist_vote_igdb
 from my_types import Ballots
@@ -28,10 +55,47 @@ CELESTE_APP_ID = 504230
 EXPECTED_NUM_BALLOTS = 3
 EXPECTED_NUM_REVIEW_TOKEN_INDICES = 2
 HALF_LIFE_TWO_APP_ID = 220
+HELLBLADE_IGDB_ID = 7603
 PC_PLATFORM_NO = 6
 REFERENCE_TIMESTAMP = 31532400
 
 
+def get_dummy_steamspy_database() -> dict:
+    # Dummy catalog for the tests of name matching, with titles which are close to each other.
+    return {
+        "1": {"name": "Warhammer"},
+        "2": {"name": "Warhammer II"},
+        "3": {"name": "Celeste"},
+        "4": {"name": "Half-Life 2"},
+        "5": {"name": "Half-Life"},
+    }
+
+
+def get_dummy_raw_votes() -> dict:
+    # Dummy ballots with typos, a noisy vote, and a name which appears on two ballots.
+    return {
+        "A": {"goty_preferences": {1: "Half-Life II", 2: "Celest", 3: "n/a"}},
+        "B": {"goty_preferences": {1: "warhammer 2", 2: "Half-Life II"}},
+    }
+
+
+def get_dummy_standardized_ballots() -> Ballots:
+    # Dummy ballots for the tests of the Schulze method, with three candidates and partially filled ballots.
+    return {
+        "A": {"ballots": {1: "100", 2: "300", 3: "200"}},
+        "B": {"ballots": {1: "200", 2: "100", 3: None}},
+        "C": {"ballots": {1: "300", 2: None, 3: None}},
+    }
+
+
+def get_dummy_late_standardized_ballots() -> Ballots:
+    # Dummy ballots cast after the ones above, with a new candidate.
+    return {
+        "D": {"ballots": {1: "400", 2: "200", 3: None}},
+        "E": {"ballots": {1: "200", 2: "400", 3: "100"}},
+    }
+
+
 class TestParsingUtilsMethods(unittest.TestCase):
     @staticmethod
     def test_parse_text_data() -> None:
@@ -62,6 +126,53 @@ class TestParsingUtilsMethods(unittest.TestCase):
         assert ballots["MyTestUserName"]["best_turd"] == "Cyberpunk 2077"
 
 
+class TestSteamAppDetailsMethods(unittest.TestCase):
+    @staticmethod
+    def test_collect_matched_app_ids() -> None:
+        matches = {
+            "Celeste": {"matched_appID": ["504230", "1", "2", "3"]},
+            "Spider-Man": {"matched_appID": ["-1"]},
+        }
+        standardized_ballots = {
+            "A": {"ballots": {1: "504230", 2: "220", 3: None}},
+        }
+
+        app_ids = steam_app_details.collect_matched_app_ids(
+            matches,
+            standardized_ballots,
+        )
+
+        assert app_ids == ["504230", "1", "2", "220"]
+
+    @staticmethod
+    def test_get_release_year_from_app_details() -> None:
+        app_id = "504230"
+        expected_release_year = 2018
+
+        for release_date in ["25 Jan, 2018", "Jan 25, 2018"]:
+            release_year = steam_app_details.get_release_year_from_app_details(
+                app_id,
+                {"release_date": {"date": release_date}},
+            )
+            assert release_year == expected_release_year
+
+        assert steam_app_details.get_release_year_from_app_details(app_id, {}) == -1
+
+    @staticmethod
+    def test_build_rate_limiter() -> None:
+        num_seconds = 0.2
+        wait_for_rate_limit = steam_app_details.build_rate_limiter(
+            num_requests=2,
+            num_seconds=num_seconds,
+        )
+
+        start_time = time.monotonic()
+        for _ in range(3):
+            wait_for_rate_limit()
+
+        assert time.monotonic() - start_time >= num_seconds
+
+
 class TestSteamStoreUtilsMethods(unittest.TestCase):
     @staticmethod
     def test_get_link_to_store_case_valid_app_id() -> None:
@@ -97,6 +208,84 @@ class TestSteamStoreUtilsMethods(unittest.TestCase):
 
         assert link_to_store == "n/a"
 
+    @staticmethod
+    def test_prefetch_early_access_statuses() -> None:
+        file_name = "data/dummy_early_access_index_for_unit_test.json"
+        steam_store_utils.save_early_access_index(
+            {"382310": {"is_early_access": True, "save_timestamp": 0}},
+            file_name=file_name,
+        )
+
+        # The cached entry is used as is, and the dummy appID is looked up without any download.
+        early_access_statuses = steam_store_utils.prefetch_early_access_statuses(
+            ["382310", "-1", "382310"],
+            file_name=file_name,
+        )
+
+        assert early_access_statuses == {"382310": True, "-1": False}
+        assert "-1" in steam_store_utils.load_early_access_index(file_name=file_name)
+
+        # Stale entries are looked up again. Empty app details, e.g. a failed download, are not persisted.
+        early_access_statuses = steam_store_utils.prefetch_early_access_statuses(
+            ["382310", "504230"],
+            file_name=file_name,
+            max_age_in_days=1,
+            steam_app_details={"382310": {}, "504230": {}},
+        )
+
+        assert early_access_statuses == {"382310": True, "504230": False}
+        early_access_index = steam_store_utils.load_early_access_index(
+            file_name=file_name,
+        )
+        assert early_access_index["382310"]["save_timestamp"] == 0
+        assert "504230" not in early_access_index
+
+
+class TestReleaseYearIndexMethods(unittest.TestCase):
+    @staticmethod
+    def test_get_release_year_case_failed_load() -> None:
+        index = {}
+
+        # Empty app details, e.g. a failed download, are not indexed.
+        release_year = release_year_index.get_release_year(
+            "504230",
+            index,
+            app_details={},
+        )
+
+        assert release_year == -1
+        assert "504230" not in index
+
+    @staticmethod
+    def test_compute_release_year_case_problematic_release_date() -> None:
+        app_id = "319630"
+        expected_release_year = 2015
+
+        release_year = release_year_index.compute_release_year(
+            app_id,
+            {"release_date": {"date": "29 янв. 2015"}},
+        )
+
+        assert release_year == expected_release_year
+
+    @staticmethod
+    def test_build_release_year_index() -> None:
+        file_name = "data/dummy_release_year_index_for_unit_test.json"
+        release_year_index.save_release_year_index(
+            {"382310": 2017},
+            file_name=file_name,
+        )
+
+        # The indexed appID is not parsed again, and the other appID is parsed from its app details.
+        index = release_year_index.build_release_year_index(
+            ["382310", "504230"],
+            file_name=file_name,
+            steam_app_details={"504230": {"release_date": {"date": "25 Jan, 2018"}}},
+        )
+
+        assert index == {"382310": 2017, "504230": 2018}
+        assert release_year_index.load_release_year_index(file_name=file_name) == index
+
 
 class TestAnonymizeDataMethods(unittest.TestCase):
     @staticmethod
@@ -274,6 +463,65 @@ class TestHardCodedMatchesMethods(unittest.TestCase):
         assert hard_coded_dict
 
 
+class TestBallotFiltersMethods(unittest.TestCase):
+    @staticmethod
+    def test_get_distinct_app_ids() -> None:
+        assert ballot_filters.get_distinct_app_ids(get_dummy_standardized_ballots()) == [
+            "100",
+            "300",
+            "200",
+        ]
+
+    @staticmethod
+    def test_filter_ballots() -> None:
+        num_calls: Counter[str] = Counter()
+
+        def is_not_300(app_id: str) -> bool:
+            num_calls[app_id] += 1
+            return app_id != "300"
+
+        def is_not_200(app_id: str) -> bool:
+            return app_id != "200"
+
+        standardized_ballots = ballot_filters.filter_ballots(
+            get_dummy_standardized_ballots(),
+            [is_not_300, is_not_200],
+        )
+
+        assert standardized_ballots == {
+            "A": {"ballots": {1: "100", 2: None, 3: None}},
+            "B": {"ballots": {1: "100", 2: None, 3: None}},
+            "C": {"ballots": {1: None, 2: None, 3: None}},
+        }
+        # Each filter is evaluated once per distinct appID.
+        assert num_calls == Counter({"100": 1, "300": 1, "200": 1})
+
+    @staticmethod
+    def test_build_filter_from_decisions() -> None:
+        def decide(app_id: str) -> ballot_filters.Decision:
+            if app_id == "300":
+                return ballot_filters.Decision(
+                    keep=False,
+                    reason="AppID 300 removed",
+                    is_notable=True,
+                )
+            return ballot_filters.Decision(keep=True, reason=f"AppID {app_id} kept")
+
+        decisions: dict[str, ballot_filters.Decision] = {}
+
+        standardized_ballots = ballot_filters.filter_ballots(
+            get_dummy_standardized_ballots(),
+            [ballot_filters.build_filter_from_decisions(decide, decisions)],
+        )
+
+        assert standardized_ballots["A"]["ballots"] == {1: "100", 2: "200", 3: None}
+        assert decisions == ballot_filters.compute_decisions(
+            ["100", "300", "200"],
+            decide,
+        )
+        assert not decisions["300"].keep
+
+
 class TestDisqualifyVoteMethods(unittest.TestCase):
     @staticmethod
     def test_get_hard_coded_noisy_votes() -> None:
@@ -398,6 +646,490 @@ class TestMatchNamesMethods(unittest.TestCase):
         assert database_entry["developer"] == "Valve"
         assert database_entry["publisher"] == "Valve"
 
+    @staticmethod
+    def test_find_closest_app_id_with_eligible_database() -> None:
+        steamspy_database = {
+            "1": {"name": "Warhammer"},
+            "2": {"name": "Warhammer II"},
+            "3": {"name": "Celeste"},
+        }
+        partitions = release_year_index.partition_database_by_release_year(
+            steamspy_database,
+            {"1": 2016, "2": 2017, "3": 2018},
+        )
+        eligible_database = release_year_index.get_eligible_database(
+            partitions,
+            release_year="2017",
+        )
+
+        assert list(eligible_database) == ["2"]
+
+        (closest_app_id, _) = match_names.find_closest_app_id(
+            "Warhammer 2",
+            steamspy_database,
+            release_year="2017",
+            eligible_database=eligible_database,
+        )
+
+        assert closest_app_id == ["2"]
+
+        # Fallback to the whole database, because no eligible title is close enough.
+        (closest_app_id, closest_distance) = match_names.find_closest_app_id(
+            "Celeste",
+            steamspy_database,
+            release_year="2017",
+            eligible_database=eligible_database,
+        )
+
+        assert closest_app_id == ["3"]
+        assert closest_distance == [0]
+
+    @staticmethod
+    def test_find_closest_app_id_with_eligible_database_case_exact_match() -> None:
+        steamspy_database = {
+            "1": {"name": "Celestia"},
+            "2": {"name": "Celeste"},
+        }
+        eligible_database = release_year_index.get_eligible_database(
+            release_year_index.partition_database_by_release_year(
+                steamspy_database,
+                {"1": 2017, "2": 2018},
+            ),
+            release_year="2017",
+        )
+
+        # The eligible title is close enough, but the exact match, released in another year, is strictly closer.
+        (closest_app_id, closest_distance) = match_names.find_closest_app_id(
+            "Celeste",
+            steamspy_database,
+            release_year="2017",
+            eligible_database=eligible_database,
+        )
+
+        assert closest_app_id == ["2"]
+        assert closest_distance == [0]
+
+    @staticmethod
+    def test_get_eligible_database_case_minimum_year() -> None:
+        partitions = {2016: {"1": {}}, 2017: {"2": {}}, 2018: {"3": {}}}
+
+        eligible_database = release_year_index.get_eligible_database(
+            partitions,
+            release_year="2017",
+            year_constraint="minimum",
+        )
+
+        assert list(eligible_database) == ["2", "3"]
+
+
+class TestNameNormalizationMethods(unittest.TestCase):
+    @staticmethod
+    def test_get_canonical_name() -> None:
+        for raw_name in ["Elden Ring", "ELDEN RING™", "elden ring ", "Elden  Ring®"]:
+            assert name_normalization.get_canonical_name(raw_name) == "elden ring"
+
+        assert name_normalization.get_canonical_name(
+            "Half-Life II",
+        ) == name_normalization.get_canonical_name("half life 2")
+        assert name_normalization.get_canonical_name(
+            "Baldur\N{RIGHT SINGLE QUOTATION MARK}s Gate 3",
+        ) == name_normalization.get_canonical_name("Baldur's Gate III")
+        assert name_normalization.get_canonical_name("Pokémon") == "pokemon"
+        assert name_normalization.get_canonical_name(
+            "Mega Man X",
+        ) != name_normalization.get_canonical_name("Mega Man 10")
+
+    @staticmethod
+    def test_get_match_key() -> None:
+        assert match_names.get_match_key("ELDEN RING™") == "elden ring"
+
+        # Names without any letter or digit are not merged with each other.
+        assert match_names.get_match_key("?!") == "?!"
+        assert match_names.get_match_key("?!") != match_names.get_match_key("...")
+
+    @staticmethod
+    def test_precompute_matches_with_spelling_variants() -> None:
+        steamspy_database = {
+            "1": {"name": "Elden Ring"},
+            "2": {"name": "Celeste"},
+        }
+        raw_votes = {
+            "A": {"goty_preferences": {1: "ELDEN RING™", 2: "Celest"}},
+            "B": {"goty_preferences": {1: "elden ring ", 2: "Elden Ring"}},
+        }
+
+        assert match_names.get_distinct_raw_names(raw_votes) == [
+            "ELDEN RING™",
+            "Celest",
+        ]
+
+        matches = match_names.precompute_matches(
+            raw_votes,
+            steamspy_database=steamspy_database,
+        )
+
+        assert list(matches) == ["ELDEN RING™", "Celest", "elden ring ", "Elden Ring"]
+        assert matches["Elden Ring"]["input_name"] == "Elden Ring"
+        assert matches["Elden Ring"]["matched_appID"][0] == "1"
+        assert (
+            matches["Elden Ring"]["match_distance"]
+            == matches["ELDEN RING™"]["match_distance"]
+        )
+
+
+class TestTrigramIndexMethods(unittest.TestCase):
+    @staticmethod
+    def test_find_most_similar_game_names() -> None:
+        steamspy_database = get_dummy_steamspy_database()
+        index = trigram_index.TrigramIndex.from_database(steamspy_database)
+
+        # With a shortlist as large as the database, the output is the same as with the search over the database.
+        for raw_name in ["Half-Life II", "warhammer 2", "Celest"]:
+            assert index.find_most_similar_game_names(
+                raw_name,
+                shortlist_size=len(steamspy_database),
+            ) == steampi.text_distances.find_most_similar_game_names(
+                raw_name,
+                steamspy_database,
+            )
+
+        (sorted_app_ids, dist) = index.find_most_similar_game_names(
+            "Celest",
+            shortlist_size=1,
+        )
+
+        assert sorted_app_ids == ["3"]
+        assert dist == {"3": 1}
+
+        assert (
+            trigram_index.compute_top_k_recall(
+                ["Half-Life II", "warhammer 2", "Celest"],
+                steamspy_database,
+                index,
+                shortlist_size=2,
+                num_closest_neighbors=1,
+            )
+            == 1
+        )
+
+    @staticmethod
+    def test_load_trigram_index() -> None:
+        file_name = "data/dummy_trigram_index_for_unit_test.json"
+        steamspy_database = get_dummy_steamspy_database()
+
+        index = trigram_index.load_trigram_index(
+            steamspy_database,
+            file_name=file_name,
+        )
+        loaded_index = trigram_index.load_trigram_index(
+            steamspy_database,
+            file_name=file_name,
+        )
+
+        assert loaded_index.to_dict() == index.to_dict()
+
+        # The index is built again for a different snapshot of the catalog.
+        steamspy_database["6"] = {"name": "Hades"}
+        updated_index = trigram_index.load_trigram_index(
+            steamspy_database,
+            file_name=file_name,
+        )
+
+        assert updated_index.app_ids[-1] == "6"
+
+
+class TestDifflibIndexMethods(unittest.TestCase):
+    @staticmethod
+    def get_dummy_steamspy_database_with_duplicates() -> dict:
+        # With a duplicate name, up to the case, and an empty name.
+        return get_dummy_steamspy_database() | {
+            "6": {"name": "CELESTE"},
+            "7": {"name": ""},
+        }
+
+    def test_find_most_similar_game_names(self) -> None:
+        steamspy_database = self.get_dummy_steamspy_database_with_duplicates()
+        index = difflib_index.DifflibIndex.from_database(steamspy_database)
+
+        for raw_name in ["Half-Life II", "warhammer 2", "Celest", "Hades", ""]:
+            for n in [1, 3, len(steamspy_database)]:
+                assert index.find_most_similar_game_names(
+                    raw_name,
+                    n=n,
+                ) == steampi.text_distances.find_most_similar_game_names(
+                    raw_name,
+                    steamspy_database,
+                    use_levenshtein_distance=False,
+                    n=n,
+                )
+
+    def test_precompute_matches_with_difflib_index(self) -> None:
+        raw_votes = get_dummy_raw_votes()
+        raw_votes["B"]["goty_preferences"][3] = "Hades"
+
+        matches = [
+            match_names.precompute_matches(
+                raw_votes,
+                steamspy_database=self.get_dummy_steamspy_database_with_duplicates(),
+                use_levenshtein_distance=False,
+                use_difflib_index=use_difflib_index,
+            )
+            for use_difflib_index in [False, True]
+        ]
+
+        assert matches[0] == matches[1]
+
+
+class TestBKTreeMethods(unittest.TestCase):
+    @staticmethod
+    def test_find_nearest_game_names() -> None:
+        steamspy_database = get_dummy_steamspy_database() | {"6": {"name": "CELESTE"}}
+        tree = bk_tree.BKTree.from_database(steamspy_database)
+        loaded_tree = bk_tree.BKTree.from_dict(tree.to_dict())
+
+        for raw_name in ["Half-Life II", "warhammer 2", "Celest"]:
+            (sorted_app_ids, dist) = (
+                steampi.text_distances.find_most_similar_game_names(
+                    raw_name,
+                    steamspy_database,
+                )
+            )
+
+            for num_neighbors in range(1, len(steamspy_database) + 1):
+                (nearest_app_ids, nearest_dist) = loaded_tree.find_nearest_game_names(
+                    raw_name,
+                    num_neighbors=num_neighbors,
+                )
+
+                assert nearest_app_ids == sorted_app_ids[:num_neighbors]
+                assert nearest_dist == {
+                    app_id: dist[app_id] for app_id in nearest_app_ids
+                }
+
+
+class TestBatchedLevenshteinMethods(unittest.TestCase):
+    @staticmethod
+    def test_compute_all_levenshtein_distances() -> None:
+        queries = ["", "half-life ii", "celest", "x" * 70]
+        candidates = ["", "half-life 2", "celeste", "warhammer ii", "x" * 65, "y" * 80]
+
+        distances = batched_levenshtein.compute_all_levenshtein_distances(
+            queries,
+            candidates,
+            batch_params={"bucket_width": 4, "max_num_pairs_per_chunk": 3},
+        )
+
+        expected_distances = [
+            [Levenshtein.distance(query, candidate) for candidate in candidates]
+            for query in queries
+        ]
+
+        assert distances.tolist() == expected_distances
+
+    @staticmethod
+    def test_precompute_matches_with_batched_levenshtein() -> None:
+        steamspy_database = get_dummy_steamspy_database()
+        raw_votes = get_dummy_raw_votes()
+
+        matches = [
+            match_names.precompute_matches(
+                raw_votes,
+                steamspy_database=steamspy_database,
+                use_batched_levenshtein=use_batched_levenshtein,
+            )
+            for use_batched_levenshtein in [False, True]
+        ]
+
+        assert matches[0] == matches[1]
+        assert list(matches[1]) == ["Half-Life II", "Celest", "warhammer 2"]
+
+    @staticmethod
+    def test_precompute_matches_with_batched_levenshtein_and_release_year() -> None:
+        file_name = "data/dummy_release_year_index_for_unit_test.json"
+        steamspy_database = get_dummy_steamspy_database()
+        raw_votes = get_dummy_raw_votes()
+
+        matches = []
+        for use_batched_levenshtein in [False, True]:
+            # Every neighbor which is checked for the release year is indexed, so that no app details are downloaded.
+            release_year_index.save_release_year_index(
+                {"1": 1990, "2": 2017, "3": 2018, "4": 2004, "5": 1998},
+                file_name=file_name,
+            )
+            matches.append(
+                match_names.precompute_matches(
+                    raw_votes,
+                    release_year="2017",
+                    steamspy_database=steamspy_database,
+                    use_batched_levenshtein=use_batched_levenshtein,
+                    release_year_index_file_name=file_name,
+                ),
+            )
+
+        assert matches[0] == matches[1]
+
+        # "Warhammer" and "Warhammer II" are at the same distance, and only the latter was released in 2017.
+        assert matches[1]["warhammer 2"]["matched_appID"][0] == "2"
+
+    @staticmethod
+    def test_precompute_matches_with_process_pool() -> None:
+        steamspy_database = get_dummy_steamspy_database()
+        raw_votes = get_dummy_raw_votes()
+
+        matches = [
+            match_names.precompute_matches(
+                raw_votes,
+                steamspy_database=steamspy_database,
+                max_workers=max_workers,
+            )
+            for max_workers in [1, 2]
+        ]
+
+        assert matches[0] == matches[1]
+        assert list(matches[1]) == ["Half-Life II", "Celest", "warhammer 2"]
+
+    @staticmethod
+    def test_precompute_matches_with_process_pool_and_release_year() -> None:
+        file_name = "data/dummy_release_year_index_for_unit_test.json"
+        steamspy_database = get_dummy_steamspy_database()
+        raw_votes = get_dummy_raw_votes()
+
+        # The release year of the dummy appID "5" is missing from the index, and read from app details cached on disk.
+        app_details_file_name = steampi.api.get_appdetails_filename("5")
+        steampi.json_utils.save_json_data(
+            app_details_file_name,
+            {"release_date": {"date": "8 Nov, 1998"}},
+        )
+
+        matches = []
+        for max_workers in [1, 2]:
+            release_year_index.save_release_year_index(
+                {"1": 1990, "2": 2017, "3": 2018, "4": 2004},
+                file_name=file_name,
+            )
+            matches.append(
+                match_names.precompute_matches(
+                    raw_votes,
+                    release_year="2017",
+                    steamspy_database=steamspy_database,
+                    max_workers=max_workers,
+                    release_year_index_file_name=file_name,
+                ),
+            )
+
+            # The release years looked up for the workers are added to the index of the parent process, then saved.
+            assert release_year_index.load_release_year_index(file_name=file_name) == {
+                "1": 1990,
+                "2": 2017,
+                "3": 2018,
+                "4": 2004,
+                "5": 1998,
+            }
+
+        Path(app_details_file_name).unlink()
+
+        assert matches[0] == matches[1]
+        assert matches[1]["warhammer 2"]["matched_appID"][0] == "2"
+
+
+class TestMatchCacheMethods(unittest.TestCase):
+    @staticmethod
+    def test_compute_match_cache_hash() -> None:
+        steamspy_database = get_dummy_steamspy_database()
+
+        assert match_cache.compute_match_cache_hash(
+            steamspy_database,
+            {"Warhammer 2": "1"},
+        ) != match_cache.compute_match_cache_hash(
+            steamspy_database,
+            {"Warhammer 2": "2"},
+        )
+
+    @staticmethod
+    def test_get_match_cache_key() -> None:
+        distance_metric = match_cache.get_distance_metric_name()
+
+        assert match_cache.get_match_cache_key(
+            "Celest",
+            None,
+            "equality",
+            distance_metric,
+        ) == match_cache.get_match_cache_key("Celest", None, None, distance_metric)
+        assert match_cache.get_match_cache_key(
+            "Celest",
+            "2018",
+            "equality",
+            distance_metric,
+        ) != match_cache.get_match_cache_key("Celest", "2018", None, distance_metric)
+        assert match_cache.get_distance_metric_name(
+            use_trigram_index=True,
+        ) != match_cache.get_distance_metric_name(use_trigram_index=False)
+
+    @staticmethod
+    def test_is_matching_exact() -> None:
+        assert match_cache.is_matching_exact()
+        assert match_cache.is_matching_exact(use_bk_tree=True)
+
+        # Approximate matches, with the trigram index, are not cached.
+        assert not match_cache.is_matching_exact(use_trigram_index=True)
+        assert match_cache.is_matching_exact(use_trigram_index=True, use_bk_tree=True)
+        assert match_cache.is_matching_exact(
+            use_trigram_index=True,
+            use_batched_levenshtein=True,
+        )
+        assert not match_cache.is_matching_exact(
+            use_trigram_index=True,
+            use_batched_levenshtein=True,
+            is_searching_eligible_titles_first=True,
+        )
+        assert match_cache.is_matching_exact(
+            use_levenshtein_distance=False,
+            use_trigram_index=True,
+        )
+
+    @staticmethod
+    def test_precompute_matches_with_match_cache() -> None:
+        file_name = "data/dummy_match_cache_for_unit_test.json"
+        Path(file_name).unlink(missing_ok=True)
+
+        steamspy_database = get_dummy_steamspy_database()
+        raw_votes = get_dummy_raw_votes()
+
+        matches = [
+            match_names.precompute_matches(
+                raw_votes,
+                steamspy_database=steamspy_database,
+                use_match_cache=True,
+                match_cache_file_name=file_name,
+            )
+            for _ in range(2)
+        ]
+
+        assert matches[0] == matches[1]
+
+        cache = match_cache.load_match_cache(steamspy_database, file_name=file_name)
+        assert len(cache.entries) == len(matches[0])
+
+        # The matches are read from the cache during the next run.
+        for element in cache.entries.values():
+            element["matched_name"] = ["cached"] * len(element["matched_name"])
+        match_cache.save_match_cache(cache, file_name=file_name)
+
+        cached_matches = match_names.precompute_matches(
+            raw_votes,
+            steamspy_database=steamspy_database,
+            use_match_cache=True,
+            match_cache_file_name=file_name,
+        )
+        assert cached_matches["Celest"]["matched_name"][0] == "cached"
+
+        # The cache is emptied for a different snapshot of the catalog.
+        steamspy_database["6"] = {"name": "Hades"}
+        assert not match_cache.load_match_cache(
+            steamspy_database,
+            file_name=file_name,
+        ).entries
+
 
 class TestSchulzeGotyMethods(unittest.TestCase):
     @staticmethod
@@ -405,10 +1137,29 @@ class TestSchulzeGotyMethods(unittest.TestCase):
         ballot_year = "2018"
         input_filename = "anonymized_dummy_goty_awards_" + ballot_year + ".csv"
 
+        context = pipeline_context.PipelineContext.load(ballot_year)
+
         assert schulze_goty.apply_pipeline(
             input_filename,
             release_year=ballot_year,
             try_to_break_ties=True,
+            context=context,
+        )
+
+        # The decision table of the release-year filter is available after the run.
+        assert context.release_year_decisions
+
+    @staticmethod
+    def test_apply_pipeline_with_faster_matching() -> None:
+        ballot_year = "2018"
+        input_filename = "anonymized_dummy_goty_awards_" + ballot_year + ".csv"
+
+        assert schulze_goty.apply_pipeline(
+            input_filename,
+            release_year=ballot_year,
+            use_bk_tree=True,
+            use_batched_levenshtein=True,
+            max_workers=2,
         )
 
     @staticmethod
@@ -430,12 +1181,17 @@ class TestSchulzeGotyMethods(unittest.TestCase):
             release_year=ballot_year,
         )
 
+        context = pipeline_context.PipelineContext.load(ballot_year)
         standardized_ballots = schulze_goty.filter_out_votes_for_wrong_release_years(
             standardized_ballots,
             target_release_year=ballot_year,
+            context=context,
         )
 
         assert bool(standardized_ballots["dummy_voter_name"]["ballots"][1] is None)
+        assert any(
+            not decision.keep for decision in context.release_year_decisions.values()
+        )
 
     @staticmethod
     def test_filter_out_votes_for_early_access_titles() -> None:
@@ -500,6 +1256,597 @@ class TestSchulzeGotyMethods(unittest.TestCase):
 
         assert untied_schulze_ranking == [["100"], ["200", "300"]]
 
+    @staticmethod
+    def test_adapt_votes_format_for_schulze_computations() -> None:
+        standardized_ballots = {
+            "A": {"ballots": {1: "100", 2: "200", 3: None}},
+            "B": {"ballots": {1: "100", 2: None, 3: "200"}},
+            "C": {"ballots": {1: "200", 2: "200", 3: None}},
+        }
+
+        (
+            candidate_names,
+            weighted_ranks,
+        ) = schulze_goty.adapt_votes_format_for_schulze_computations(
+            standardized_ballots,
+        )
+
+        assert sorted(candidate_names) == ["100", "200"]
+        assert weighted_ranks == [([["100"], ["200"]], 2), ([["200"], ["100"]], 1)]
+
+    @staticmethod
+    def test_compute_schulze_ranking_with_numpy_engine() -> None:
+        standardized_ballots = {
+            "A": {"ballots": {1: "100", 2: "300", 3: "200", 4: None, 5: None}},
+            "B": {"ballots": {1: "200", 2: "100", 3: "300", 4: None, 5: None}},
+            "C": {"ballots": {1: "100", 2: None, 3: None, 4: None, 5: None}},
+        }
+
+        schulze_ranking = schulze_goty.compute_schulze_ranking(standardized_ballots)
+        numpy_schulze_ranking = schulze_goty.compute_schulze_ranking(
+            standardized_ballots,
+            use_numpy_engine=True,
+        )
+
+        assert [sorted(group) for group in numpy_schulze_ranking] == [
+            sorted(group) for group in schulze_ranking
+        ]
+
+    @staticmethod
+    def test_compute_schulze_ranking_with_top_k() -> None:
+        standardized_ballots = {
+            "A": {"ballots": {1: "100", 2: "300", 3: "200", 4: None, 5: None}},
+            "B": {"ballots": {1: "200", 2: "100", 3: "300", 4: None, 5: None}},
+            "C": {"ballots": {1: "100", 2: "400", 3: None, 4: None, 5: None}},
+        }
+
+        top_k = 2
+
+        for use_numpy_engine in [False, True]:
+            schulze_ranking = schulze_goty.compute_schulze_ranking(
+                standardized_ballots,
+                use_numpy_engine=use_numpy_engine,
+            )
+            top_schulze_ranking = schulze_goty.compute_schulze_ranking(
+                standardized_ballots,
+                use_numpy_engine=use_numpy_engine,
+                top_k=top_k,
+            )
+
+            assert len(schulze_ranking) > top_k
+            assert top_schulze_ranking == schulze_ranking[:top_k]
+
+    @staticmethod
+    def test_compute_schulze_ranking_with_invalid_top_k() -> None:
+        standardized_ballots = {"A": {"ballots": {1: "100", 2: "200", 3: None}}}
+
+        for top_k in [0, -1, 1.5, True]:
+            for use_numpy_engine in [False, True]:
+                with pytest.raises(ValueError, match="top_k"):
+                    schulze_goty.compute_schulze_ranking(
+                        standardized_ballots,
+                        use_numpy_engine=use_numpy_engine,
+                        top_k=top_k,
+                    )
+
+
+class TestPipelineContextMethods(unittest.TestCase):
+    @staticmethod
+    def test_load_pipeline_context() -> None:
+        context = pipeline_context.PipelineContext.load(
+            "2018",
+            use_igdb=False,
+            steamspy_database={},
+        )
+
+        assert context.local_database["-1"]["name"] == "Marvel's Spider-Man"
+        assert "0" in context.whitelisted_ids
+        assert "-1" in context.disqualified_ids
+
+        context.set_igdb_databases({"Celeste": [26226]}, {"26226": {}})
+
+        assert "-1" not in context.local_database
+        assert "Celeste" in context.match_database
+
+
+class TestCandidateRegistryMethods(unittest.TestCase):
+    @staticmethod
+    def test_build_candidate_registry() -> None:
+        registry = candidate_registry.build_candidate_registry(
+            get_dummy_standardized_ballots(),
+        )
+
+        assert registry == {"100": 0, "300": 1, "200": 2}
+        assert candidate_registry.get_app_ids_from_registry(registry) == [
+            "100",
+            "300",
+            "200",
+        ]
+
+    @staticmethod
+    def test_encode_standardized_ballots() -> None:
+        standardized_ballots = get_dummy_standardized_ballots()
+        registry = candidate_registry.build_candidate_registry(standardized_ballots)
+
+        voter_names, ballot_matrix = candidate_registry.encode_standardized_ballots(
+            standardized_ballots,
+            registry,
+        )
+
+        assert voter_names == ["A", "B", "C"]
+        assert ballot_matrix.tolist() == [[0, 1, 2], [2, 0, -1], [1, -1, -1]]
+
+    @staticmethod
+    def test_collapse_identical_ballots() -> None:
+        ballot_matrix = np.array(
+            [[1, -1, 2, 1], [1, 2, -1, -1], [2, 2, 1, -1]],
+            dtype=np.int32,
+        )
+
+        unique_ballot_matrix, weights = candidate_registry.collapse_identical_ballots(
+            ballot_matrix,
+        )
+
+        assert unique_ballot_matrix.tolist() == [[1, 2, -1, -1], [2, 1, -1, -1]]
+        assert weights.tolist() == [2, 1]
+
+    @staticmethod
+    def test_build_membership_mask() -> None:
+        membership_mask = candidate_registry.build_membership_mask(
+            candidate_registry.get_candidate_indices(["300"], {"100": 0, "300": 1}),
+            num_candidates=2,
+        )
+
+        assert membership_mask.tolist() == [False, True, False]
+        assert not membership_mask[candidate_registry.EMPTY_SLOT]
+
+    @staticmethod
+    def test_print_voter_stats() -> None:
+        schulze_goty.print_voter_stats(
+            [["100"], ["200"], ["300"]],
+            get_dummy_standardized_ballots(),
+            num_app_id_groups_to_display=2,
+        )
+
+        schulze_goty.print_ballot_distribution_for_top_ranked_games(
+            [["100"], ["200"], ["300"]],
+            get_dummy_standardized_ballots(),
+        )
+
+
+class TestSchulzeEngineMethods(unittest.TestCase):
+    @staticmethod
+    def get_weighted_ranks() -> list:
+        # Reference: https://en.wikipedia.org/wiki/Schulze_method#Example
+        return [
+            ([["A"], ["C"], ["B"], ["E"], ["D"]], 5),
+            ([["A"], ["D"], ["E"], ["C"], ["B"]], 5),
+            ([["B"], ["E"], ["D"], ["A"], ["C"]], 8),
+            ([["C"], ["A"], ["B"], ["E"], ["D"]], 3),
+            ([["C"], ["A"], ["E"], ["B"], ["D"]], 7),
+            ([["C"], ["B"], ["A"], ["D"], ["E"]], 2),
+            ([["D"], ["C"], ["E"], ["B"], ["A"]], 7),
+            ([["E"], ["B"], ["A"], ["D"], ["C"]], 8),
+        ]
+
+    def test_compute_pairwise_preferences(self) -> None:
+        candidate_names = ["A", "B", "C", "D", "E"]
+        rank_matrix, weights = schulze_engine.build_rank_matrix(
+            candidate_names,
+            self.get_weighted_ranks(),
+        )
+
+        d = schulze_engine.compute_pairwise_preferences(rank_matrix, weights)
+
+        assert d.tolist() == [
+            [0, 20, 26, 30, 22],
+            [25, 0, 16, 33, 18],
+            [19, 29, 0, 17, 24],
+            [15, 12, 28, 0, 14],
+            [23, 27, 21, 31, 0],
+        ]
+
+    def test_compute_pairwise_preferences_from_ballot_matrix(self) -> None:
+        candidate_names = ["A", "B", "C", "D", "E"]
+        weighted_ranks = self.get_weighted_ranks()
+
+        # Only the first three candidates are listed: the other ones implicitly tie last.
+        ballot_matrix = np.array(
+            [
+                [candidate_names.index(group[0]) for group in ranks[:3]]
+                for ranks, _ in weighted_ranks
+            ],
+            dtype=np.int32,
+        )
+        weights = np.array([weight for _, weight in weighted_ranks], dtype=np.int64)
+
+        d = schulze_engine.compute_pairwise_preferences_from_ballot_matrix(
+            ballot_matrix,
+            weights,
+            num_candidates=len(candidate_names),
+        )
+
+        truncated_weighted_ranks = [
+            ([*ranks[:3], [group[0] for group in ranks[3:]]], weight)
+            for ranks, weight in weighted_ranks
+        ]
+        rank_matrix, weights = schulze_engine.build_rank_matrix(
+            candidate_names,
+            truncated_weighted_ranks,
+        )
+
+        assert (
+            d.tolist()
+            == schulze_engine.compute_pairwise_preferences(
+                rank_matrix,
+                weights,
+            ).tolist()
+        )
+
+    def test_compute_ranks(self) -> None:
+        candidate_names = ["A", "B", "C", "D", "E"]
+
+        schulze_ranking = schulze_engine.compute_ranks(
+            candidate_names,
+            self.get_weighted_ranks(),
+        )
+
+        assert schulze_ranking == [["E"], ["A"], ["C"], ["B"], ["D"]]
+
+    @staticmethod
+    def test_compute_ranks_with_ties() -> None:
+        candidate_names = ["100", "200", "300"]
+        weighted_ranks = [
+            ([["100"], ["200", "300"]], 1),
+            ([["200"], ["100", "300"]], 1),
+        ]
+
+        schulze_ranking = schulze_engine.compute_ranks(candidate_names, weighted_ranks)
+
+        assert schulze_ranking == [["100", "200"], ["300"]]
+
+
+class TestSchulzeBootstrapMethods(unittest.TestCase):
+    @staticmethod
+    def get_random_ballot_matrix(
+        num_ballots: int,
+        num_candidates: int,
+        num_positions: int = 5,
+    ) -> np.ndarray:
+        # Distinct candidates on each ballot, with unranked positions (-1) at the end of some ballots.
+        rng = np.random.default_rng(0)
+
+        ballot_matrix = np.argsort(
+            rng.random((num_ballots, num_candidates)),
+            axis=1,
+        )[:, :num_positions]
+        num_ranked_positions = rng.integers(1, num_positions + 1, size=num_ballots)
+        ballot_matrix[
+            np.arange(num_positions)[np.newaxis, :] >= num_ranked_positions[:, np.newaxis]
+        ] = -1
+
+        return ballot_matrix
+
+    def test_compute_pairwise_preferences_for_resamples(self) -> None:
+        num_candidates = 300
+        ballot_matrix = self.get_random_ballot_matrix(500, num_candidates)
+        resampled_weights = np.random.default_rng(1).integers(0, 3, size=(4, 500))
+
+        d = schulze_bootstrap.compute_pairwise_preferences_for_resamples(
+            ballot_matrix,
+            resampled_weights,
+            num_candidates,
+        )
+
+        assert d.shape == (4, num_candidates, num_candidates)
+        for d_single, weights in zip(d, resampled_weights, strict=True):
+            assert np.array_equal(
+                d_single,
+                schulze_engine.compute_pairwise_preferences_from_ballot_matrix(
+                    ballot_matrix,
+                    weights,
+                    num_candidates=num_candidates,
+                ),
+            )
+
+    @staticmethod
+    def test_get_bootstrap_batch_size() -> None:
+        memory_budget = schulze_bootstrap.get_default_bootstrap_memory_budget()
+
+        # With several hundred candidates, as on GOTY ballots, a batch fits in the memory budget.
+        for num_candidates in [3, 300, 1000, 5000]:
+            batch_size = schulze_bootstrap.get_bootstrap_batch_size(num_candidates)
+
+            assert batch_size >= 1
+            assert batch_size == 1 or batch_size * 40 * num_candidates**2 <= memory_budget
+
+    @staticmethod
+    def test_compute_strongest_paths_for_a_stack_of_elections() -> None:
+        rng = np.random.default_rng(0)
+        d = rng.integers(0, 10, size=(5, 4, 4))
+
+        p = schulze_engine.compute_strongest_paths(d)
+
+        for d_single, p_single in zip(d, p, strict=True):
+            assert np.array_equal(
+                schulze_engine.compute_strongest_paths(d_single),
+                p_single,
+            )
+
+    @staticmethod
+    def test_run_bootstrap() -> None:
+        standardized_ballots = get_dummy_standardized_ballots()
+
+        app_ids, bootstrap_rank_positions = schulze_bootstrap.run_bootstrap(
+            standardized_ballots,
+            num_resamples=30,
+            num_resamples_per_batch=7,
+            max_workers=1,
+        )
+
+        assert app_ids == ["100", "300", "200"]
+        assert bootstrap_rank_positions.shape == (30, 3)
+        # The output does not depend on the number of workers.
+        assert np.array_equal(
+            bootstrap_rank_positions,
+            schulze_bootstrap.run_bootstrap(
+                standardized_ballots,
+                num_resamples=30,
+                num_resamples_per_batch=7,
+                max_workers=2,
+            )[1],
+        )
+
+        bootstrap_summary = schulze_bootstrap.summarize_bootstrap_rank_positions(
+            app_ids,
+            bootstrap_rank_positions,
+        )
+        lower_rank, upper_rank = bootstrap_summary["100"]["confidence_interval"]
+        assert 1 <= lower_rank <= bootstrap_summary["100"]["median_rank"] <= upper_rank
+        assert np.isclose(
+            sum(bootstrap_summary["100"]["rank_distribution"].values()),
+            1,
+        )
+
+    def test_run_bootstrap_with_many_candidates(self) -> None:
+        num_candidates = 300
+        ballot_matrix = self.get_random_ballot_matrix(1000, num_candidates)
+        standardized_ballots = {
+            str(i): {
+                "ballots": {
+                    position + 1: None if candidate < 0 else str(candidate)
+                    for position, candidate in enumerate(ballot.tolist())
+                },
+            }
+            for i, ballot in enumerate(ballot_matrix)
+        }
+
+        app_ids, bootstrap_rank_positions = schulze_bootstrap.run_bootstrap(
+            standardized_ballots,
+            num_resamples=20,
+            max_workers=1,
+        )
+
+        assert len(app_ids) <= num_candidates
+        assert bootstrap_rank_positions.shape == (20, len(app_ids))
+        assert bootstrap_rank_positions.min() >= 1
+        assert bootstrap_rank_positions.max() <= len(app_ids)
+
+
+class TestPairwisePreferencesMethods(unittest.TestCase):
+    @staticmethod
+    def test_add() -> None:
+        standardized_ballots = get_dummy_standardized_ballots()
+        late_standardized_ballots = get_dummy_late_standardized_ballots()
+
+        merged = pairwise_preferences.merge_pairwise_preferences(
+            [
+                pairwise_preferences.PairwisePreferences.from_standardized_ballots(
+                    standardized_ballots,
+                ),
+                pairwise_preferences.PairwisePreferences.from_standardized_ballots(
+                    late_standardized_ballots,
+                ),
+            ],
+        )
+        expected = pairwise_preferences.PairwisePreferences.from_standardized_ballots(
+            standardized_ballots | late_standardized_ballots,
+        )
+
+        assert merged.app_ids == expected.app_ids
+        assert np.array_equal(merged.d, expected.d)
+        assert np.array_equal(merged.num_rankings, expected.num_rankings)
+        assert merged.num_voters == expected.num_voters
+        assert merged.get_ranking() == schulze_goty.compute_schulze_ranking(
+            standardized_ballots | late_standardized_ballots,
+            use_numpy_engine=True,
+        )
+
+    @staticmethod
+    def test_merge_pairwise_preferences_case_no_source() -> None:
+        merged = pairwise_preferences.merge_pairwise_preferences([])
+
+        assert merged.app_ids == []
+        assert merged.d.shape == (0, 0)
+        assert merged.num_voters == 0
+        assert merged.get_ranking() == []
+
+    @staticmethod
+    def test_save_and_load() -> None:
+        preferences = (
+            pairwise_preferences.PairwisePreferences.from_standardized_ballots(
+                get_dummy_standardized_ballots(),
+            )
+        )
+        file_name = "data/dummy_pairwise_preferences_for_unit_test.json"
+
+        pairwise_preferences.save_pairwise_preferences(
+            preferences,
+            source_name="test",
+            file_name=file_name,
+        )
+        loaded = pairwise_preferences.load_pairwise_preferences(
+            source_name="test",
+            file_name=file_name,
+        )
+        assert loaded.app_ids == preferences.app_ids
+        assert np.array_equal(loaded.d, preferences.d)
+        assert np.array_equal(loaded.num_rankings, preferences.num_rankings)
+        assert loaded.num_voters == preferences.num_voters
+
+
+class TestCondorcetMethodsMethods(unittest.TestCase):
+    @staticmethod
+    def get_pairwise_preferences() -> pairwise_preferences.PairwisePreferences:
+        # Reference: https://en.wikipedia.org/wiki/Schulze_method#Example
+        return pairwise_preferences.PairwisePreferences(
+            app_ids=["A", "B", "C", "D", "E"],
+            d=np.array(
+                [
+                    [0, 20, 26, 30, 22],
+                    [25, 0, 16, 33, 18],
+                    [19, 29, 0, 17, 24],
+                    [15, 12, 28, 0, 14],
+                    [23, 27, 21, 31, 0],
+                ],
+            ),
+            num_rankings=np.full(5, 45),
+            num_voters=45,
+        )
+
+    def test_compute_rankings_with_all_methods(self) -> None:
+        rankings = condorcet_methods.compute_rankings_with_all_methods(
+            self.get_pairwise_preferences(),
+        )
+
+        assert rankings == {
+            "schulze": [["E"], ["A"], ["C"], ["B"], ["D"]],
+            "ranked_pairs": [["A"], ["C"], ["E"], ["B"], ["D"]],
+            "copeland": [["E"], ["A", "B", "C"], ["D"]],
+            "minimax": [["E"], ["A"], ["C"], ["B"], ["D"]],
+            "borda": [["E"], ["A"], ["B"], ["C"], ["D"]],
+        }
+
+    @staticmethod
+    def test_get_rank_positions() -> None:
+        rank_positions = condorcet_methods.get_rank_positions(
+            [["E"], ["A", "B", "C"], ["D"]],
+        )
+
+        assert rank_positions == {"E": 1, "A": 2, "B": 2, "C": 2, "D": 5}
+
+    def test_print_ranking_comparison(self) -> None:
+        rankings = condorcet_methods.compute_rankings_with_all_methods(
+            self.get_pairwise_preferences(),
+        )
+
+        condorcet_methods.print_ranking_comparison(
+            rankings,
+            num_app_id_groups_to_display=3,
+        )
+
+
+class TestSchulzeStateMethods(unittest.TestCase):
+    @staticmethod
+    def sort_groups(ranking: list[list[str]]) -> list[list[str]]:
+        return [sorted(app_id_group) for app_id_group in ranking]
+
+    def test_from_standardized_ballots(self) -> None:
+        standardized_ballots = get_dummy_standardized_ballots()
+
+        state = schulze_state.SchulzeState.from_standardized_ballots(
+            standardized_ballots,
+        )
+
+        assert self.sort_groups(state.get_ranking()) == self.sort_groups(
+            schulze_goty.compute_schulze_ranking(standardized_ballots),
+        )
+
+    def test_add_ballot(self) -> None:
+        standardized_ballots = get_dummy_standardized_ballots()
+        state = schulze_state.SchulzeState.from_standardized_ballots(
+            standardized_ballots,
+        )
+
+        for voter_name, late_ballot in get_dummy_late_standardized_ballots().items():
+            state.add_ballot(list(late_ballot["ballots"].values()))
+            standardized_ballots[voter_name] = late_ballot
+
+        fresh_state = schulze_state.SchulzeState.from_standardized_ballots(
+            standardized_ballots,
+        )
+
+        assert state.d.tolist() == fresh_state.d.tolist()
+        assert state.p.tolist() == fresh_state.p.tolist()
+        assert self.sort_groups(state.get_ranking()) == self.sort_groups(
+            schulze_goty.compute_schulze_ranking(standardized_ballots),
+        )
+
+    def test_remove_ballot(self) -> None:
+        standardized_ballots = get_dummy_standardized_ballots()
+        state = schulze_state.SchulzeState.from_standardized_ballots(
+            standardized_ballots,
+        )
+
+        removed_ballot = standardized_ballots.pop("C")
+        state.remove_ballot(list(removed_ballot["ballots"].values()))
+
+        assert self.sort_groups(state.get_ranking()) == self.sort_groups(
+            schulze_goty.compute_schulze_ranking(standardized_ballots),
+        )
+
+
+class TestSchulzeTieBreakMethods(unittest.TestCase):
+    @staticmethod
+    def get_tied_standardized_ballots() -> Ballots:
+        # 100 and 200 are tied overall, but the only voter who ranks both prefers 100.
+        standardized_ballots = get_dummy_standardized_ballots()
+        del standardized_ballots["B"]
+        standardized_ballots["D"] = {"ballots": {1: "200", 2: None, 3: None}}
+
+        return standardized_ballots
+
+    def test_break_ties_in_schulze_ranking(self) -> None:
+        standardized_ballots = self.get_tied_standardized_ballots()
+        schulze_ranking = [["100", "200"]]
+
+        untied_schulze_ranking = schulze_tie_break.break_ties_in_schulze_ranking(
+            schulze_ranking,
+            standardized_ballots,
+        )
+
+        assert untied_schulze_ranking == [["100"], ["200"]]
+        assert untied_schulze_ranking == (
+            schulze_goty.try_to_break_ties_in_schulze_ranking(
+                schulze_ranking,
+                standardized_ballots,
+            )
+        )
+
+    def test_break_ties_in_app_id_group_is_memoized(self) -> None:
+        standardized_ballots = self.get_tied_standardized_ballots()
+        registry = candidate_registry.build_candidate_registry(standardized_ballots)
+        _, ballot_matrix = candidate_registry.encode_standardized_ballots(
+            standardized_ballots,
+            registry,
+        )
+        app_ids = candidate_registry.get_app_ids_from_registry(registry)
+        cache = {}
+
+        ranking = schulze_tie_break.break_ties_in_app_id_group(
+            ["100", "200"],
+            ballot_matrix,
+            registry,
+            app_ids,
+            cache,
+        )
+
+        assert ranking == [["100"], ["200"]]
+        assert set(cache) == {
+            (frozenset({"100", "200"}), 1),
+            (frozenset({"100", "200"}), 2),
+        }
+
 
 class TestOptionalCategoriesMethods(unittest.TestCase):
     @staticmethod
@@ -973,6 +2320,108 @@ class TestIGDBMatchNamesMethods(unittest.TestCase):
         assert igdb_match_names.main()
 
 
+class TestIGDBAliasIndexMethods(unittest.TestCase):
+    @staticmethod
+    def get_dummy_igdb_local_databases() -> list[dict]:
+        pc_platform_no = igdb_utils.get_pc_platform_no()
+
+        return [
+            {
+                "120": {
+                    "id": 120,
+                    "name": "Diablo III",
+                    "alternative_names": [{"name": "D3"}],
+                    "category": 0,
+                    "platforms": [pc_platform_no],
+                    "release_dates": [{"y": 2012, "platform": pc_platform_no}],
+                },
+            },
+            {
+                "119133": {
+                    "id": 119133,
+                    "name": "Elden Ring",
+                    "external_games": [{"name": "ELDEN RING™"}],
+                    "category": 0,
+                    "platforms": [pc_platform_no],
+                    "release_dates": [{"y": 2022, "platform": pc_platform_no}],
+                },
+                "120": {
+                    "id": 120,
+                    "name": "Diablo III",
+                    "category": 0,
+                    "platforms": [pc_platform_no, 48],
+                    "release_dates": [{"y": 2012, "platform": pc_platform_no}],
+                },
+            },
+        ]
+
+    def test_look_up_game_name(self) -> None:
+        alias_index = igdb_alias_index.IGDBAliasIndex.from_local_databases(
+            self.get_dummy_igdb_local_databases(),
+        )
+
+        assert alias_index.igdb_ids == {
+            "diablo 3": ["120"],
+            "elden ring": ["119133"],
+        }
+
+        # The most recent data about a game is used.
+        igdb_matches = alias_index.look_up_game_name("Diablo 3", enforced_year="2012")
+        assert [element["id"] for element in igdb_matches] == [120]
+        assert "alternative_names" not in igdb_matches[0]
+
+        assert alias_index.look_up_game_name("elden ring ", enforced_year="2022")
+        assert not alias_index.look_up_game_name("Elden Ring", enforced_year="2021")
+        assert alias_index.look_up_game_name(
+            "Elden Ring",
+            enforced_year="2021",
+            year_constraint="minimum",
+        )
+        assert not alias_index.look_up_game_name("Diablo IV")
+
+        # An unknown year constraint is handled like equality, as with IGDB API.
+        assert not alias_index.look_up_game_name(
+            "Elden Ring",
+            enforced_year="2021",
+            year_constraint="unknown",
+        )
+
+    @staticmethod
+    def test_load_igdb_local_databases_with_igdb_alias_index() -> None:
+        # No database is stored for this year, so the name is matched offline, with the local databases of other years.
+        release_year = "2017"
+        ballots: Ballots = {"dummy_voter_name": {"goty_preferences": {1: "Hellblade"}}}
+
+        (
+            igdb_match_database,
+            igdb_local_database,
+        ) = igdb_match_names.load_igdb_local_databases(
+            ballots=ballots,
+            release_year=release_year,
+            use_igdb_alias_index=True,
+        )
+
+        for file_name in [
+            igdb_databases.get_igdb_match_database_file_name(release_year),
+            igdb_databases.get_igdb_local_database_file_name(release_year),
+        ]:
+            Path(file_name).unlink()
+
+        # IGDB id for "Hellblade: Senua's Sacrifice"
+        assert igdb_match_database["Hellblade"][0] == HELLBLADE_IGDB_ID
+        assert str(HELLBLADE_IGDB_ID) in igdb_local_database
+
+    @staticmethod
+    def test_get_aliases() -> None:
+        assert igdb_alias_index.get_aliases(
+            {
+                "name": "Diablo III",
+                "alternative_names": [{"name": "D3"}, {"comment": "Acronym"}],
+                "external_games": [{"name": "Diablo 3"}],
+            },
+        ) == ["Diablo III", "D3", "Diablo 3"]
+
+
 class TestIGDBDatabasesMethods(unittest.TestCase):
     @staticmethod
     def test_get_igdb_file_name_suffix() -> None:
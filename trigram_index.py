@@ -0,0 +1,212 @@
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import Levenshtein
+import numpy as np
+import steampi.text_distances
+
+from anonymize_data import get_data_folder
+
+
+def get_default_shortlist_size() -> int:
+    # Number of candidates re-ranked with the exact Levenshtein distance. Tune it with compute_top_k_recall().
+    # Measured on the 528 distinct GOTY names of the anonymized ballots in data/, against a proxy catalog of 4666 IGDB
+    # names and aliases: the top-1 recall is 98.5% with 200 candidates, and 99.1% with 400. Every top-1 miss but one is a
+    # tie at the same distance. The top-3 recall is lower, i.e. 77.5%, because of ties among the far neighbors.
+    #
+    # Caveat: the recall is below 100%, i.e. the search with the trigram index is approximate, and it was not measured on
+    # the SteamSpy catalog. Hence, matches found with the trigram index are not stored in the match cache.
+
+    return 200
+
+
+def get_trigrams(name: str) -> set[str]:
+    # Character trigrams of the lower-case name, padded so that the first and the last characters are well represented.
+
+    padded_name = "  " + name.lower() + " "
+
+    return {padded_name[i : i + 3] for i in range(len(padded_name) - 2)}
+
+
+def compute_catalog_hash(steamspy_database: dict) -> str:
+    # Fingerprint of the catalog snapshot: appIDs and names, in the order of the database.
+
+    catalog = [
+        [app_id, steamspy_database[app_id]["name"]] for app_id in steamspy_database
+    ]
+
+    return hashlib.sha256(json.dumps(catalog).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class TrigramIndex:
+    # Inverted index: trigram ---> positions of the catalog names which contain this trigram.
+    # Names are stored in lower case, in the order of the SteamSpy database, like app_ids.
+
+    app_ids: list[str]
+    names: list[str]
+    postings: dict[str, np.ndarray]
+    catalog_hash: str
+    num_trigrams: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.num_trigrams = np.bincount(
+            np.concatenate([np.zeros(0, dtype=np.int32), *self.postings.values()]),
+            minlength=len(self.app_ids),
+        )
+
+    @classmethod
+    def from_database(cls, steamspy_database: dict) -> "TrigramIndex":
+        app_ids = list(steamspy_database)
+        names = [steamspy_database[app_id]["name"].lower() for app_id in app_ids]
+
+        postings: dict[str, list[int]] = {}
+        for i, name in enumerate(names):
+            for trigram in get_trigrams(name):
+                postings.setdefault(trigram, []).append(i)
+
+        return cls(
+            app_ids=app_ids,
+            names=names,
+            postings={
+                trigram: np.array(positions, dtype=np.int32)
+                for trigram, positions in postings.items()
+            },
+            catalog_hash=compute_catalog_hash(steamspy_database),
+        )
+
+    def get_shortlist(self, input_game_name: str, shortlist_size: int) -> np.ndarray:
+        # Positions of the names with the highest Dice coefficient on trigram sets, in the order of the database.
+
+        query_trigrams = get_trigrams(input_game_name)
+
+        num_shared_trigrams = np.zeros(len(self.app_ids), dtype=np.int32)
+        for trigram in query_trigrams:
+            if trigram in self.postings:
+                num_shared_trigrams[self.postings[trigram]] += 1
+
+        similarity = (2 * num_shared_trigrams) / (
+            len(query_trigrams) + self.num_trigrams
+        )
+
+        if shortlist_size < len(similarity):
+            shortlist = np.argpartition(-similarity, shortlist_size)[:shortlist_size]
+        else:
+            shortlist = np.arange(len(similarity))
+
+        return np.sort(shortlist)
+
+    def find_most_similar_game_names(
+        self,
+        input_game_name: str,
+        shortlist_size: int | None = None,
+    ) -> tuple[list[str], dict[str, int]]:
+        # Same output as steampi.text_distances.find_most_similar_game_names() with Levenshtein distance, restricted to
+        # the shortlist. Ties are broken by the order of the database, as with the search over the whole database.
+
+        if shortlist_size is None:
+            shortlist_size = get_default_shortlist_size()
+
+        lower_case_input = input_game_name.lower()
+
+        text_distances = {
+            self.app_ids[i]: Levenshtein.distance(lower_case_input, self.names[i])
+            for i in self.get_shortlist(input_game_name, shortlist_size)
+        }
+
+        sorted_app_ids = sorted(
+            text_distances.keys(),
+            key=lambda app_id: text_distances[app_id],
+        )
+
+        return sorted_app_ids, text_distances
+
+    def to_dict(self) -> dict:
+        return {
+            "app_ids": self.app_ids,
+            "names": self.names,
+            "postings": {
+                trigram: positions.tolist()
+                for trigram, positions in self.postings.items()
+            },
+            "catalog_hash": self.catalog_hash,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TrigramIndex":
+        return cls(
+            app_ids=data["app_ids"],
+            names=data["names"],
+            postings={
+                trigram: np.array(positions, dtype=np.int32)
+                for trigram, positions in data["postings"].items()
+            },
+            catalog_hash=data["catalog_hash"],
+        )
+
+
+def get_trigram_index_file_name() -> str:
+    # Dict: app_ids, names, postings, catalog_hash
+
+    return get_data_folder() + "trigram_index.json"
+
+
+def load_trigram_index(
+    steamspy_database: dict,
+    file_name: str | None = None,
+    *,
+    save_to_disk: bool = True,
+) -> TrigramIndex:
+    # The index is built once per catalog snapshot: it is built again if the catalog hash does not match.
+
+    if file_name is None:
+        file_name = get_trigram_index_file_name()
+
+    catalog_hash = compute_catalog_hash(steamspy_database)
+
+    try:
+        with Path(file_name).open(encoding="utf-8") as f:
+            trigram_index = TrigramIndex.from_dict(json.load(f))
+    except FileNotFoundError:
+        trigram_index = None
+
+    if trigram_index is None or trigram_index.catalog_hash != catalog_hash:
+        trigram_index = TrigramIndex.from_database(steamspy_database)
+
+        if save_to_disk:
+            with Path(file_name).open("w", encoding="utf-8") as f:
+                json.dump(trigram_index.to_dict(), f)
+
+    return trigram_index
+
+
+def compute_top_k_recall(
+    raw_names: list[str],
+    steamspy_database: dict,
+    trigram_index: TrigramIndex,
+    shortlist_size: int | None = None,
+    num_closest_neighbors: int = 3,
+) -> float:
+    # Fraction of the names for which the top-k matches are the same as with the search over the whole database.
+
+    num_identical_matches = 0
+
+    for raw_name in raw_names:
+        (sorted_app_ids, _) = steampi.text_distances.find_most_similar_game_names(
+            raw_name,
+            steamspy_database,
+        )
+        (shortlisted_app_ids, _) = trigram_index.find_most_similar_game_names(
+            raw_name,
+            shortlist_size=shortlist_size,
+        )
+
+        if (
+            sorted_app_ids[:num_closest_neighbors]
+            == shortlisted_app_ids[:num_closest_neighbors]
+        ):
+            num_identical_matches += 1
+
+    return num_identical_matches / max(len(raw_names), 1)